@@ -0,0 +1,143 @@
+# official_site_benchmark.py  ───────────────────────────────────────────
+"""
+is_official_company_site over synthetic (company, url) pairs: the original
+per-call implementation (kept below for comparison) vs the compiled /
+memoized one, plus score_search_results on Serper-sized pages.
+
+Synthetic pairs repeat company names and domains the way real runs do
+(the same company is scored under 4-5 query variants), which is what the
+memo pays off on. Results are checked for agreement with the original.
+
+    python benchmarks/official_site_benchmark.py --pairs 100000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+import website_discovery as wd  # noqa: E402
+
+WORDS = ["annovis", "nura", "ray", "acme", "vertex", "lumen", "cellara", "genix", "orion",
+         "kinetix", "helio", "argo", "nova", "sana", "atlas", "zeno", "ember", "quanta"]
+DESCRIPTORS = ["", " Bio", " Therapeutics", " Pharma", " Biosciences", " Inc"]
+OTHER_DOMAINS = wd.EXCLUDE_DOMAINS + ["example.org", "news.example.com", "biotechjobs.net"]
+PATHS = ["/", "/about", "/news/2024/funding", "/company/profile", "/pipeline", "/doc.pdf"]
+
+
+def legacy_is_official_company_site(url, company_name):
+    """The pre-compilation implementation, verbatim apart from indentation."""
+    if not url:
+        return False, 0, []
+    reasons = []
+    score = 0
+    try:
+        domain = urlparse(url).netloc.lower().replace('www.', '')
+        if any(excluded in domain for excluded in wd.EXCLUDE_DOMAINS):
+            return False, 0, ["Excluded domain"]
+        if any(re.search(pattern, url.lower()) for pattern in wd.NON_COMPANY_PATTERNS):
+            return False, 0, ["Non-company URL pattern"]
+        clean_company = re.sub(r'[^a-z0-9\s]', '', company_name.lower()).replace(' ', '')
+        company_words = [word for word in company_name.lower().split() if len(word) > 2]
+        if clean_company in domain.replace('-', '').replace('.', ''):
+            domain_clean = domain.replace('-', '').replace('.', '')
+            company_segments = clean_company.split()
+            if len(company_segments) == 1:
+                main_word = company_segments[0]
+                if (main_word == domain_clean or
+                        domain_clean.startswith(main_word + 'bio') or
+                        domain_clean.startswith(main_word + 'pharma') or
+                        domain_clean.startswith(main_word + 'therapeutics') or
+                        domain_clean.startswith(main_word + 'tx') or
+                        domain_clean.endswith(main_word + 'bio') or
+                        domain_clean.endswith(main_word + 'therapeutics')):
+                    score += 80
+                    reasons.append(f"Full company name in domain ({clean_company} in {domain})")
+                else:
+                    score += 40
+                    reasons.append(f"Partial company name match in domain - needs validation ({clean_company} in {domain})")
+            else:
+                score += 80
+                reasons.append(f"Full company name in domain ({clean_company} in {domain})")
+        elif len(company_words) > 1 and all(word in domain for word in company_words):
+            score += 70
+            reasons.append(f"All company words in domain ({company_words} in {domain})")
+        if score < 70:
+            domain_matches = sum(1 for word in company_words if word in domain)
+            if domain_matches > 0:
+                partial_score = domain_matches * 15
+                score += partial_score
+                reasons.append(f"{domain_matches} company words in domain (+{partial_score})")
+        if domain.endswith('.com'):
+            score += 10
+            reasons.append(".com domain")
+        biotech_terms = ['bio', 'pharma', 'therapeutics', 'medical']
+        if any(term in domain for term in biotech_terms):
+            score += 5
+            reasons.append("Biotech-related domain")
+        return score >= 30, score, reasons
+    except Exception:
+        return False, 0, ["URL parsing error"]
+
+
+def synthetic_pairs(n, seed=7):
+    rng = random.Random(seed)
+    companies = [w.capitalize() + d for w in WORDS for d in DESCRIPTORS]
+    pairs = []
+    for _ in range(n):
+        company = rng.choice(companies)
+        base = company.split()[0].lower()
+        r = rng.random()
+        if r < 0.5:
+            domain = base + rng.choice(["", "bio", "tx", "therapeutics", "-pharma"]) + rng.choice([".com", ".bio", ".co"])
+        elif r < 0.8:
+            domain = rng.choice(OTHER_DOMAINS)
+        else:
+            domain = rng.choice(WORDS) + rng.choice(["labs", "health", ""]) + ".com"
+        prefix = "www." if rng.random() < 0.5 else ""
+        pairs.append((company, f"https://{prefix}{domain}{rng.choice(PATHS)}"))
+    return pairs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", type=int, default=100_000)
+    ap.add_argument("--page", type=int, default=6, help="results per Serper page for the batch API")
+    args = ap.parse_args()
+
+    pairs = synthetic_pairs(args.pairs)
+    print(f"{len(pairs)} (company, url) pairs, {len({p[0] for p in pairs})} companies")
+
+    t0 = time.perf_counter()
+    legacy = [legacy_is_official_company_site(u, c) for c, u in pairs]
+    t_legacy = time.perf_counter() - t0
+
+    wd._score_domain.cache_clear()
+    t0 = time.perf_counter()
+    fast = [wd.is_official_company_site(u, c) for c, u in pairs]
+    t_fast = time.perf_counter() - t0
+
+    pages = [pairs[i:i + args.page] for i in range(0, len(pairs), args.page)]
+    wd._score_domain.cache_clear()
+    t0 = time.perf_counter()
+    for page in pages:
+        wd.score_search_results([{"link": u} for _, u in page], page[0][0])
+    t_batch = time.perf_counter() - t0
+
+    mismatches = sum(1 for a, b in zip(legacy, fast) if tuple(a[:2]) != tuple(b[:2]))
+    info = wd._score_domain.cache_info()
+    print(f"  legacy   {t_legacy:7.3f}s  {len(pairs) / t_legacy:10.0f} pairs/s")
+    print(f"  compiled {t_fast:7.3f}s  {len(pairs) / t_fast:10.0f} pairs/s  ({t_legacy / t_fast:.1f}x)")
+    print(f"  batch    {t_batch:7.3f}s  {len(pages)} pages (includes URL normalisation)")
+    print(f"  memo     {info.hits} hits / {info.misses} misses")
+    print(f"  agreement with legacy: {len(pairs) - mismatches}/{len(pairs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# scroll_benchmark.py  ──────────────────────────────────────────────────
+"""
+Time-per-page for the fixed-sleep scroll vs the adaptive scroll.
+
+Loads the saved fixtures in ./fixtures through a real headless Chrome and
+reports, per page and strategy, the wall time spent scrolling and how much
+visible text was captured (the adaptive strategy must not lose content).
+
+Only the synthetic fixtures are measured – the speed-up has not been
+checked against real portfolio pages, whose lazy loading and heights vary.
+
+    python benchmarks/scroll_benchmark.py [--runs 3]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from comprehensive_data_enrichment import (  # noqa: E402
+    _launch_browser, _scroll_page, _visible_text_from_html,
+)
+
+FIXTURES = ["short_page.html", "long_page.html"]
+
+
+def legacy_scroll(driver):
+    """The previous strategy: 0.3s pauses plus one 0.3s sleep per 800px."""
+    driver.execute_script("window.scrollTo(0,400)")
+    time.sleep(0.3)
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+    time.sleep(0.3)
+    height = driver.execute_script("return document.body.scrollHeight")
+    for y in range(0, height, 800):
+        driver.execute_script(f"window.scrollTo(0, {y})")
+        time.sleep(0.3)
+
+
+STRATEGIES = {"fixed-sleep": legacy_scroll, "adaptive": _scroll_page}
+
+
+def bench(driver, url, scroll, runs):
+    times, chars = [], 0
+    for _ in range(runs):
+        driver.get(url)
+        t0 = time.perf_counter()
+        scroll(driver)
+        times.append(time.perf_counter() - t0)
+        chars = len(_visible_text_from_html(driver.page_source))
+    return statistics.median(times), chars
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    driver = _launch_browser(headless=True)
+    try:
+        print(f"{'page':18} {'strategy':12} {'median s':>9} {'text chars':>11}")
+        for name in FIXTURES:
+            url = (ROOT / "fixtures" / name).as_uri()
+            for label, fn in STRATEGIES.items():
+                secs, chars = bench(driver, url, fn, args.runs)
+                print(f"{name:18} {label:12} {secs:9.2f} {chars:11}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+# company_store.py  ──────────────────────────────────────────────────────
+"""
+Persistent cross-VC company store.
+
+Keyed by canonical domain (plus a normalised company name for lookups that
+happen before the domain is known). Holds the website match, therapeutic
+verdict and extracted fields with timestamps, so a portfolio company that
+shows up under several VCs is discovered and enriched once per TTL.
+
+The website knowledge base (``website_kb``) is the long-lived side of
+discovery: every name → official URL ever resolved, ingested from past
+``websites_found`` artifacts under output/runs and from live matches. It
+is looked up fuzzily (descriptor-stripped key, token-set and trigram
+similarity), so "Annovis" and "Annovis Bio" share an entry, while
+"Arcus Biosciences" and "Arcus Medical" do not. A hit also says whether
+the entry's domain carries the name (``kb_domain_match``) so callers can
+verify the rest before skipping validation.
+"""
+
+import os
+import glob
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import field_normalizer
+
+STORE_PATH = os.getenv("COMPANY_STORE_PATH", os.path.join("output", "company_store.sqlite"))
+STORE_TTL_DAYS = float(os.getenv("COMPANY_STORE_TTL_DAYS", "30"))  # 0 disables reads
+KB_MIN_SIMILARITY = float(os.getenv("WEBSITE_KB_MIN_SIMILARITY", "0.85"))
+KB_MIN_SCORE = float(os.getenv("WEBSITE_KB_MIN_SCORE", "50"))     # total_score an entry needs to be trusted
+KB_MAX_AGE_DAYS = float(os.getenv("WEBSITE_KB_MAX_AGE_DAYS", "365"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    domain          TEXT PRIMARY KEY,
+    name_key        TEXT,
+    company_name    TEXT,
+    website         TEXT,
+    website_at      REAL,
+    is_therapeutic  INTEGER,
+    fields          TEXT,
+    enriched_at     REAL,
+    updated_at      REAL
+);
+CREATE INDEX IF NOT EXISTS idx_companies_name ON companies(name_key);
+CREATE TABLE IF NOT EXISTS domain_timings (
+    domain      TEXT PRIMARY KEY,
+    seconds     REAL,
+    pages       REAL,
+    runs        INTEGER,
+    updated_at  REAL
+);
+CREATE TABLE IF NOT EXISTS hq_cache (
+    key           TEXT PRIMARY KEY,
+    company_name  TEXT,
+    location      TEXT,
+    looked_up_at  REAL
+);
+CREATE TABLE IF NOT EXISTS dead_domains (
+    domain      TEXT PRIMARY KEY,
+    reason      TEXT,
+    failed_at   REAL,
+    expires_at  REAL
+);
+CREATE TABLE IF NOT EXISTS website_kb (
+    name_key      TEXT,
+    core_key      TEXT,
+    company_name  TEXT,
+    domain        TEXT,
+    website_url   TEXT,
+    score         REAL,
+    reason        TEXT,
+    info          TEXT,
+    seen_at       REAL,
+    PRIMARY KEY (name_key, domain)
+);
+CREATE INDEX IF NOT EXISTS idx_kb_core ON website_kb(core_key);
+CREATE TABLE IF NOT EXISTS kb_sources (
+    path   TEXT PRIMARY KEY,
+    mtime  REAL
+);
+"""
+TIMING_ALPHA = 0.5  # EWMA weight of the newest observation
+
+
+def canonical_domain(url: str) -> str:
+    """'https://www.Foo.com:443/x' → 'foo.com'"""
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "http://" + url
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def normalize_name(name: str) -> str:
+    return field_normalizer.company_key(name or "")
+
+
+# field_normalizer's descriptors plus the pharma-family words names are
+# often registered without ("Kinnate Biopharma" → kinnate.com)
+KB_DESCRIPTORS = field_normalizer.DESCRIPTOR_SUFFIXES | {
+    "biopharma", "biopharmaceutical", "biopharmaceuticals", "bioscience",
+    "biotherapeutics", "therapy", "therapies", "medicines",
+}
+# spellings of the same descriptor ("Zeta Tx" is "Zeta Therapeutics")
+DESCRIPTOR_ALIASES = {
+    "tx": "therapeutics", "therapeutic": "therapeutics", "therapies": "therapy",
+    "bioscience": "biosciences", "pharmaceutical": "pharma", "pharmaceuticals": "pharma",
+    "biopharmaceutical": "biopharma", "biopharmaceuticals": "biopharma",
+    "biotechnology": "biotech", "technology": "technologies", "laboratories": "labs",
+    "healthcare": "health",
+}
+
+
+def _split_name(name: str):
+    """(core words, stripped trailing descriptors) of a company name."""
+    words = field_normalizer.canonical_key(name or "").split()
+    stripped = set()
+    while len(words) > 1 and words[-1] in KB_DESCRIPTORS:
+        word = words.pop()
+        stripped.add(DESCRIPTOR_ALIASES.get(word, word))
+    return words, stripped
+
+
+def core_name(name: str) -> str:
+    """Name key without trailing descriptors: 'Annovis Bio, Inc.' → 'annovis'."""
+    return "".join(_split_name(name)[0])
+
+
+def name_tokens(name: str) -> set:
+    words = field_normalizer.canonical_key(name or "").split()
+    core = {w for w in words if w not in KB_DESCRIPTORS}
+    return core or set(words)
+
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def name_similarity(a: str, b: str) -> float:
+    """
+    max(token-set Jaccard, trigram Jaccard of the core keys). Equal core
+    keys score 1.0 only when one name's descriptors contain the other's
+    ("Annovis" / "Annovis Bio"); conflicting ones ("Arcus Biosciences" /
+    "Arcus Medical") fall back to the Jaccard of all words.
+    """
+    (wa, da), (wb, db) = _split_name(a), _split_name(b)
+    ca, cb = "".join(wa), "".join(wb)
+    if not ca or not cb:
+        return 0.0
+    if ca == cb:
+        if da <= db or db <= da:
+            return 1.0
+        ta, tb = set(wa) | da, set(wb) | db
+        return len(ta & tb) / len(ta | tb)
+    ta, tb = name_tokens(a), name_tokens(b)
+    tok = len(ta & tb) / len(ta | tb) if ta and tb else 0.0
+    ga, gb = trigrams(ca), trigrams(cb)
+    return max(tok, len(ga & gb) / len(ga | gb))
+
+
+def domain_has_name(company_name: str, website_url: str) -> bool:
+    """The registered domain label contains the company's core key (kinnate.com ∋ kinnate)."""
+    core = core_name(company_name)
+    labels = canonical_domain(website_url).split(".")
+    label = "".join(labels[:-1]) if len(labels) > 1 else "".join(labels)
+    return bool(core) and core in label.replace("-", "")
+
+
+class CompanyStore:
+    def __init__(self, path: str = STORE_PATH, ttl_days: float = STORE_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self._lock = threading.Lock()
+        self.stats = {"website_hits": 0, "website_misses": 0, "website_conflicts": 0,
+                      "enrichment_hits": 0, "enrichment_misses": 0,
+                      "dead_domain_hits": 0, "hq_hits": 0, "hq_misses": 0,
+                      "kb_hits": 0, "kb_misses": 0, "kb_ambiguous": 0}
+        self._kb_index = None       # lazily built fuzzy index over website_kb, then kept in step
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # one short-lived connection per call: safe across threads/processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _fresh(self, ts) -> bool:
+        return bool(ts) and self.ttl > 0 and (time.time() - ts) < self.ttl
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def stats_since(self, snapshot: dict) -> dict:
+        """Counter deltas since ``snapshot`` (a copy of ``self.stats``)."""
+        with self._lock:
+            return {k: v - snapshot.get(k, 0) for k, v in self.stats.items()}
+
+    # ── website discovery ───────────────────────────────────────────
+    def get_website(self, company_name: str):
+        """
+        Fresh website match for this company name, or None. Rows are keyed
+        by domain, so several fresh rows under one name_key mean different
+        companies (e.g. from different VCs) share the name – no answer then.
+        """
+        key = normalize_name(company_name)
+        rows = []
+        if key:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT website, website_at FROM companies "
+                    "WHERE name_key = ? AND website IS NOT NULL", (key,)).fetchall()
+        fresh = [row for row in rows if self._fresh(row[1])]
+        if len(fresh) == 1:
+            self._count("website_hits")
+            return json.loads(fresh[0][0])
+        self._count("website_conflicts" if fresh else "website_misses")
+        return None
+
+    def put_website(self, company_name: str, website_info: dict):
+        domain = canonical_domain(website_info.get("website_url", ""))
+        if not domain:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO companies (domain, name_key, company_name, website, website_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET name_key=excluded.name_key, "
+                "company_name=excluded.company_name, website=excluded.website, "
+                "website_at=excluded.website_at, updated_at=excluded.updated_at",
+                (domain, normalize_name(company_name), company_name,
+                 json.dumps(website_info, default=str), now, now))
+        self.add_kb_entries([(company_name, website_info, now)])
+
+    # ── enrichment ─────────────────────────────────────────────────
+    def get_enrichment(self, website_url: str):
+        """Fresh {'is_therapeutic', 'fields', 'enriched_at'} for the domain, or None."""
+        domain = canonical_domain(website_url)
+        row = None
+        if domain:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT is_therapeutic, fields, enriched_at FROM companies "
+                    "WHERE domain = ? AND is_therapeutic IS NOT NULL", (domain,)).fetchone()
+        if row and self._fresh(row[2]):
+            self._count("enrichment_hits")
+            return {"is_therapeutic": bool(row[0]),
+                    "fields": json.loads(row[1]) if row[1] else None,
+                    "enriched_at": row[2]}
+        self._count("enrichment_misses")
+        return None
+
+    def has_fresh_enrichment(self, website_url: str) -> bool:
+        """Like get_enrichment but without touching hit/miss stats (for planning)."""
+        domain = canonical_domain(website_url)
+        if not domain:
+            return False
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT enriched_at FROM companies "
+                "WHERE domain = ? AND is_therapeutic IS NOT NULL", (domain,)).fetchone()
+        return bool(row) and self._fresh(row[0])
+
+    def put_enrichment(self, company_name: str, website_url: str,
+                       is_therapeutic: bool, fields: dict = None):
+        domain = canonical_domain(website_url)
+        if not domain:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO companies (domain, name_key, company_name, is_therapeutic, fields, enriched_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET is_therapeutic=excluded.is_therapeutic, "
+                "fields=excluded.fields, enriched_at=excluded.enriched_at, updated_at=excluded.updated_at, "
+                "name_key=COALESCE(companies.name_key, excluded.name_key), "
+                "company_name=COALESCE(companies.company_name, excluded.company_name)",
+                (domain, normalize_name(company_name), company_name, int(bool(is_therapeutic)),
+                 json.dumps(fields, default=str) if fields is not None else None, now, now))
+
+    # ── render-cost history (enrichment scheduler) ─────────────────
+    def record_timing(self, website_url: str, seconds: float, pages: int):
+        """Fold one observed enrichment duration into the domain's EWMA."""
+        domain = canonical_domain(website_url)
+        if not domain:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO domain_timings (domain, seconds, pages, runs, updated_at) "
+                "VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET "
+                "seconds = ? * excluded.seconds + (1 - ?) * domain_timings.seconds, "
+                "pages = ? * excluded.pages + (1 - ?) * domain_timings.pages, "
+                "runs = domain_timings.runs + 1, updated_at = excluded.updated_at",
+                (domain, seconds, pages, time.time(),
+                 TIMING_ALPHA, TIMING_ALPHA, TIMING_ALPHA, TIMING_ALPHA))
+
+    def get_timings(self, website_urls) -> dict:
+        """{domain: (seconds, pages)} for the domains with history."""
+        domains = sorted({canonical_domain(u) for u in website_urls if u} - {""})
+        out = {}
+        with self._connect() as conn:
+            for i in range(0, len(domains), 500):
+                chunk = domains[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT domain, seconds, pages FROM domain_timings "
+                    f"WHERE domain IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                out.update({d: (s, p) for d, s, p in rows})
+        return out
+
+    # ── website knowledge base (fuzzy name → official site) ────────
+    def add_kb_entries(self, entries) -> int:
+        """Upsert (company_name, website_info, seen_at) triples; newer sightings win."""
+        rows = []
+        for company_name, info, seen_at in entries:
+            url = (info or {}).get("website_url", "")
+            domain = canonical_domain(url)
+            key = normalize_name(company_name)
+            if not domain or not key:
+                continue
+            rows.append((key, core_name(company_name), company_name, domain, url,
+                         float(info.get("total_score") or 0),
+                         str(info.get("llm_validation") or "; ".join(info.get("validation_reasons") or []))[:300],
+                         json.dumps(info, default=str), seen_at))
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO website_kb (name_key, core_key, company_name, domain, website_url, score, "
+                "reason, info, seen_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name_key, domain) DO UPDATE SET company_name=excluded.company_name, "
+                "website_url=excluded.website_url, score=excluded.score, reason=excluded.reason, "
+                "info=excluded.info, seen_at=excluded.seen_at WHERE excluded.seen_at >= website_kb.seen_at",
+                rows)
+        with self._lock:
+            if self._kb_index is not None:
+                # same upsert rule as the table, applied to the in-memory index
+                for key, _, company_name, domain, _, score, _, info, seen_at in rows:
+                    self._kb_index_put(key, domain, (company_name, core_name(company_name),
+                                                     domain, score, info, seen_at))
+        return len(rows)
+
+    def refresh_website_kb(self, runs_dir: str = os.path.join("output", "runs")) -> int:
+        """Ingest new or changed *websites* artifacts under ``runs_dir``; returns entries added."""
+        paths = glob.glob(os.path.join(runs_dir, "**", "*websites*.json"), recursive=True)
+        with self._connect() as conn:
+            seen = dict(conn.execute("SELECT path, mtime FROM kb_sources").fetchall())
+        added, ingested = 0, []
+        for path in sorted(paths):
+            mtime = os.path.getmtime(path)
+            if seen.get(path) == mtime:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            found = data.get("websites_found") if isinstance(data, dict) else None
+            entries = [(w.get("company_name", ""), w, mtime)
+                       for w in found or [] if isinstance(w, dict)]
+            added += self.add_kb_entries(entries)
+            ingested.append((path, mtime))
+        if ingested:
+            with self._connect() as conn:
+                conn.executemany("INSERT INTO kb_sources (path, mtime) VALUES (?, ?) "
+                                 "ON CONFLICT(path) DO UPDATE SET mtime=excluded.mtime", ingested)
+        return added
+
+    def _kb_index_put(self, name_key, domain, row):
+        """Upsert one (company_name, core, domain, score, info, seen_at) row; caller holds _lock."""
+        entries, by_gram = self._kb_index
+        key = (name_key, domain)
+        old = entries.get(key)
+        if old is not None and row[5] < old[5]:
+            return
+        if row[3] < KB_MIN_SCORE or row[5] < time.time() - KB_MAX_AGE_DAYS * 86400:
+            entries.pop(key, None)
+            return
+        entries[key] = row
+        for g in trigrams(row[1]):
+            by_gram.setdefault(g, set()).add(key)
+
+    def _kb(self):
+        with self._lock:
+            if self._kb_index is not None:
+                return self._kb_index
+        cutoff = time.time() - KB_MAX_AGE_DAYS * 86400
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name_key, company_name, domain, score, info, seen_at FROM website_kb "
+                "WHERE score >= ? AND seen_at >= ?", (KB_MIN_SCORE, cutoff)).fetchall()
+        with self._lock:
+            if self._kb_index is None:
+                self._kb_index = ({}, {})
+                for name_key, company_name, domain, score, info, seen_at in rows:
+                    self._kb_index_put(name_key, domain, (company_name, core_name(company_name),
+                                                          domain, score, info, seen_at))
+            return self._kb_index
+
+    def lookup_website_kb(self, company_name: str, min_similarity: float = KB_MIN_SIMILARITY):
+        """
+        Best knowledge-base match as website_info plus ``kb_similarity`` /
+        ``kb_matched_name`` / ``kb_domain_match``, or None. Matches below
+        ``min_similarity``, and ties between different domains, are not
+        trusted; a hit whose domain doesn't carry the name needs the
+        caller's own check before it replaces validation.
+        """
+        core = core_name(company_name)
+        if not core:
+            self._count("kb_misses")
+            return None
+        entries, by_gram = self._kb()
+        with self._lock:
+            cand = set()
+            for g in trigrams(core):
+                cand |= by_gram.get(g, set())
+            rows = [entries[k] for k in cand if k in entries]
+        best, best_sim = [], 0.0
+        for row in rows:
+            sim = name_similarity(company_name, row[0])
+            if sim > best_sim:
+                best, best_sim = [row], sim
+            elif sim == best_sim and sim > 0:
+                best.append(row)
+        if not best or best_sim < min_similarity:
+            self._count("kb_misses")
+            return None
+        if len({row[2] for row in best}) > 1:
+            self._count("kb_ambiguous")
+            return None
+        row = max(best, key=lambda r: (r[3], r[5]))
+        self._count("kb_hits")
+        info = json.loads(row[4])
+        return dict(info, kb_similarity=round(best_sim, 3), kb_matched_name=row[0],
+                    kb_domain_match=domain_has_name(company_name, info.get("website_url", "")))
+
+    # ── HQ location (geography fallback) ───────────────────────────
+    @staticmethod
+    def _hq_keys(company_name: str, website_url: str) -> list:
+        # the name key is only a fallback: two same-named companies on
+        # different domains must not share an HQ
+        domain = canonical_domain(website_url)
+        if domain:
+            return [domain]
+        name = normalize_name(company_name)
+        return ["name:" + name] if name else []
+
+    def get_hq(self, company_name: str, website_url: str = ""):
+        """Cached HQ: a location, '' when a past lookup found none, or None if unknown."""
+        keys = self._hq_keys(company_name, website_url)
+        row = None
+        if keys:
+            with self._connect() as conn:
+                for key in keys:
+                    row = conn.execute("SELECT location, looked_up_at FROM hq_cache WHERE key = ?",
+                                       (key,)).fetchone()
+                    if row and self._fresh(row[1]):
+                        break
+                    row = None
+        if row:
+            self._count("hq_hits")
+            return row[0]
+        self._count("hq_misses")
+        return None
+
+    def put_hq(self, company_name: str, website_url: str, location: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO hq_cache (key, company_name, location, looked_up_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET company_name=excluded.company_name, "
+                "location=excluded.location, looked_up_at=excluded.looked_up_at",
+                [(k, company_name, location or "", now)
+                 for k in self._hq_keys(company_name, website_url)])
+
+    # ── negative cache: dead / parked / challenge-walled domains ───
+    def get_dead(self, website_url: str):
+        """Reason string if the domain is in the (unexpired) negative cache."""
+        domain = canonical_domain(website_url)
+        if not domain:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT reason, expires_at FROM dead_domains WHERE domain = ?",
+                               (domain,)).fetchone()
+        if row and row[1] > time.time():
+            self._count("dead_domain_hits")
+            return row[0]
+        return None
+
+    def mark_dead(self, website_url: str, reason: str, ttl_seconds: float):
+        domain = canonical_domain(website_url)
+        if not domain:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO dead_domains (domain, reason, failed_at, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET reason=excluded.reason, "
+                "failed_at=excluded.failed_at, expires_at=excluded.expires_at",
+                (domain, reason, now, now + ttl_seconds))
+
+    def clear_dead(self, website_url: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM dead_domains WHERE domain = ?",
+                         (canonical_domain(website_url),))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> CompanyStore:
+    """Process-wide store instance."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CompanyStore()
+        return _store
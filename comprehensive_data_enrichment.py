@@ -3,7 +3,6 @@ import json
 import time
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
-from bs4 import BeautifulSoup
 import random
 import re
 import requests
@@ -18,9 +17,20 @@ import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin, urlunparse
 from pathlib import Path
+import queue
+import shutil
+import socket
+import tempfile
+from contextlib import contextmanager
+import field_normalizer
+import company_store
+import task_runtime
+import site_probe
+import html_parse
+import taxonomy_matcher
+import serper_client
 
 BANNED_ANCHOR_KEYWORDS = [  # same list you had in main.py (trim if you like)
    "privacy","policy","disclaimer","terms","cookies","login","mailto:",
@@ -37,6 +47,13 @@ PRIORITY_SLUGS = [
     "our-science", "our-technology", "our-platform"
 ]
 
+# Anchor pre-scoring: categories that must be represented among loaded pages
+# (best pipeline, technology and geography/contact link first, then by score)
+DIVERSITY_CATEGORIES = ("pipeline", "technology", "geography")
+# Banned slugs still allowed for the geography slot – HQ lives on these pages
+GEOGRAPHY_SLUGS = ("contact", "contact-us", "locations", "offices")
+SITEMAP_HINTS = os.getenv("SITEMAP_HINTS", "1") == "1"
+
 SKIP_EXT = (".pdf",".doc",".ppt",".xls",".zip",".mp3",".mp4",".jpg",".png",".gif")
 
 _CANON_INDEX_RE = re.compile(r"/index(?:\.html?|/)$", flags=re.I)
@@ -48,38 +65,283 @@ from urllib.parse import urlparse, urljoin, urlunparse
 
 driver_creation_lock = threading.Lock()
 
-def _launch_browser(headless: bool = True, port: int = 9222):
+def _free_port() -> int:
+    """Ask the OS for an unused local port (one per browser)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _launch_browser(headless: bool = True, port: int = None, profile_dir: str = None):
     opt = uc.ChromeOptions()
     if headless:
         opt.add_argument("--headless=new")
     # a tiny bit of jitter helps avoid bot detection
     opt.add_argument(f"--user-agent=Mozilla/5.0 z{random.randint(1111,9999)}")
-    opt.add_argument(f"--remote-debugging-port={port}")
+    # unique port per browser – a shared 9222 collides under concurrency
+    opt.add_argument(f"--remote-debugging-port={port or _free_port()}")
+    if profile_dir:
+        opt.add_argument(f"--user-data-dir={profile_dir}")
     # Lock to prevent undetected_chromedriver race condition
     with driver_creation_lock:
         return uc.Chrome(options=opt)
 
+
+class BrowserPool:
+    """
+    N long-lived headless drivers, each with its own debugging port and
+    profile dir. Workers lease a driver per company and return it; a driver
+    that crashed, hung or failed its health check is replaced, so launches
+    are paid once per pool slot instead of once per page.
+    """
+
+    HEALTH_TIMEOUT = 5
+    LEASE_POLL = 0.5
+
+    def __init__(self, size: int, headless: bool = True):
+        self.size = max(1, size)
+        self.headless = headless
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._profiles = {}
+        self._leased = {}           # id(driver) -> driver, so close() can reach them
+        self._closed = False
+        self.launches = 0
+        self.replacements = 0
+
+    def _spawn(self):
+        profile = tempfile.mkdtemp(prefix="enrich_chrome_")
+        try:
+            driver = _launch_browser(self.headless, _free_port(), profile)
+        except Exception:
+            shutil.rmtree(profile, ignore_errors=True)
+            raise
+        driver.set_page_load_timeout(PAGE_TIMEOUT)
+        driver.set_script_timeout(PAGE_TIMEOUT)
+        with self._lock:
+            self._profiles[id(driver)] = profile
+            self.launches += 1
+        return driver
+
+    def _destroy(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._leased.pop(id(driver), None)
+            profile = self._profiles.pop(id(driver), None)
+            if profile is not None:         # not already destroyed
+                self._created -= 1
+        if profile:
+            shutil.rmtree(profile, ignore_errors=True)
+
+    def _healthy(self, driver) -> bool:
+        ok, err = timeout_handler(lambda: driver.execute_script("return 1"),
+                                  timeout_duration=self.HEALTH_TIMEOUT,
+                                  cleanup=driver.quit)
+        return err is None and ok == 1
+
+    def lease(self, timeout: float = None):
+        """
+        Borrow a live driver. Blocks while all slots are leased, but wakes
+        every LEASE_POLL seconds to honour close() and the current
+        task_runtime deadline; raises queue.Empty once ``timeout`` passes.
+        """
+        driver = self._lease(timeout)
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._leased[id(driver)] = driver
+        if closed:
+            self._destroy(driver)
+            raise RuntimeError("browser pool is closed")
+        return driver
+
+    def _lease(self, timeout: float = None):
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while True:
+            task_runtime.check()
+            if self._closed:
+                raise RuntimeError("browser pool is closed")
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_spawn = self._created < self.size
+                    if can_spawn:
+                        self._created += 1
+                if can_spawn:
+                    try:
+                        return self._spawn()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                wait = self.LEASE_POLL
+                if give_up is not None:
+                    wait = min(wait, give_up - time.monotonic())
+                    if wait <= 0:
+                        raise queue.Empty
+                try:
+                    driver = self._idle.get(timeout=wait)
+                except queue.Empty:
+                    continue
+            if self._healthy(driver):
+                return driver
+            print("      [pool] unhealthy browser replaced")
+            with self._lock:
+                self.replacements += 1
+            self._destroy(driver)
+
+    def release(self, driver, broken: bool = False):
+        """
+        Return a driver; broken ones are discarded and lazily replaced, and
+        after close() every returned driver is destroyed.
+        """
+        if driver is None:
+            return
+        with self._lock:
+            self._leased.pop(id(driver), None)
+            closed = self._closed
+        if closed:
+            self._destroy(driver)
+            return
+        if not broken:
+            try:
+                # all domains' cookies – delete_all_cookies only clears the current one
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                driver.get("about:blank")
+            except Exception:
+                broken = True
+        if broken:
+            with self._lock:
+                self.replacements += 1
+            self._destroy(driver)
+        else:
+            self._idle.put(driver)
+
+    def close(self):
+        """Destroy idle drivers and any still leased; later releases destroy too."""
+        with self._lock:
+            self._closed = True
+            leased = list(self._leased.values())
+            self._leased.clear()
+        while True:
+            try:
+                self._destroy(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for driver in leased:
+            self._destroy(driver)
+
+
+_browser_pool = None
+BROWSER_POOL_SIZE = int(os.getenv("ENRICHMENT_BROWSER_POOL", "6"))
+
+
+@contextmanager
+def browser_pool(size: int = BROWSER_POOL_SIZE, headless: bool = True):
+    """Install a process-wide BrowserPool for the duration of an enrichment run."""
+    global _browser_pool
+    pool = BrowserPool(size, headless=headless)
+    _browser_pool = pool
+    try:
+        yield pool
+    finally:
+        _browser_pool = None
+        pool.close()
+        print(f"🧭 Browser pool: {pool.launches} launches, {pool.replacements} replacements "
+              f"({pool.size} slots)")
+
+def _visible_text_from_html(html: str, limit: int = 0):
+    # in-thread or process-pool parse, per HTML_PARSE_MODE
+    return html_parse.visible_text(html, limit)
+
 def _extract_visible_text(driver, limit: int = 0):
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    txt = soup.get_text(" ", strip=True)
-    return txt if not limit else txt[:limit]
+    return _visible_text_from_html(driver.page_source, limit)
+
+# Adaptive scrolling: big steps, wait only while the page is still busy
+SCROLL_STEP_PX = 2400        # ~2-3 viewports per step
+SCROLL_QUIET_MS = 250        # no DOM mutation for this long = settled
+SCROLL_POLL = 0.1            # seconds between state polls
+SCROLL_STEP_WAIT = 1.0       # max wait for one step to settle
+SCROLL_MAX_SECONDS = float(os.getenv("SCROLL_MAX_SECONDS", "6"))  # hard cap per page
+
+_OBSERVE_JS = """
+if (!window.__scrollObs) {
+  window.__lastMut = performance.now();
+  window.__scrollObs = new MutationObserver(function () { window.__lastMut = performance.now(); });
+  window.__scrollObs.observe(document.documentElement,
+                             {childList: true, subtree: true, characterData: true});
+}
+"""
+
+# [scrollHeight, text length, ms since last mutation, resource entries, viewport bottom]
+_STATE_JS = """
+var b = document.body;
+return [b ? b.scrollHeight : 0,
+        b ? (b.innerText || '').length : 0,
+        performance.now() - (window.__lastMut || 0),
+        performance.getEntriesByType('resource').length,
+        window.scrollY + window.innerHeight];
+"""
+
+def _wait_settled(driver, hard_stop: float):
+    """
+    Poll until the DOM has been quiet for SCROLL_QUIET_MS and no new
+    network resources started since the last poll (network idle), or the
+    step / page budget runs out. Returns the final page state.
+    """
+    step_end = min(time.monotonic() + SCROLL_STEP_WAIT, hard_stop)
+    prev_resources = None
+    while True:
+        state = driver.execute_script(_STATE_JS)
+        if state[2] >= SCROLL_QUIET_MS and state[3] == prev_resources:
+            return state
+        if time.monotonic() >= step_end:
+            return state
+        prev_resources = state[3]
+        time.sleep(SCROLL_POLL)
+
+def _scroll_page(driver, max_seconds: float = SCROLL_MAX_SECONDS):
+    """
+    Scroll the whole document so lazy-loaded sections render. Stops as
+    soon as the viewport is at the bottom and neither content height nor
+    text length changed after the last step; ``max_seconds`` is a hard cap.
+    """
+    hard_stop = time.monotonic() + max_seconds
+    driver.execute_script(_OBSERVE_JS)
+    state = _wait_settled(driver, hard_stop)
+    y = 0
+    while time.monotonic() < hard_stop:
+        height, text_len = state[0], state[1]
+        y = min(y + SCROLL_STEP_PX, height)
+        driver.execute_script(f"window.scrollTo(0, {y})")
+        state = _wait_settled(driver, hard_stop)
+        at_bottom = state[4] >= state[0] - 2
+        if at_bottom and state[0] == height and state[1] == text_len:
+            break
 
 def _extract_visible_text_from_url(url, scrolls=4, limit=0):
+    drivers = []
+
+    def _kill():
+        for d in drivers:
+            try:
+                d.quit()
+            except Exception:
+                pass
+
     def _do_extract():
         driver = _launch_browser(headless=True)
+        drivers.append(driver)
         try:
             driver.get(url)
             WebDriverWait(driver, 12).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
-            driver.execute_script("window.scrollTo(0,400)")
-            time.sleep(0.3)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(0.3)
-            height = driver.execute_script("return document.body.scrollHeight")
-            for y in range(0, height, 800):
-                driver.execute_script(f"window.scrollTo(0, {y})")
-                time.sleep(0.3)
+            _scroll_page(driver)
             txt = _extract_visible_text(driver, limit or 0)
             return txt
         finally:
@@ -87,14 +349,122 @@ def _extract_visible_text_from_url(url, scrolls=4, limit=0):
                 driver.quit()
             except Exception:
                 pass
-    # Use timeout_handler to avoid hangs
-    txt, err = timeout_handler(_do_extract, timeout_duration=PAGE_TIMEOUT)
+    # On timeout the driver is quit so the blocked Selenium call returns
+    txt, err = timeout_handler(_do_extract, timeout_duration=PAGE_TIMEOUT, cleanup=_kill)
     if err:
         print(f"      [skip] {url} - Selenium timeout or error: {err}")
         return ""
     return txt
 
 
+class CompanySession:
+    """
+    Company-scoped browser session.
+
+    Launches at most one browser per company and renders every URL at most
+    once. The rendered title, HTML and visible text are cached so the
+    therapeutic gate, depth-1 discovery and field extraction all share the
+    same page loads.
+    """
+
+    def __init__(self, headless: bool = True, pool: BrowserPool = None):
+        self.headless = headless
+        self.pool = pool if pool is not None else _browser_pool
+        self._browser = None
+        self._pages = {}
+        self._lock = threading.Lock()
+        self.aborted = False
+        self.launches = 0
+        self.renders = 0
+
+    def _driver(self):
+        if self.aborted:
+            raise task_runtime.DeadlineExceeded("company session aborted")
+        if self._browser is None:
+            if self.pool is not None:
+                self._browser = self.pool.lease()
+            else:
+                self._browser = _launch_browser(headless=self.headless)
+                self._browser.set_page_load_timeout(PAGE_TIMEOUT)
+                self._browser.set_script_timeout(PAGE_TIMEOUT)
+            self.launches += 1
+        return self._browser
+
+    def _drop_browser(self, broken: bool = False):
+        # may race with abort() from the deadline watchdog – hand off once
+        with self._lock:
+            browser, self._browser = self._browser, None
+        if browser is None:
+            return
+        if self.pool is not None:
+            self.pool.release(browser, broken=broken)
+        else:
+            try:
+                browser.quit()
+            except Exception:
+                pass
+
+    def abort(self):
+        """Deadline cleanup: kill the browser so any blocked call fails now."""
+        self.aborted = True
+        self._drop_browser(broken=True)
+
+    def render(self, url: str) -> dict:
+        """Load ``url`` once; later calls return the cached page."""
+        key = normalize_url(url)
+        if key in self._pages:
+            return self._pages[key]
+        task_runtime.check()
+        if site_probe.known_dead(url):
+            # domain already failed its liveness probe this run – no browser
+            page = {"url": url, "title": "", "html": "", "text": "", "error": "dead domain"}
+            self._pages[key] = page
+            return page
+        try:
+            browser = self._driver()
+            browser.get(url)
+            WebDriverWait(browser, 12).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+            _scroll_page(browser)
+            html = browser.page_source
+            parsed = html_parse.parse(html)  # one parse: text + anchors
+            page = {
+                "url": url,
+                "title": browser.title or "Untitled",
+                "html": html,
+                "text": parsed["text"],
+                "anchors": parsed["anchors"],
+            }
+            self.renders += 1
+        except Exception as e:
+            if self.aborted:
+                raise task_runtime.DeadlineExceeded(f"aborted while rendering {url}") from e
+            print(f"      [skip] {url} - {e}")
+            page = {"url": url, "title": "", "html": "", "text": "", "error": str(e)}
+            # A dead/hung browser must not poison the remaining pages
+            try:
+                self._browser.title
+            except Exception:
+                self._drop_browser(broken=True)
+        self._pages[key] = page
+        return page
+
+    def text(self, url: str, limit: int = 0) -> str:
+        txt = self.render(url)["text"]
+        return txt if not limit else txt[:limit]
+
+    def close(self):
+        self._drop_browser()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
 # ── Console-encoding hardening (Windows CP-1252 can’t print emoji) ──
 
 if (
@@ -123,6 +493,43 @@ COMPANY_TIMEOUT = 300  # 5 minutes per company
 PAGE_TIMEOUT = 60  # 1 minute per page
 AI_TIMEOUT = 45  # 45 seconds for AI requests
 TOTAL_TIMEOUT = 1800  # 30 minutes total
+# Scheduler: per-VC wall-clock budget and cost model for companies without history
+ENRICHMENT_VC_BUDGET = float(os.getenv("ENRICHMENT_VC_BUDGET", str(TOTAL_TIMEOUT)))
+PER_PAGE_SECONDS = 15.0
+DEFAULT_COMPANY_COST = PER_PAGE_SECONDS * (MAX_PAGES_TO_ANALYZE + 1)  # pages + gate/LLM
+CACHED_COMPANY_COST = 1.0
+
+# "staged"      → gate call → crawl → extraction call → 3 dedup calls
+# "single_pass" → one structured call on the homepage (verdict + fields),
+#                 a second one only if subpages were crawled
+ENRICHMENT_MODE = os.getenv("ENRICHMENT_MODE", "staged").strip().lower()
+
+THERAPEUTIC_CRITERIA = """
+Say **yes** if the text shows that the company itself is discovering,
+engineering, developing, testing, or commercialising **therapeutic
+products** intended to treat disease in humans.
+
+Accept ALL of the following synonyms as evidence:
+  • drug, medicine, therapy, treatment, clinical candidate, asset, molecule
+  • phrases such as “Phase 1/2/3”, “IND-enabling”, “pipeline”, “program”
+
+Positive cues – **any ONE is sufficient**:
+  • mention of a pre-clinical or clinical pipeline / program / asset
+  • clinical-trial phases (IND-enabling, Phase 1/2/3, pivotal study, NDA, BLA)
+  • modality keywords: small-molecule, biologic, antibody(-drug conjugate),
+    protein, peptide, RNA therapy (mRNA, siRNA, ASO, saRNA), gene therapy,
+    cell therapy, viral vector, vaccine, live biotherapeutic, microbiome
+    therapy, optogenetic medicine, PROTAC, radioligand, degrader, etc.
+  • explicit goal to *treat*, *cure*, *restore*, or *prevent* a named disease
+
+Say **no** if the company is **only**:
+  • diagnostics / devices / digital-health / CRO / CDMO / research tools
+  • data / AI platforms without in-house therapeutics
+  • insurers, consultancies, accelerators, investors, news outlets, foundations
+  • describing partners’ drugs but not its own
+
+If evidence is genuinely ambiguous, default to **no**.
+""".strip()
 
 
 STARTUP_3FIELDS_PROMPT = """
@@ -293,6 +700,90 @@ TEXT EXCERPTS:
 \"\"\"{context}\"\"\"
 """.strip()
 
+# Single structured call: therapeutic verdict + the three fields, with the
+# per-field de-duplication / geography normalisation folded in.
+_SINGLE_PASS_GATE = (
+    THERAPEUTIC_CRITERIA
+    .replace("Say **yes**", "Set true")
+    .replace("Say **no**", "Set false")
+    .replace("default to **no**", "default to false")
+)
+
+STARTUP_SINGLE_PASS_PROMPT = (
+    """
+You are a precision data-extraction agent for biotech intelligence.
+
+Goal → Return **one** JSON object with **exactly four** top-level keys
+(this overrides the three-key instruction in the extraction rules below):
+
+  "is_therapeutic" : true | false
+  "drug_modality"  : list | null
+  "disease_focus"  : list | null
+  "geography"      : list | null
+
+STEP 1 – THERAPEUTIC VERDICT ("is_therapeutic")
+""".strip()
+    + "\n" + _SINGLE_PASS_GATE
+    + """
+
+If "is_therapeutic" is false, set the other three keys to null and stop.
+
+STEP 2 – FIELDS (only when "is_therapeutic" is true)
+  • Apply every extraction rule below.
+  • Return each list ALREADY DE-DUPLICATED: merge identical or semantically
+    equivalent items and keep the more specific one (e.g. "biologic" +
+    "monoclonal antibody" → "monoclonal antibody").
+  • "geography" must ALREADY BE NORMALISED: city level as "City, ST, Country"
+    (e.g. "Boston, MA, US"), state only as "State, Country", country only as
+    "Country"; use "US" / "UK"; drop a broader location when a more specific
+    one in it exists; no street addresses, building names or postal codes.
+
+════════════════════ EXTRACTION RULES ════════════════════
+"""
+    + STARTUP_3FIELDS_PROMPT.split("Goal →", 1)[1]
+)
+
+# Local matcher over the prompt's own modality / disease taxonomy
+TAXONOMY = taxonomy_matcher.TaxonomyMatcher.from_prompt(STARTUP_3FIELDS_PROMPT)
+TAXONOMY_PREFILTER = os.getenv("TAXONOMY_PREFILTER", "1") == "1"
+_taxonomy_lock = threading.Lock()
+taxonomy_stats = {"gate_llm_skipped": 0, "degraded_gate": 0, "degraded_extraction": 0}
+
+def _taxonomy_count(key: str):
+    with _taxonomy_lock:
+        taxonomy_stats[key] += 1
+
+# Where this thread's last therapeutic verdict came from: "llm", "taxonomy",
+# "degraded" or "no_text". Only "llm" verdicts are safe to cache.
+_gate_status = threading.local()
+
+def _set_gate_source(source: str):
+    _gate_status.source = source
+
+def _gate_verdict_authoritative() -> bool:
+    """True if this thread's last gate verdict came from the LLM on rendered text."""
+    return getattr(_gate_status, "source", None) == "llm"
+
+def _is_degraded(fields) -> bool:
+    return bool(fields) and "degraded_from" in (fields.get("_meta") or {})
+
+def _degraded_fields(context: str, link_bundle, model: str) -> dict:
+    """API unavailable: fields straight from the taxonomy matches (no geography)."""
+    _taxonomy_count("degraded_extraction")
+    found = TAXONOMY.extract_fields(context)
+    print(f"   [degraded] taxonomy matcher → {found}")
+    return {
+        "drug_modality": found["drug_modality"],
+        "disease_focus": found["disease_focus"],
+        "geography":     None,
+        "_meta": {
+            "source_links": link_bundle,
+            "model": "taxonomy_matcher",
+            "degraded_from": model,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    }
+
 def normalize_url(u: str) -> str:
     p = urlparse(u)
     return p._replace(path=p.path.rstrip("/").lower(),
@@ -322,8 +813,8 @@ USER_AGENTS = [
    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
 ]
 
-class TimeoutException(Exception):
-   pass
+# kept for callers that test isinstance(err, TimeoutException)
+TimeoutException = task_runtime.DeadlineExceeded
 
 
 def setup_signal_handlers():
@@ -336,29 +827,10 @@ def setup_signal_handlers():
    signal.signal(signal.SIGTERM, signal_handler)
    signal.signal(signal.SIGINT, signal_handler)
 
-def timeout_handler(func, args=(), kwargs={}, timeout_duration=60, default=None):
-   """Execute function with timeout using threading"""
-   result = [default]
-   exception = [None]
-  
-   def target():
-       try:
-           result[0] = func(*args, **kwargs)
-       except Exception as e:
-           exception[0] = e
-  
-   thread = threading.Thread(target=target)
-   thread.daemon = True
-   thread.start()
-   thread.join(timeout_duration)
-  
-   if thread.is_alive():
-       return default, TimeoutException(f"Function timed out after {timeout_duration}s")
-  
-   if exception[0]:
-       return default, exception[0]
-  
-   return result[0], None
+def timeout_handler(func, args=(), kwargs={}, timeout_duration=60, default=None, cleanup=None):
+   """Run func under a cancellable deadline; ``cleanup`` kills what it blocks on."""
+   return task_runtime.run_with_deadline(func, args, kwargs, timeout_duration=timeout_duration,
+                                         default=default, cleanup=cleanup)
 
 def get_random_headers():
    return {
@@ -369,69 +841,75 @@ def get_random_headers():
        "Upgrade-Insecure-Requests": "1"
    }
 
-def is_therapeutic_site(website_url: str) -> bool:
+def is_therapeutic_site(website_url: str, session: CompanySession = None) -> bool:
     
-    text = _extract_visible_text_from_url(website_url, scrolls=4)[:8_000]  # keep prompt short
-
-    prompt = f"""
-Answer with **yes** or **no** (lower-case, no punctuation).
-
-Say **yes** if the text shows that the company itself is discovering,
-engineering, developing, testing, or commercialising **therapeutic
-products** intended to treat disease in humans.
+    if session is not None:
+        text = session.text(website_url, 8_000)  # reuse the cached render
+    else:
+        text = _extract_visible_text_from_url(website_url, scrolls=4)[:8_000]  # keep prompt short
 
-Accept ALL of the following synonyms as evidence:
-  • drug, medicine, therapy, treatment, clinical candidate, asset, molecule
-  • phrases such as “Phase 1/2/3”, “IND-enabling”, “pipeline”, “program”
+    if not text.strip():
+        # render failed – a "no" here says nothing about the company
+        _set_gate_source("no_text")
+        print("   [gate] homepage rendered no text")
+        return False
 
-Positive cues – **any ONE is sufficient**:
-  • mention of a pre-clinical or clinical pipeline / program / asset
-  • clinical-trial phases (IND-enabling, Phase 1/2/3, pivotal study, NDA, BLA)
-  • modality keywords: small-molecule, biologic, antibody(-drug conjugate),
-    protein, peptide, RNA therapy (mRNA, siRNA, ASO, saRNA), gene therapy,
-    cell therapy, viral vector, vaccine, live biotherapeutic, microbiome
-    therapy, optogenetic medicine, PROTAC, radioligand, degrader, etc.
-  • explicit goal to *treat*, *cure*, *restore*, or *prevent* a named disease
+    # No taxonomy term and no therapeutic cue at all → "no" without a GPT call
+    if TAXONOMY_PREFILTER and not TAXONOMY.has_therapeutic_signal(text):
+        _taxonomy_count("gate_llm_skipped")
+        print("   [taxonomy] no therapeutic signal on homepage – gate LLM skipped")
+        _set_gate_source("taxonomy")
+        return False
 
-Say **no** if the company is **only**:
-  • diagnostics / devices / digital-health / CRO / CDMO / research tools
-  • data / AI platforms without in-house therapeutics
-  • insurers, consultancies, accelerators, investors, news outlets, foundations
-  • describing partners’ drugs but not its own
+    prompt = f"""
+Answer with **yes** or **no** (lower-case, no punctuation).
 
-If evidence is genuinely ambiguous, default to **no**.
+{THERAPEUTIC_CRITERIA}
 
 TEXT:
 \"\"\"{text}\"\"\"
 """.strip()
 
-    reply = client.chat.completions.create(
-        model="gpt-4.1-2025-04-14",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0,
-        max_tokens=1,
-    ).choices[0].message.content.strip().lower()
+    try:
+        reply = client.chat.completions.create(
+            model="gpt-4.1-2025-04-14",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0,
+            max_tokens=1,
+            timeout=task_runtime.remaining_timeout(AI_TIMEOUT),
+        ).choices[0].message.content.strip().lower()
+    except task_runtime.DeadlineExceeded:
+        raise
+    except Exception as e:
+        # degraded mode: a modality or disease term on the page counts as therapeutic
+        _taxonomy_count("degraded_gate")
+        print(f"   [degraded] gate LLM unavailable ({e}) – using taxonomy matcher")
+        _set_gate_source("degraded")
+        return bool(TAXONOMY.scan(text))
 
+    _set_gate_source("llm")
     return reply.startswith("y")
 
-def smart_page_discovery(website_url: str, company_name: str):
+def smart_page_discovery(website_url: str, company_name: str, session: CompanySession = None):
     """
     Visit the homepage and all unique, same-domain anchors (depth 1, no recursion).
     Return a list[dict] for homepage + all direct links.
+    Pages are rendered through ``session`` so their text is reused downstream.
     """
     print(f"    [DISCOVERY] Depth-1 crawl for {website_url}")
 
-    browser = _launch_browser(headless=True)
+    own_session = session is None
+    if own_session:
+        session = CompanySession()
     discovered, visited = [], set()
 
     try:
         # Visit homepage first
-        browser.get(website_url)
-        WebDriverWait(browser, 12).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        home = session.render(website_url)
+        if home.get("error"):
+            return [], "selenium_depth1"
         visited.add(normalize_url(website_url))
-        title = browser.title or "Untitled"
+        title = home["title"] or "Untitled"
         score = score_page_value(website_url, title)
         discovered.append({
             "url": website_url,
@@ -440,67 +918,126 @@ def smart_page_discovery(website_url: str, company_name: str):
             "category": categorize_page(website_url, title),
             "discovery_method": "selenium_depth1",
             "depth": 0,
-            "text_preview": _extract_visible_text(browser, 180)
+            "text_preview": home["text"][:180]
         })
 
-        # Gather all same-domain anchors (depth 1)
-        soup = BeautifulSoup(browser.page_source, "html.parser")
-        anchors = soup.find_all("a", href=True)
-        base = website_url
-        queued = set()
-        links = []
-
-        for a in anchors:
-            href = a["href"]
-            full = urljoin(base, href)
-            norm = normalize_url(full)
-            if (norm in visited or 
-                norm in queued or
-                not full.startswith("http") or
-                is_banned(full) or
-                is_filetype(full) or
-                not is_same_domain(base, full)):
-                continue
-            queued.add(norm)
-            links.append(full)
+        # Gather all same-domain anchors (depth 1) and score them *before*
+        # loading: URL + anchor text + sitemap priority
+        anchor_pairs = home.get("anchors")
+        if anchor_pairs is None:
+            anchor_pairs = html_parse.parse(home["html"])["anchors"]
+        sitemap = _sitemap_hints(website_url) if SITEMAP_HINTS else {}
+        candidates = _score_anchor_candidates(website_url, anchor_pairs, sitemap, visited)
 
         # Limit to N pages (to prevent long processing)
         N = MAX_PAGES_TO_ANALYZE - 1  # -1 because homepage already added
-        links = links[:N]
+        picked = _pick_diverse(candidates, N)
+        links = [c["url"] for c in picked]
+        print(f"      {len(candidates)} candidate links → loading {len(links)}: "
+              + ", ".join(f"{c['category']}({c['score']})" for c in picked))
 
         # Visit each anchor (depth 1 only)
         for link in links:
-            try:
-                browser.get(link)
-                WebDriverWait(browser, 12).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                visited.add(normalize_url(link))
-                title = browser.title or "Untitled"
-                score = score_page_value(link, title)
-                discovered.append({
-                    "url": link,
-                    "title": title,
-                    "score": score,
-                    "category": categorize_page(link, title),
-                    "discovery_method": "selenium_depth1",
-                    "depth": 1,
-                    "text_preview": _extract_visible_text(browser, 180)
-                })
-            except Exception as e:
-                print(f"      [skip] {link} - {e}")
+            page = session.render(link)
+            if page.get("error"):
                 continue
+            visited.add(normalize_url(link))
+            title = page["title"] or "Untitled"
+            score = score_page_value(link, title)
+            discovered.append({
+                "url": link,
+                "title": title,
+                "score": score,
+                "category": categorize_page(link, title),
+                "discovery_method": "selenium_depth1",
+                "depth": 1,
+                "text_preview": page["text"][:180]
+            })
     finally:
-        try:
-            browser.quit()
-        except Exception:
-            pass
+        if own_session:
+            session.close()
 
     discovered.sort(key=lambda x: x["score"], reverse=True)
     top_pages = discovered[:MAX_PAGES_TO_ANALYZE]
     print(f"      Discovery finished → {len(top_pages)} pages kept")
     return top_pages, "selenium_depth1"
 
+def _sitemap_hints(website_url: str) -> dict:
+    """{normalized url: (url, priority)} from /sitemap.xml – a cheap hint, no browser."""
+    try:
+        resp = requests.get(urljoin(website_url, "/sitemap.xml"), headers=get_random_headers(),
+                            timeout=task_runtime.remaining_timeout(5))
+        if resp.status_code != 200 or "<loc>" not in resp.text:
+            return {}
+    except task_runtime.DeadlineExceeded:
+        raise
+    except Exception:
+        return {}
+    hints = {}
+    for block in re.findall(r"<url>(.*?)</url>", resp.text, flags=re.S | re.I)[:500]:
+        loc = re.search(r"<loc>\s*(.*?)\s*</loc>", block, flags=re.S | re.I)
+        if not loc:
+            continue
+        prio = re.search(r"<priority>\s*([\d.]+)\s*</priority>", block, flags=re.I)
+        url = loc.group(1).strip()
+        hints[normalize_url(url)] = (url, float(prio.group(1)) if prio else 0.5)
+    return hints
+
+def _score_anchor_candidates(base: str, anchor_pairs, sitemap: dict, visited: set) -> list:
+    """
+    Score depth-1 links from URL + anchor text with the score_page_value /
+    categorize_page vocabularies; sitemap entries add a priority bonus and
+    contribute links the homepage nav does not show.
+    """
+    base_host = _strip_www(urlparse(base).netloc)
+    by_norm = {}
+    for href, text in list(anchor_pairs) + [(u, "") for u, _ in sitemap.values()]:
+        full = urljoin(base, href)
+        norm = normalize_url(full)
+        if (norm in visited or
+            not full.startswith("http") or
+            is_filetype(full) or
+            _strip_www(urlparse(full).netloc) != base_host):
+            continue
+        category = categorize_page(full, text)
+        if is_banned(full) and not (
+                category == "geography"
+                and any(s in urlparse(full).path.lower() for s in GEOGRAPHY_SLUGS)):
+            continue
+        entry = by_norm.setdefault(norm, {"url": full, "text": "", "order": len(by_norm)})
+        if text and text not in entry["text"]:
+            entry["text"] = f"{entry['text']} {text}".strip()
+
+    candidates = []
+    for norm, c in by_norm.items():
+        path = urlparse(c["url"]).path.lower()
+        slug_text = re.sub(r"[-_/]+", " ", path)
+        score = score_page_value(c["url"], f"{c['text']} {slug_text}")
+        if any(slug in path for slug in PRIORITY_SLUGS):
+            score += 10
+        if norm in sitemap:
+            score += int(sitemap[norm][1] * 10)
+        if path.count("/") > 2:              # deep item pages (one news post, one PDF viewer…)
+            score -= 10
+        candidates.append({**c, "score": score,
+                           "category": categorize_page(c["url"], c["text"])})
+    return candidates
+
+def _pick_diverse(candidates: list, n: int) -> list:
+    """Top-``n`` candidates with one per DIVERSITY_CATEGORIES slot reserved first."""
+    ranked = sorted(candidates, key=lambda c: (-c["score"], c["order"]))
+    picked = []
+    for category in DIVERSITY_CATEGORIES:
+        best = next((c for c in ranked if c["category"] == category), None)
+        if best is not None and len(picked) < n:
+            picked.append(best)
+    for c in ranked:
+        if len(picked) >= n:
+            break
+        if c not in picked:
+            picked.append(c)
+    return picked
+
 def score_page_value(url, link_text, content_preview=""):
    """Score the potential value of a page for biotech intelligence"""
    score = 0
@@ -659,8 +1196,15 @@ def deduplicate_startup_field_with_llm(field_name, values):
     clean_values = [v.strip() for v in values if v and v.strip()]
     if not clean_values:
         return None
-    
-    # Always process for normalization (even single values need canonical forms)
+
+    # Deterministic pre-pass – GPT only sees what the rules can't settle
+    clean_values = field_normalizer.collapse_values(field_name, clean_values)
+    if not field_normalizer.needs_llm(field_name, clean_values, per_startup=True):
+        field_normalizer.record("deduplicate_startup_field", skipped=True)
+        print(f"   [dedup] {field_name}: settled deterministically → {clean_values}")
+        return clean_values
+    field_normalizer.record("deduplicate_startup_field", skipped=False)
+
     try:
         prompt = llm_dedup_prompt(field_name, clean_values)
         response = client.chat.completions.create(
@@ -668,6 +1212,7 @@ def deduplicate_startup_field_with_llm(field_name, values):
             messages=[{"role": "user", "content": prompt}],
             max_tokens=500,
             temperature=0,
+            timeout=task_runtime.remaining_timeout(AI_TIMEOUT),
         ).choices[0].message.content.strip()
         
         print(f"   [DEBUG] LLM deduplication for {field_name}: {clean_values} -> processing...")
@@ -713,56 +1258,108 @@ def deduplicate_startup_field_with_llm(field_name, values):
         print(f"   [LLM dedup error] {field_name}: {e}")
         return clean_values
 
-def extract_startup_fields(
-    company_name: str,
-    crawled_pages: list[dict],
-    max_pages: int = 4,
-    model: str = "gpt-4.1-2025-04-14",
-):
-    if not crawled_pages:
-        return {}
-    # 1. Concatenate the best N pages into a single context string
+def _build_page_context(crawled_pages, max_pages, session=None, per_page=3_500):
+    """Concatenate the best N pages into one context string + link bundle."""
     chunks, link_bundle = [], []
     for i, page in enumerate(crawled_pages[:max_pages], start=1):
         url   = page["url"]
         title = page.get("title", f"PAGE {i}")
-        text  = _extract_visible_text_from_url(url)[:3_500]  # cap tokens
+        if session is not None:
+            text = session.text(url)  # already rendered during discovery
+        else:
+            text = _extract_visible_text_from_url(url)
+        # long pages: page head + the passages around taxonomy hits, not just the top
+        text = TAXONOMY.passages(text, per_page)
         chunks.append(f"\n=== PAGE {i}: {title} ===\nURL: {url}\n{text}")
         link_bundle.append({"url": url, "title": title})
+    return "\n".join(chunks)[:10_000], link_bundle
 
-    context = "\n".join(chunks)[:10_000]
+_llm_status = threading.local()
 
-    # 2. Fill the prompt template
-    prompt = STARTUP_3FIELDS_PROMPT.format(context=context)
+def _llm_api_failed() -> bool:
+    """True if this thread's last _llm_json call failed at the API (not at parsing)."""
+    return getattr(_llm_status, "api_error", False)
 
-    # 3. LLM call under a timeout guard
-    def llm_call():
-        return client.chat.completions.create(
+def _llm_json(prompt: str, model: str, max_tokens: int = 500):
+    """One chat call bounded by AI_TIMEOUT and the company deadline; parsed JSON or None."""
+    _llm_status.api_error = False
+    try:
+        raw_reply = client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0,
-            max_tokens=500,
+            max_tokens=max_tokens,
+            # the request itself is aborted – no thread left waiting on it
+            timeout=task_runtime.remaining_timeout(AI_TIMEOUT),
         ).choices[0].message.content.strip()
-
-    raw_reply, err = timeout_handler(llm_call, timeout_duration=AI_TIMEOUT)
-    if err:
+    except task_runtime.DeadlineExceeded:
+        raise
+    except Exception as err:
         print(f"[AI-timeout] {err}")
-        return {}
+        _llm_status.api_error = True
+        return None
 
-    # 4. Parse JSON – strip fences just in case
+    # Parse JSON – strip fences just in case
     reply = raw_reply
     if reply.startswith("```"):
         parts = reply.split("```")
         if len(parts) >= 2:
             reply = parts[1].strip()
+            if reply.lower().startswith("json"):
+                reply = reply[4:].strip()
 
     try:
-        data = json.loads(reply)
+        return json.loads(reply)
     except Exception as e:
         print(f"[JSON-parse error] {e}")
+        return None
+
+def _apply_geography_fallback(company_name: str, out: dict, website_url: str = ""):
+    """
+    Fallback: if geography is missing/empty, use the cached HQ or defer the
+    Serper lookup to the end-of-run batch (resolve_pending_geography).
+    """
+    if not out["geography"] or (isinstance(out["geography"], list) and not out["geography"]):
+        serper_api_key = os.getenv("SERPER_API_KEY")
+        if serper_api_key:
+            cached = company_store.get_store().get_hq(company_name, website_url)
+            if cached:
+                out["geography"] = [cached]
+                out["_meta"]["geography_source"] = "hq_cache"
+                print(f"[Serper fallback] {company_name}: {cached} (cached)")
+            elif cached == "":
+                out["_meta"]["geography_source"] = "none_found"
+            else:
+                out["_meta"]["geography_source"] = "pending_batch"
+        else:
+            print("[Serper fallback] SERPER_API_KEY not set; skipping fallback.")
+            out["_meta"]["geography_source"] = "no_api_key"
+    else:
+        out["_meta"]["geography_source"] = "llm_or_webpage"
+
+def extract_startup_fields(
+    company_name: str,
+    crawled_pages: list[dict],
+    max_pages: int = 4,
+    model: str = "gpt-4.1-2025-04-14",
+    session: CompanySession = None,
+):
+    if not crawled_pages:
+        return {}
+    # 1. Concatenate the best N pages into a single context string
+    context, link_bundle = _build_page_context(crawled_pages, max_pages, session)
+
+    # 2. Fill the prompt template
+    prompt = STARTUP_3FIELDS_PROMPT.format(context=context)
+
+    # 3. LLM call under a timeout guard + JSON parse
+    data = _llm_json(prompt, model)
+    if data is None:
+        if _llm_api_failed():
+            return _degraded_fields(context, link_bundle, model)
         return {}
 
-    # 5. Light validation / null-fill (no deduplication yet)
+    # 4. Light validation / null-fill (no deduplication yet)
     raw_modality = data.get("drug_modality")
     raw_disease = data.get("disease_focus")
     raw_geography = data.get("geography")
@@ -777,24 +1374,9 @@ def extract_startup_fields(
             "timestamp": datetime.utcnow().isoformat()
         }
     }
-    # Fallback: if geography is missing/empty, use Serper API
-    if not out["geography"] or (isinstance(out["geography"], list) and not out["geography"]):
-        serper_api_key = os.getenv("SERPER_API_KEY")
-        if serper_api_key:
-            locations = serper_geography_fallback(company_name, serper_api_key)
-            if locations:
-                out["geography"] = locations
-                out["_meta"]["geography_source"] = "serper_fallback"
-                print(f"[Serper fallback] {company_name}: {locations}")
-            else:
-                out["_meta"]["geography_source"] = "none_found"
-        else:
-            print("[Serper fallback] SERPER_API_KEY not set; skipping fallback.")
-            out["_meta"]["geography_source"] = "no_api_key"
-    else:
-        out["_meta"]["geography_source"] = "llm_or_webpage"
+    _apply_geography_fallback(company_name, out, crawled_pages[0]["url"])
     
-    # 6. FINAL STEP: Apply LLM deduplication to all fields regardless of source
+    # 5. FINAL STEP: Apply LLM deduplication to all fields regardless of source
     print(f"   [LLM dedup] Applying final deduplication to all fields...")
     out["drug_modality"] = deduplicate_startup_field_with_llm("drug_modality", out["drug_modality"])
     out["disease_focus"] = deduplicate_startup_field_with_llm("disease_focus", out["disease_focus"])
@@ -802,16 +1384,118 @@ def extract_startup_fields(
     
     return out
 
+def extract_startup_fields_single_pass(
+    company_name: str,
+    website_url: str,
+    session: CompanySession,
+    max_pages: int = 4,
+    model: str = "gpt-4.1-2025-04-14",
+):
+    """
+    ENRICHMENT_MODE="single_pass": one structured call on the homepage returns
+    the therapeutic verdict plus already de-duplicated / normalised fields.
+    A negative verdict short-circuits before any subpage is crawled; otherwise
+    subpages are crawled and a second call refines the fields.
+    Returns None on failure, {"is_therapeutic": False} when gated out.
+    """
+    home = session.render(website_url)
+    if home.get("error") or not home["text"].strip():
+        _set_gate_source("no_text")
+        return None
+
+    home_page = [{"url": website_url, "title": home["title"] or "Untitled"}]
+    # same 8k homepage budget the staged gate uses
+    context, link_bundle = _build_page_context(home_page, 1, session, per_page=8_000)
+    if TAXONOMY_PREFILTER and not TAXONOMY.has_therapeutic_signal(context):
+        _taxonomy_count("gate_llm_skipped")
+        print("   [taxonomy] no therapeutic signal on homepage – LLM skipped")
+        _set_gate_source("taxonomy")
+        return {"is_therapeutic": False}
+    data = _llm_json(STARTUP_SINGLE_PASS_PROMPT.format(context=context), model)
+    if data is None:
+        if _llm_api_failed() and TAXONOMY.scan(context):
+            _set_gate_source("degraded")
+            out = _degraded_fields(context, link_bundle, model)
+            out["is_therapeutic"] = True
+            return out
+        return None
+    _set_gate_source("llm")
+    if not data.get("is_therapeutic"):
+        return {"is_therapeutic": False}
+    llm_calls = 1
+
+    # Therapeutic → crawl subpages (homepage render is reused from the cache)
+    pages, _ = smart_page_discovery(website_url, company_name, session=session)
+    if len(pages) > 1:
+        context, link_bundle = _build_page_context(pages, max_pages, session)
+        refined = _llm_json(STARTUP_SINGLE_PASS_PROMPT.format(context=context), model)
+        llm_calls += 1
+        if refined is not None:
+            data = refined
+
+    out = {
+        "is_therapeutic": True,
+        "drug_modality": data.get("drug_modality"),
+        "disease_focus": data.get("disease_focus"),
+        "geography":     data.get("geography"),
+        "_meta": {
+            "source_links": link_bundle,
+            "model": model,
+            "mode": "single_pass",
+            "llm_calls": llm_calls,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    }
+    _apply_geography_fallback(company_name, out, website_url)
+
+    # Lists come back de-duplicated; only the rule-based pass runs here.
+    # A Serper-sourced location still needs its canonical form.
+    for field in ("drug_modality", "disease_focus"):
+        if out[field]:
+            out[field] = field_normalizer.collapse_values(field, out[field])
+    if out["_meta"].get("geography_source") in ("serper_fallback", "hq_cache"):
+        out["geography"] = deduplicate_startup_field_with_llm("geography", out["geography"])
+    elif out["geography"]:
+        out["geography"] = field_normalizer.collapse_values("geography", out["geography"])
+    return out
+
 # ────────────────────────────────────────────────────────────────
 #  ONE-COMPANY ORCHESTRATION (therapeutic gate → crawl → GPT)
 # ────────────────────────────────────────────────────────────────
-def process_startup_with_hybrid_system(company_info, idx, total):
+def process_startup_with_hybrid_system(company_info, idx, total, deadline=None):
     """
     1) skip if site is not therapeutic
     2) run depth-1 Selenium crawl
     3) ask GPT-4o-mini for the two target fields
        → returns a trimmed dict or None on failure
+
+    The whole company runs under a COMPANY_TIMEOUT budget (a child of the
+    run ``deadline``); on expiry its browser is killed and None returned.
+    """
+    return process_startup_with_status(company_info, idx, total, deadline)[1]
+
+
+# Outcomes worth journaling: a rerun must not redo them. Everything else
+# ("failed", "timed_out") is retried when the run resumes.
+FINAL_STATUSES = ("enriched", "not_therapeutic")
+
+
+def process_startup_with_status(company_info, idx, total, deadline=None):
     """
+    process_startup_with_hybrid_system that also says why: returns
+    (status, result) with status "enriched", "not_therapeutic", "failed"
+    or "timed_out".
+    """
+    company = company_info["company_name"]
+    try:
+        with task_runtime.Deadline(COMPANY_TIMEOUT, parent=deadline, label=company):
+            return _process_startup(company_info, idx, total)
+    except task_runtime.DeadlineExceeded as e:
+        print(f"   ⏰ {company}: {e} – skipped")
+        return "timed_out", None
+
+
+def _process_startup(company_info, idx, total):
     company   = company_info["company_name"]
     url       = company_info["website_url"]
     source_vc = company_info.get("source_vc", "Unknown VC")
@@ -820,29 +1504,107 @@ def process_startup_with_hybrid_system(company_info, idx, total):
     print(f"[URL] {url}")
     start_t = time.time()
 
+    # 0. Cross-VC company store – no network work for fresh entries
+    store = company_store.get_store()
+    cached = store.get_enrichment(url)
+    if cached is not None:
+        if not cached["is_therapeutic"]:
+            print("   ✖ not a therapeutic company (company store) – skipped")
+            return "not_therapeutic", None
+        if cached["fields"]:
+            print("   ♻ fields served from company store")
+            return "enriched", {"company_name": company, "website_url": url, **cached["fields"]}
+
+    # 0b. Liveness probe – dead, parked or challenge-walled domains never get a browser
+    alive, reason = site_probe.check(url)
+    if not alive:
+        print(f"   ✖ site unreachable: {reason} – skipped")
+        return "failed", None
+
+    # One browser for the whole company; each URL is rendered once
+    with CompanySession() as session:
+        task_runtime.current().on_cancel(session.abort)
+        try:
+            status, fields = _enrich_in_session(company, url, session, store)
+        finally:
+            # per-domain cost history feeds the longest-first scheduler; a
+            # company cut off by the run budget has no real duration to record
+            if not _run_budget_spent():
+                store.record_timing(url, time.time() - start_t, session.renders)
+    if not fields:
+        return status, None
+
+    result = {
+        "company_name": company,
+        "website_url": url,
+        **fields
+    }
+    return status, result
+
+
+def _enrich_in_session(company, url, session, store):
+    """
+    Gate + crawl + extraction for one company; returns (status, fields)
+    as process_startup_with_status does. Only verdicts from the real LLM
+    gate on rendered text, and never degraded-mode fields, are written to
+    the company store.
+    """
+    _set_gate_source(None)
+    if ENRICHMENT_MODE == "single_pass":
+        fields = extract_startup_fields_single_pass(company, url, session)
+        if fields is None:
+            print("   ✖ GPT returned no usable fields")
+            return "failed", None
+        if not fields.pop("is_therapeutic", False):
+            print("   ✖ not a therapeutic / drug-development company – skipped")
+            return _negative_verdict(company, url, store), None
+        print(f"   [session] {session.launches} browser launch(es), {session.renders} page render(s)")
+        if _gate_verdict_authoritative() and not _is_degraded(fields):
+            store.put_enrichment(company, url, True, fields)
+        return "enriched", fields
+
     # 1. Therapeutic gate
-    if not is_therapeutic_site(url):
+    if not is_therapeutic_site(url, session=session):
         print("   ✖ not a therapeutic / drug-development company – skipped")
-        return None
+        return _negative_verdict(company, url, store), None
 
     # 2. Depth-1 crawl
-    pages, _ = smart_page_discovery(url, company)
+    task_runtime.check()
+    pages, _ = smart_page_discovery(url, company, session=session)
     if not pages:
         print("   ✖ no pages worth analysing")
-        return None
+        return "failed", None
 
     # 3. GPT extraction (returns at most 2 dicts)
-    fields = extract_startup_fields(company, pages)
+    task_runtime.check()
+    fields = extract_startup_fields(company, pages, session=session)
     if not fields:
         print("   ✖ GPT returned no usable fields")
-        return None
-    
-    result = {
-        "company_name": company,
-        "website_url": url,
-        **fields
-    }
-    return result
+        return "failed", None
+    print(f"   [session] {session.launches} browser launch(es), {session.renders} page render(s)")
+
+    if _gate_verdict_authoritative() and not _is_degraded(fields):
+        store.put_enrichment(company, url, True, fields)
+    return "enriched", fields
+
+
+def _run_budget_spent() -> bool:
+    """True if the run deadline above this company's deadline was cancelled or ran out."""
+    company_deadline = task_runtime.current()
+    run = company_deadline.parent if company_deadline is not None else None
+    return run is not None and (run.cancelled or run.remaining() <= 0)
+
+
+def _negative_verdict(company, url, store) -> str:
+    """
+    Status for a "not therapeutic" gate answer. LLM verdicts are cached;
+    a taxonomy miss on rendered text is final for this run only; a
+    degraded or empty-page "no" is a failure to retry.
+    """
+    source = getattr(_gate_status, "source", None)
+    if source == "llm":
+        store.put_enrichment(company, url, False)
+    return "not_therapeutic" if source in ("llm", "taxonomy") else "failed"
 
 
 def main() -> None:
@@ -886,18 +1648,29 @@ def main() -> None:
     # ---------- 2. parallel loop ----------
     results, start = [], time.time()
     max_workers = min(6, len(companies))  # Increased from 4 to 6 based on system capabilities
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    run_deadline = task_runtime.Deadline(TOTAL_TIMEOUT, label="enrichment run")
+    with browser_pool(min(BROWSER_POOL_SIZE, max_workers)), \
+         ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = []
         for idx, c in enumerate(companies, 1):
             if isinstance(c, str):
                 c = {"company_name": c, "website_url": c}
             if not c.get("website_url"):
                 print(f"   ⤷ skipping {c.get('company_name','?')} – no URL"); continue
-            futures.append(executor.submit(process_startup_with_hybrid_system, c, idx, len(companies)))
+            futures.append(executor.submit(process_startup_with_hybrid_system, c, idx, len(companies),
+                                           run_deadline))
+        run_deadline.on_cancel(lambda: [f.cancel() for f in futures])
         for future in as_completed(futures):
+            if future.cancelled():
+                continue
             out = future.result()
             if out:
                 results.append(out)
+    run_deadline.close()
+    if run_deadline.cancelled:
+        print(f"⏰ {run_deadline.reason} – remaining companies skipped")
+
+    resolve_pending_geography(results)
 
     # ---------- 2.5. therapeutic_investor_portfolio flag ----------
     # Count therapeutic companies (those that passed is_therapeutic_site check)
@@ -915,6 +1688,8 @@ def main() -> None:
     if therapeutic_count > 0 and therapeutic_count < min_therapeutic_threshold:
         print(f"   ⚠️  Found {therapeutic_count} therapeutic companies, but need {min_therapeutic_threshold} for significant presence")
 
+    field_normalizer.print_skip_report()
+
     # ---------- 3. save ----------
     vc_name_fs = sys.argv[2]
     output_dir = os.path.join("output", "runs", vc_name_fs)
@@ -931,7 +1706,8 @@ def main() -> None:
             "therapeutic_companies_found": therapeutic_count,
             "minimum_threshold": min_therapeutic_threshold,
             "meets_threshold": therapeutic_investor_portfolio
-        }
+        },
+        "dedup_stats": field_normalizer.skip_stats()
     }
     outfile.write_text(json.dumps(output_data, indent=2), encoding="utf-8")
 
@@ -945,6 +1721,116 @@ def main() -> None:
           f"⏱️ {time.time()-start:.1f}s total", sep="\n")
     print(f"OUTPUT_FILE: {outfile}")
 
+# ── Crash-resume journal for run_enrichment ──────────────────────────
+_journal_lock = threading.Lock()
+
+def _journal_key(company_info: dict) -> str:
+    return f"{company_info.get('company_name', '')}|{normalize_url(company_info.get('website_url', ''))}"
+
+def _journal_path(output_dir, input_path) -> Path:
+    """One journal per input file content – a rerun on the same input resumes it."""
+    import hashlib
+    digest = hashlib.sha1(Path(input_path).read_bytes()).hexdigest()[:12]
+    return Path(output_dir) / f"startup_extract_{digest}.partial.jsonl"
+
+def _load_journal(path: Path) -> list:
+    """Completed entries; a torn last line from a crash is ignored."""
+    entries = []
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+def _journal_done_keys(entries) -> set:
+    """Keys with a final outcome; null results from older journals are retried."""
+    return {e["key"] for e in entries
+            if e.get("result") or e.get("status") in FINAL_STATUSES}
+
+def _append_journal(path: Path, company_info: dict, result, status: str):
+    line = json.dumps({"key": _journal_key(company_info),
+                       "company_name": company_info.get("company_name"),
+                       "status": status,
+                       "result": result}, default=str)
+    with _journal_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+# ── Longest-first company scheduler ──────────────────────────────────
+def _simulate_makespan(costs, workers: int) -> float:
+    """List-schedule ``costs`` in the given order on ``workers`` → finish time."""
+    finish = [0.0] * max(1, workers)
+    for cost in costs:
+        i = finish.index(min(finish))
+        finish[i] += cost
+    return max(finish)
+
+def plan_schedule(companies, workers: int, budget: float):
+    """
+    Order companies longest-predicted-first (LPT) from per-domain history
+    in the company store. Only measured costs (history, or a fresh cached
+    enrichment) can defer a company up front: the lowest-value ones
+    (website discovery ``total_score``) go while the measured jobs alone
+    overrun ``budget``. Companies priced at DEFAULT_COMPANY_COST are never
+    deferred here – _run_scheduled defers them only if the budget is
+    really spent. Returns (jobs, deferred, report); each job is
+    {"info", "idx", "cost", "measured", "value"}.
+    """
+    store = company_store.get_store()
+    timings = store.get_timings(c["info"]["website_url"] for c in companies)
+    for job in companies:
+        url = job["info"]["website_url"]
+        hist = timings.get(company_store.canonical_domain(url))
+        if store.has_fresh_enrichment(url):
+            job["cost"], job["measured"] = CACHED_COMPANY_COST, True
+        elif hist:
+            job["cost"], job["measured"] = hist[0], True
+        else:
+            job["cost"], job["measured"] = DEFAULT_COMPANY_COST, False
+        job["value"] = float(job["info"].get("total_score") or 0)
+    with_history = sum(1 for j in companies
+                       if company_store.canonical_domain(j["info"]["website_url"]) in timings)
+
+    input_order = _simulate_makespan([j["cost"] for j in companies], workers)
+    jobs = sorted(companies, key=lambda j: -j["cost"])
+    deferred = []
+    if with_history:
+        measured = [j for j in jobs if j["measured"]]
+        by_value = sorted(measured, key=lambda j: (j["value"], -j["cost"]))
+        while measured and _simulate_makespan([j["cost"] for j in measured], workers) > budget:
+            victim = by_value.pop(0)
+            measured.remove(victim)
+            jobs.remove(victim)
+            deferred.append(victim)
+
+    report = {
+        "workers": workers,
+        "budget_s": budget,
+        "companies_with_history": with_history,
+        "predicted_makespan_input_order_s": round(input_order, 1),
+        "predicted_makespan_scheduled_s": round(_simulate_makespan([j["cost"] for j in jobs], workers), 1),
+        "deferred": [j["info"].get("company_name") for j in deferred],
+    }
+    return jobs, deferred, report
+
+def _run_scheduled(job, total, run_deadline):
+    """
+    Start a job unless the run budget is spent – or, for a job with a
+    measured cost, can no longer cover it. A job cut off because the run
+    budget ran out is "deferred" too.
+    """
+    left = run_deadline.remaining()
+    if run_deadline.cancelled or left <= 0 or (
+            job["measured"] and left < job["cost"] and job["cost"] > CACHED_COMPANY_COST):
+        return "deferred", None
+    status, out = process_startup_with_status(job["info"], job["idx"], total, run_deadline)
+    if status not in FINAL_STATUSES and (run_deadline.cancelled or run_deadline.remaining() <= 0):
+        return "deferred", None
+    return status, out
+
 def run_enrichment(input_path, vc_name_fs, output_dir=None):
     """
     Run the enrichment pipeline natively.
@@ -953,7 +1839,8 @@ def run_enrichment(input_path, vc_name_fs, output_dir=None):
         vc_name_fs (str): Filesystem-safe VC name
         output_dir (str, optional): Output directory. Defaults to output/runs/<vc_name_fs>/
     Returns:
-        str: Path to output JSON file
+        tuple: (path to output JSON file, names of deferred companies – not
+        enriched yet, a rerun on the same input picks them up)
     """
     import pathlib
     import json
@@ -979,22 +1866,71 @@ def run_enrichment(input_path, vc_name_fs, output_dir=None):
     output_dir = pathlib.Path(output_dir)
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     outfile = output_dir / f"startup_extract_{ts}.json"
+    # Every company with a final outcome (fields, or a confirmed "not
+    # therapeutic") is appended to the journal as it completes; those already
+    # in it (from a crashed or cut-off run on this input) are skipped, while
+    # failures and timeouts are retried.
+    journal = _journal_path(output_dir, input_path)
+    done = _journal_done_keys(_load_journal(journal))
+    if done:
+        print(f"♻ Resuming from {journal.name}: {len(done)} companies already enriched")
     # Parallel enrichment
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    results = []
+    store_snapshot = dict(company_store.get_store().stats)
+    serper_snapshot = dict(serper_client.get_cache().stats)
+    liveness_snapshot = site_probe.start_run()
     max_workers = min(6, len(companies))  # Increased from 4 to 6 based on system capabilities
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = []
-        for idx, c in enumerate(companies, 1):
-            if isinstance(c, str):
-                c = {"company_name": c, "website_url": c}
-            if not c.get("website_url"):
-                continue
-            futures.append(executor.submit(process_startup_with_hybrid_system, c, idx, len(companies)))
+    pending = []
+    for idx, c in enumerate(companies, 1):
+        if isinstance(c, str):
+            c = {"company_name": c, "website_url": c}
+        if not c.get("website_url") or _journal_key(c) in done:
+            continue
+        pending.append({"info": c, "idx": idx})
+    # Longest predicted jobs first; lowest-value companies with measured
+    # costs deferred (not journaled, so a rerun picks them up) when the VC
+    # budget can't fit them, the rest only once the budget is spent
+    budget = min(ENRICHMENT_VC_BUDGET, TOTAL_TIMEOUT)
+    jobs, deferred, schedule = plan_schedule(pending, max_workers, budget)
+    print(f"🗓  Schedule: {len(jobs)} jobs longest-first, predicted makespan "
+          f"{schedule['predicted_makespan_input_order_s']:.0f}s (input order) → "
+          f"{schedule['predicted_makespan_scheduled_s']:.0f}s; {len(deferred)} deferred")
+    # The budget bounds the run; on expiry queued companies are dropped
+    # and in-flight ones are cancelled through their company deadlines.
+    run_deadline = task_runtime.Deadline(budget, label="enrichment run")
+    run_start = time.time()
+    unfinished = []         # failed / timed out – left out of the journal for a retry
+    with browser_pool(min(BROWSER_POOL_SIZE, max_workers)) as pool, \
+         ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_run_scheduled, job, len(companies), run_deadline): job
+                   for job in jobs}
+        run_deadline.on_cancel(lambda: [f.cancel() for f in futures])
         for future in as_completed(futures):
-            out = future.result()
-            if out:
-                results.append(out)
+            if future.cancelled():
+                deferred.append(futures[future])
+                continue
+            status, out = future.result()
+            if status == "deferred":
+                deferred.append(futures[future])
+                continue
+            if status in FINAL_STATUSES:
+                _append_journal(journal, futures[future]["info"], out, status)
+            else:
+                unfinished.append(futures[future]["info"].get("company_name"))
+    schedule["actual_makespan_s"] = round(time.time() - run_start, 1)
+    schedule["deferred"] = [j["info"].get("company_name") for j in deferred]
+    schedule["retry_on_resume"] = unfinished
+    print(f"🗓  Makespan: predicted {schedule['predicted_makespan_scheduled_s']:.0f}s, "
+          f"actual {schedule['actual_makespan_s']:.0f}s; {len(deferred)} deferred")
+    run_deadline.close()
+    timed_out = run_deadline.cancelled
+    if timed_out:
+        print(f"⏰ {run_deadline.reason} – remaining companies skipped")
+    # The final document is built from the journal, not from memory
+    results = [e["result"] for e in _load_journal(journal) if e.get("result")]
+    # Missing geographies were deferred: one concurrent Serper batch +
+    # batched LLM extraction for the whole run
+    geo_stats = resolve_pending_geography(results)
     # Compute therapeutic_investor_portfolio flag
     # Count therapeutic companies (those that passed is_therapeutic_site check)
     therapeutic_count = len(results)
@@ -1010,6 +1946,7 @@ def run_enrichment(input_path, vc_name_fs, output_dir=None):
     
     if therapeutic_count > 0 and therapeutic_count < min_therapeutic_threshold:
         print(f"   ⚠️  Found {therapeutic_count} therapeutic companies, but need {min_therapeutic_threshold} for significant presence")
+    field_normalizer.print_skip_report()
     # Write output as dict
     output_data = {
         "therapeutic_investor_portfolio": therapeutic_investor_portfolio,
@@ -1019,11 +1956,145 @@ def run_enrichment(input_path, vc_name_fs, output_dir=None):
             "minimum_threshold": min_therapeutic_threshold,
             "meets_threshold": therapeutic_investor_portfolio
         },
+        "dedup_stats": field_normalizer.skip_stats(),
+        "company_store_stats": company_store.get_store().stats_since(store_snapshot),
+        "browser_pool_stats": {"slots": pool.size, "launches": pool.launches,
+                               "replacements": pool.replacements},
+        "run_timed_out": timed_out,
+        "resumed_companies": len(done),
+        "liveness_stats": site_probe.stats_since(liveness_snapshot),
+        "geography_batch": geo_stats,
+        "taxonomy_stats": dict(taxonomy_stats),
+        "serper_cache_stats": serper_client.get_cache().stats_since(serper_snapshot),
+        "schedule": schedule,
         "companies": results
     }
     outfile.write_text(json.dumps(output_data, indent=2), encoding="utf-8")
+    if not timed_out and not deferred and not unfinished and journal.exists():
+        # complete: keep the journal next to the output; a rerun starts fresh
+        journal.replace(outfile.with_suffix(".jsonl"))
     print(f"[OK] enrichment complete: {outfile}")
-    return str(outfile)
+    return str(outfile), schedule["deferred"]
+
+GEO_BATCH_SIZE = 20        # companies per HQ-extraction LLM call
+GEO_SEARCH_WORKERS = 8     # concurrent Serper searches
+
+def _serper_hq_snippets(company_name: str, serper_api_key: str) -> str:
+    """One Serper search → the snippets/titles/answer text that may hold the HQ."""
+    query = f"What is the headquarters location of {company_name}?"
+    data = {"q": query, "gl": "us", "hl": "en"}
+    resp = serper_client.search(data, serper_api_key,
+                                timeout=task_runtime.remaining_timeout(15))
+    resp.raise_for_status()
+    data = resp.json()
+    # Collect all relevant text from organic results
+    texts = []
+    for result in data.get("organic", []):
+        if "snippet" in result:
+            texts.append(result["snippet"])
+        if "title" in result:
+            texts.append(result["title"])
+    # Optionally add answerBox/knowledgeGraph fields if present
+    if "answerBox" in data and "answer" in data["answerBox"]:
+        texts.append(data["answerBox"]["answer"])
+    if "knowledgeGraph" in data and "description" in data["knowledgeGraph"]:
+        texts.append(data["knowledgeGraph"]["description"])
+    return "\n".join(texts)[:1_500]
+
+def _llm_extract_hqs(snippets: dict) -> dict:
+    """
+    One LLM call for many companies: {company: search text} → {company:
+    location or ''}. Companies the reply leaves out are left out here too.
+    """
+    blocks = "\n\n".join(f"### {name}\n{text}" for name, text in snippets.items())
+    prompt = (
+        f"You are a world-class data extraction agent for biotech and startup intelligence.\n"
+        f"Your task is to extract ONLY the headquarters location for each company below.\n"
+        "For each company you are given noisy, unstructured search results from Google.\n\n"
+        "Instructions:\n"
+        "- Only return a location if it STRICTLY and CLEARLY the headquarters location (city, state/province, country, or full address) of the company queried.\n"
+        "- Ignore all unrelated information, including company descriptions, news, funding, competitors, year founded, executive names, product names, and any other non-location data.\n"
+        "- If multiple locations are mentioned, choose the one most likely to be the headquarters or main office.\n"
+        "- If a full address is present, prefer it. Otherwise, return the most specific city/state/country.\n"
+        "- Use only the results under a company's own heading for that company.\n"
+        "- If no location is found, use an empty string.\n\n"
+        "Return ONLY a JSON object mapping each company name exactly as written to its location string.\n\n"
+        f"{blocks}"
+    )
+    data = _llm_json(prompt, "gpt-4.1-2025-04-14", max_tokens=60 * len(snippets) + 50)
+    if not isinstance(data, dict):
+        return {}
+    return {name: str(data.get(name) or "").strip() for name in snippets if name in data}
+
+def serper_geography_batch(companies, serper_api_key: str) -> dict:
+    """
+    HQ lookup for many companies at once: cache first (company store, by
+    domain and name), then concurrent Serper searches, then one LLM call
+    per GEO_BATCH_SIZE companies. ``companies`` is [(name, website_url)];
+    returns {name: location} for the ones found. Results – including
+    "nothing found" – are cached for other VCs and later runs.
+    """
+    store = company_store.get_store()
+    found, todo = {}, {}
+    for name, website in companies:
+        cached = store.get_hq(name, website)
+        if cached:
+            found[name] = cached
+        elif cached is None:
+            todo[name] = website
+    if not todo:
+        return found
+
+    snippets = {}
+    with ThreadPoolExecutor(max_workers=min(GEO_SEARCH_WORKERS, len(todo))) as pool:
+        futures = {pool.submit(_serper_hq_snippets, name, serper_api_key): name for name in todo}
+        for fut in as_completed(futures):
+            try:
+                snippets[futures[fut]] = fut.result()
+            except Exception as e:
+                print(f"[Serper fallback error] {futures[fut]}: {e}")
+
+    names = [n for n in todo if snippets.get(n)]
+    for i in range(0, len(names), GEO_BATCH_SIZE):
+        chunk = {n: snippets[n] for n in names[i:i + GEO_BATCH_SIZE]}
+        hqs = _llm_extract_hqs(chunk)
+        if not hqs:
+            continue                      # LLM failure: leave uncached, retry next run
+        for name in chunk:
+            if name not in hqs:
+                continue                  # missing from the reply: not a "no HQ" verdict
+            store.put_hq(name, todo[name], hqs[name])
+            if hqs.get(name):
+                found[name] = hqs[name]
+    for name in todo:
+        if name in snippets and not snippets[name]:
+            store.put_hq(name, todo[name], "")
+    print(f"[Serper fallback] batch: {len(todo)} looked up, "
+          f"{len(companies) - len(todo)} from cache, {len(found)} located")
+    return found
+
+def resolve_pending_geography(results: list) -> dict:
+    """
+    Fill every result whose geography was deferred to the batch
+    ("pending_batch") and refresh its company-store entry. Returns stats.
+    """
+    pending = [r for r in results
+               if (r.get("_meta") or {}).get("geography_source") == "pending_batch"]
+    if not pending:
+        return {"pending": 0, "located": 0}
+    hqs = serper_geography_batch([(r["company_name"], r["website_url"]) for r in pending],
+                                 os.getenv("SERPER_API_KEY"))
+    store = company_store.get_store()
+    for r in pending:
+        loc = hqs.get(r["company_name"])
+        if loc:
+            r["geography"] = deduplicate_startup_field_with_llm("geography", [loc])
+            r["_meta"]["geography_source"] = "serper_fallback"
+        else:
+            r["_meta"]["geography_source"] = "none_found"
+        fields = {k: v for k, v in r.items() if k not in ("company_name", "website_url")}
+        store.put_enrichment(r["company_name"], r["website_url"], True, fields)
+    return {"pending": len(pending), "located": sum(1 for r in pending if hqs.get(r["company_name"]))}
 
 def serper_geography_fallback(company_name: str, serper_api_key: str) -> list:
     """
@@ -1031,61 +2102,14 @@ def serper_geography_fallback(company_name: str, serper_api_key: str) -> list:
     Uses LLM to extract only the headquarters location.
     Returns a list with a single location string (or empty).
     """
-    import requests
-    query = f"What is the headquarters location of {company_name}?"
-    url = "https://google.serper.dev/search"
-    headers = {
-        "X-API-KEY": serper_api_key,
-        "Content-Type": "application/json"
-    }
-    data = {"q": query, "gl": "us", "hl": "en"}
     try:
-        resp = requests.post(url, headers=headers, json=data, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        # Collect all relevant text from organic results
-        texts = []
-        for result in data.get("organic", []):
-            if "snippet" in result:
-                texts.append(result["snippet"])
-            if "title" in result:
-                texts.append(result["title"])
-        # Optionally add answerBox/knowledgeGraph fields if present
-        if "answerBox" in data and "answer" in data["answerBox"]:
-            texts.append(data["answerBox"]["answer"])
-        if "knowledgeGraph" in data and "description" in data["knowledgeGraph"]:
-            texts.append(data["knowledgeGraph"]["description"])
-        # Compose a highly specific LLM prompt
-        prompt = (
-            f"You are a world-class data extraction agent for biotech and startup intelligence.\n"
-            f"Your task is to extract ONLY the headquarters location for the company named '{company_name}'.\n"
-            "You are given noisy, unstructured search results from Google.\n\n"
-            "Instructions:\n"
-            "- Only return a location if it STRICTLY and CLEARLY the headquarters location (city, state/province, country, or full address) of the company queried.\n"
-            "- Ignore all unrelated information, including company descriptions, news, funding, competitors, year founded, executive names, product names, and any other non-location data.\n"
-            "- If multiple locations are mentioned, choose the one most likely to be the headquarters or main office.\n"
-            "- If a full address is present, prefer it. Otherwise, return the most specific city/state/country.\n"
-            "- Do NOT return any company name, website, or metadata.\n"
-            "- Do NOT return any list, explanation, or extra words.\n"
-            "- Return only the location string, with no extra punctuation or formatting.\n"
-            "- If no location is found, return an empty string.\n\n"
-            f"Company: {company_name}\n\nSearch Results:\n" + "\n".join(texts)
-        )
-        # LLM call
-        reply = client.chat.completions.create(
-            model="gpt-4.1-2025-04-14",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-            max_tokens=50,
-        ).choices[0].message.content.strip()
-        # Return as a list (for compatibility)
-        if reply:
-            return [reply]
-        else:
-            return []
+        loc = serper_geography_batch([(company_name, "")], serper_api_key).get(company_name)
+    except task_runtime.DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"[Serper fallback error] {company_name}: {e}")
         return []
+    return [loc] if loc else []
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,104 @@
+# concurrency_controller.py  ─────────────────────────────────────────────
+"""
+AIMD concurrency limit for a pool of I/O-bound company workers.
+
+Completions are judged in windows of roughly one completion per active
+worker. After each window the limit
+  • backs off multiplicatively (× BACKOFF) when the window saw upstream
+    throttling (429s) or timeouts,
+  • grows by one while median latency stays flat (within
+    LATENCY_TOLERANCE of the best window so far, so slow creep is caught)
+    and the error rate does not rise over the previous window,
+  • otherwise holds.
+Every adjustment is kept in ``decisions`` for the run's performance stats.
+"""
+
+import os
+import statistics
+import threading
+import time
+
+BACKOFF = 0.5
+LATENCY_TOLERANCE = float(os.getenv("CONCURRENCY_LATENCY_TOLERANCE", "1.25"))  # p50 ratio still "flat"
+ERROR_TOLERANCE = 0.05                                                          # error-rate rise still "flat"
+MIN_WINDOW = 4
+
+
+class AdaptiveConcurrency:
+    def __init__(self, start: int, min_limit: int = 1, max_limit: int = 32):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(start, self.min_limit), self.max_limit)
+        self.decisions = []
+        self._window = []               # (latency or None, outcome)
+        self._best_p50 = None           # lowest window p50 seen – the "flat" baseline
+        self._prev_error_rate = None
+        self._completed = 0
+        self._peak = self.limit
+        self._started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, latency, outcome: str = "ok"):
+        """One finished task. ``latency`` None = resolved without the slow path (ignored for p50)."""
+        with self._lock:
+            self._window.append((latency, outcome))
+            self._completed += 1
+
+    def window_ready(self) -> bool:
+        with self._lock:
+            return len(self._window) >= max(MIN_WINDOW, self.limit)
+
+    def adjust(self, throttled: int = 0):
+        """
+        Judge the current window; ``throttled`` is the number of upstream 429s
+        seen during it. Returns the new limit.
+        """
+        with self._lock:
+            window, self._window = self._window, []
+            latencies = [lat for lat, _ in window if lat is not None]
+            p50 = statistics.median(latencies) if latencies else None
+            errors = sum(1 for _, o in window if o in ("error", "timeout"))
+            timeouts = sum(1 for _, o in window if o == "timeout")
+            error_rate = errors / len(window) if window else 0.0
+            old = self.limit
+
+            if throttled or timeouts:
+                self.limit = max(self.min_limit, int(self.limit * BACKOFF))
+                action = "backoff"
+            elif self._best_p50 is None or p50 is None:
+                action = "hold"         # first window (or all cached): just a baseline
+            elif (p50 <= self._best_p50 * LATENCY_TOLERANCE
+                  and error_rate <= self._prev_error_rate + ERROR_TOLERANCE):
+                self.limit = min(self.max_limit, self.limit + 1)
+                action = "grow"
+            else:
+                action = "hold"
+            if p50 is not None:
+                self._best_p50 = p50 if self._best_p50 is None else min(self._best_p50, p50)
+            self._prev_error_rate = error_rate
+            self._peak = max(self._peak, self.limit)
+            self.decisions.append({
+                "t": round(time.time() - self._started, 1),
+                "completed": self._completed,
+                "action": action,
+                "limit_from": old,
+                "limit_to": self.limit,
+                "p50_seconds": round(p50, 2) if p50 is not None else None,
+                "error_rate": round(error_rate, 3),
+                "throttled": throttled,
+                "timeouts": timeouts,
+            })
+            return self.limit
+
+    def summary(self) -> dict:
+        with self._lock:
+            actions = [d["action"] for d in self.decisions]
+            return {
+                "final_limit": self.limit,
+                "peak_limit": self._peak,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "grows": actions.count("grow"),
+                "backoffs": actions.count("backoff"),
+                "decisions": list(self.decisions),
+            }
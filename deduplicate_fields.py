@@ -1,5 +1,6 @@
 import os, json, re, openai
 from dotenv import load_dotenv
+import field_normalizer
 
 # ─────────────────────────────
 #  OpenAI setup
@@ -15,15 +16,8 @@ client = openai.OpenAI()
 
 def normalize_value(val: str) -> str:
     val = val.strip().lower()
-    if val in ("series a", "series-a", "series - a"):
-        return "series a"
-    if val in ("series b", "series-b", "series - b"):
-        return "series b"
-    if val in ("rare diseases", "rare disease"):
-        return "rare disease"
-    if val in ("small molecules", "small molecule"):
-        return "small molecule"
-    return val
+    # exact synonym pairs live in field_normalizer.SYNONYMS (extend there)
+    return field_normalizer.SYNONYMS.get(val, val)
 
 def _prep_input(values):
     """Ensure list-of-strings and strip empties."""
@@ -67,6 +61,16 @@ def deduplicate_with_llm(field_name: str, values):
     if len(unique_normalized) < 2:
         return unique_normalized
 
+    # ── deterministic pre-pass: only ambiguous residue reaches GPT ──
+    if field_name not in ("requires_startup_revenue_generation",
+                          "therapeutic_investor", "equity_investor"):
+        unique_normalized = field_normalizer.collapse_values(field_name, unique_normalized)
+        if not field_normalizer.needs_llm(field_name, unique_normalized):
+            field_normalizer.record("deduplicate_with_llm", skipped=True)
+            print(f"DEBUG: '{field_name}' settled deterministically – LLM skipped")
+            return unique_normalized
+        field_normalizer.record("deduplicate_with_llm", skipped=False)
+
     # ── tailored prompts ────────────────────────────────────
     if field_name == "modality":
         prompt = (
@@ -204,4 +208,5 @@ if __name__ == "__main__":
         "sexual health",
         "reproductive and sexual health",
     ]
-    print(deduplicate_with_llm("disease_focus", test))
\ No newline at end of file
+    print(deduplicate_with_llm("disease_focus", test))
+    field_normalizer.print_skip_report()
\ No newline at end of file
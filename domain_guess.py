@@ -0,0 +1,178 @@
+# domain_guess.py  ───────────────────────────────────────────────────────
+"""
+Guess a company's domain before spending Serper queries on it.
+
+The company name is expanded into the domain shapes that
+is_official_company_site already rewards (name.com, namebio.com,
+nametx.com, nametherapeutics.com, .bio / .co). All candidates are probed
+concurrently – DNS first, then a small GET that reads only the <title>
+and meta description – and the live ones are returned for the caller to
+score. Parked and bot-challenge pages are dropped.
+
+Every step is bounded by the caller's task_runtime deadline: DNS lookups
+are given up after the probe timeout, a cancelled deadline closes the
+response mid-read, and probe_candidates returns whatever answered in time.
+"""
+
+import html
+import re
+import socket
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from urllib.parse import urlparse
+
+import requests
+
+import site_probe
+import task_runtime
+
+PROBE_TIMEOUT = 5           # seconds per candidate (DNS + GET)
+PROBE_MAX_BYTES = 48_000    # <head> is almost always inside this
+MAX_CANDIDATES = 10
+
+# getaddrinfo has no timeout of its own, so lookups run here and are waited on
+_dns_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="dns")
+
+_UA = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+       "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+LEGAL_SUFFIXES = ("inc", "llc", "ltd", "corp", "corporation", "co", "gmbh", "sa", "ag", "plc", "bv")
+# trailing descriptor words a name is often registered without
+DESCRIPTOR_SUFFIXES = ("therapeutics", "therapeutic", "therapies", "bio", "biosciences",
+                       "bioscience", "biotherapeutics", "pharma", "pharmaceuticals", "medicines",
+                       "sciences", "tx")
+
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+_DESC_RE = re.compile(
+    r"<meta[^>]+(?:name|property)=[\"'](?:og:)?description[\"'][^>]*content=[\"']([^\"']*)", re.I)
+
+
+def name_tokens(company_name: str) -> list:
+    """Lower-case alphanumeric words with legal suffixes removed."""
+    words = re.findall(r"[a-z0-9]+", (company_name or "").lower().replace("&", " and "))
+    while words and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return words
+
+
+def candidate_domains(company_name: str) -> list:
+    """Likely domains for ``company_name``, most likely first, no duplicates."""
+    words = name_tokens(company_name)
+    if not words:
+        return []
+    full = "".join(words)
+    core = words[:]
+    while len(core) > 1 and core[-1] in DESCRIPTOR_SUFFIXES:
+        core.pop()
+    base = "".join(core)
+
+    out = [f"{full}.com", f"{base}.com", f"{base}bio.com", f"{base}tx.com",
+           f"{base}therapeutics.com", f"{base}.bio", f"{full}.bio", f"{base}.co",
+           f"{base}pharma.com"]
+    if len(words) > 1:
+        out.insert(1, f"{'-'.join(words)}.com")
+    seen, uniq = set(), []
+    for d in out:
+        if d not in seen and len(d.split(".")[0]) >= 3:
+            seen.add(d)
+            uniq.append(d)
+    return uniq[:MAX_CANDIDATES]
+
+
+def fetch_title(domain: str, timeout: float = PROBE_TIMEOUT, http=None):
+    """
+    {"domain", "url", "title", "description"} for a live site, else None.
+    ``url`` is the root of wherever the homepage finally redirected;
+    ``http`` is any client with requests' ``get`` (default: requests).
+    """
+    return fetch_page(f"https://{domain}/", timeout, http)
+
+
+def fetch_page(url: str, timeout: float = PROBE_TIMEOUT, http=None):
+    """fetch_title for an arbitrary URL (e.g. a link from a portfolio page)."""
+    domain = urlparse(url).hostname or ""
+    if not _resolves(domain, timeout):
+        return None
+    deadline = task_runtime.current()
+    try:
+        with (http or requests).get(url, headers={"User-Agent": _UA},
+                          stream=True, allow_redirects=True, timeout=timeout) as resp:
+            if resp.status_code >= 400:
+                return None
+            abort = deadline.on_cancel(resp.close) if deadline else None
+            try:
+                body = resp.raw.read(PROBE_MAX_BYTES, decode_content=True) or b""
+            finally:
+                if abort:
+                    deadline.discard(abort)
+            final = urlparse(resp.url)
+    except (requests.exceptions.RequestException, OSError, AttributeError, ValueError):
+        return None     # AttributeError / ValueError: read from a response closed on cancel
+    task_runtime.check()
+
+    text = body.decode("utf-8", errors="ignore")
+    low = text.lower()
+    if any(m in low for m in site_probe.PARKED_MARKERS + site_probe.CHALLENGE_MARKERS):
+        return None
+    title = _TITLE_RE.search(text)
+    desc = _DESC_RE.search(text)
+    return {
+        "domain": domain,
+        "url": f"{final.scheme}://{final.netloc}/",
+        "title": html.unescape(re.sub(r"\s+", " ", title.group(1))).strip() if title else "",
+        "description": html.unescape(desc.group(1)).strip() if desc else "",
+    }
+
+
+def _resolves(domain: str, timeout: float) -> bool:
+    """DNS lookup that gives up after ``timeout`` seconds."""
+    if not domain:
+        return False
+    fut = _dns_pool.submit(socket.getaddrinfo, domain, 443, type=socket.SOCK_STREAM)
+    try:
+        fut.result(timeout=timeout)
+        return True
+    except (FutureTimeout, socket.gaierror, UnicodeError, OSError):
+        return False
+
+
+def title_matches(company_name: str, title: str) -> bool:
+    """Every name word (legal suffix aside) appears in the title, in order and adjacent."""
+    words = name_tokens(company_name)
+    if not words or not title:
+        return False
+    squashed = re.sub(r"[^a-z0-9]", "", title.lower())
+    if "".join(words) in squashed:
+        return True
+    title_words = re.findall(r"[a-z0-9]+", title.lower())
+    n = len(words)
+    return any(title_words[i:i + n] == words for i in range(len(title_words) - n + 1))
+
+
+def probe_candidates(company_name: str, max_workers: int = 8, http=None) -> list:
+    """
+    Live candidates (see fetch_title) in candidate order. Probes still
+    running when the budget (DNS + GET, capped by the current deadline)
+    runs out are abandoned and their reads cancelled.
+    """
+    domains = candidate_domains(company_name)
+    if not domains:
+        return []
+    timeout = task_runtime.remaining_timeout(PROBE_TIMEOUT)
+    budget = task_runtime.remaining_timeout(2 * PROBE_TIMEOUT)
+    with task_runtime.scope(budget, label="domain probe") as dl:
+
+        def probe(domain):
+            with task_runtime.Deadline(budget, parent=dl):
+                return fetch_title(domain, timeout, http)
+
+        ex = ThreadPoolExecutor(max_workers=min(max_workers, len(domains)),
+                                thread_name_prefix="domain-guess")
+        try:
+            futures = [ex.submit(probe, d) for d in domains]
+            wait(futures, timeout=budget)
+            found = [f.result() if f.done() and not f.exception() else None for f in futures]
+        finally:
+            dl.cancel("domain probe budget spent")
+            ex.shutdown(wait=False, cancel_futures=True)
+    task_runtime.check()
+    return [f for f in found if f]
@@ -0,0 +1,297 @@
+# field_normalizer.py  ────────────────────────────────────────────────────
+"""
+Rule-driven pre-pass for the LLM de-duplication helpers.
+
+Collapses obvious duplicates (case, spacing, hyphens, plurals, legal
+suffixes, known synonyms) deterministically so that only the residual,
+genuinely ambiguous values are sent to GPT – and no call is made at all
+when nothing ambiguous remains.
+"""
+
+import re
+import threading
+from difflib import SequenceMatcher
+
+# ─────────────────────────────
+#  Extensible rule tables
+# ─────────────────────────────
+# Exact synonym pairs – keys are compared after whitespace/hyphen folding.
+SYNONYMS = {
+    "series a": "series a", "series-a": "series a", "series - a": "series a",
+    "series b": "series b", "series-b": "series b", "series - b": "series b",
+    "series c": "series c", "series-c": "series c",
+    "pre seed": "pre-seed", "preseed": "pre-seed",
+    "rare diseases": "rare disease",
+    "small molecules": "small molecule",
+    "mab": "monoclonal antibody", "mabs": "monoclonal antibody",
+    "monoclonal antibodies": "monoclonal antibody",
+    "adc": "antibody-drug conjugate", "adcs": "antibody-drug conjugate",
+    "antibody drug conjugate": "antibody-drug conjugate",
+    "aso": "antisense oligonucleotide", "asos": "antisense oligonucleotide",
+    "car t": "car-t", "car-t cell therapy": "car-t", "car t cell therapy": "car-t",
+}
+
+# Country spellings that are the *same* place (used for geography values).
+COUNTRY_ALIASES = {
+    "us": "US", "u.s.": "US", "u.s": "US", "usa": "US", "u.s.a.": "US",
+    "united states": "US", "united states of america": "US",
+    "uk": "UK", "u.k.": "UK", "united kingdom": "UK", "great britain": "UK",
+}
+
+# Trailing legal-entity suffixes – never meaningful for identity.
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd",
+    "limited", "llc", "plc", "gmbh", "ag", "sa", "sas", "bv", "nv", "ab",
+    "pty", "srl", "kk",
+}
+
+# Business descriptors – merged deterministically only in aggressive
+# company mode ("Novadaq" + "Novadaq Technologies").
+DESCRIPTOR_SUFFIXES = {
+    "bio", "biosciences", "biotech", "biotechnology", "therapeutics",
+    "pharma", "pharmaceuticals", "pharmaceutical", "labs", "laboratories",
+    "medical", "sciences", "technologies", "technology", "discovery",
+    "health", "healthcare", "tx",
+}
+
+# Words whose trailing "s" is not a plural.
+PLURAL_EXCEPTIONS = {
+    "aids", "sars", "diabetes", "herpes", "rabies", "measles", "mumps",
+    "sepsis", "psoriasis", "fibrosis", "sclerosis", "arthritis", "analysis",
+    "genomics", "therapeutics", "diagnostics", "sciences", "biosciences",
+    "pharmaceuticals", "labs", "us", "virus", "physics", "lupus", "series",
+}
+
+# Fields whose values carry comparison/range operators ("< $10M", "$10M+",
+# "$1M-$5M") – the operators are part of the meaning and survive folding.
+OPERATOR_FIELDS = {"investment_amount", "investment_stage"}
+
+# Already-canonical city-level geography value: "Boston, MA, US",
+# "Toronto, ON, Canada". Two-part and bare values ("Cambridge, Massachusetts",
+# "Boston, MA", "Cambridge", "USA") can't be told apart from non-canonical
+# ones by shape alone, so they still go to the LLM.
+_GEO_CANONICAL_RE = re.compile(
+    r"^[A-Z][A-Za-z .'-]+, [A-Z]{2,3}, (US|UK|[A-Z][a-z][A-Za-z .'-]*)$"
+)
+
+_PUNCT_RE = re.compile(r"[^a-z0-9\s]")
+_WS_RE = re.compile(r"[\s_\-–—/]+")
+_OP_PUNCT_RE = re.compile(r"[^a-z0-9\s<>+\-]")
+_OP_WS_RE = re.compile(r"[\s_/]+|(?<=[a-z])-(?=[a-z])")   # "late-stage" still folds, "1-5m" doesn't
+
+
+# ─────────────────────────────
+#  Canonical keys
+# ─────────────────────────────
+def _fold(val: str) -> str:
+    return _WS_RE.sub(" ", str(val).strip().lower()).strip()
+
+
+def _singular(word: str) -> str:
+    if len(word) <= 4 or word in PLURAL_EXCEPTIONS:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ses", "xes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _is_canonical_geo(val) -> bool:
+    m = _GEO_CANONICAL_RE.match(str(val))
+    return bool(m) and COUNTRY_ALIASES.get(m.group(1).lower(), m.group(1)) == m.group(1)
+
+
+def canonical_key(val: str, field: str = "") -> str:
+    """Grouping key: two values with the same key are the same item."""
+    field = field.lower()
+    if field == "geography":
+        parts = [p.strip() for p in str(val).split(",") if p.strip()]
+        parts = [COUNTRY_ALIASES.get(p.lower(), p).lower() for p in parts]
+        return ", ".join(parts)
+    if field in OPERATOR_FIELDS:
+        folded = str(val).strip().lower().replace("–", "-").replace("—", "-")
+        folded = _OP_WS_RE.sub(" ", folded).strip()
+        folded = SYNONYMS.get(folded, folded)
+        words = _OP_PUNCT_RE.sub(" ", folded).split()
+        key = " ".join(_singular(w) for w in words)
+        return re.sub(r"([<>]) | ?- ?", lambda m: m.group(1) or "-", key)   # "< 10m" == "<10m", "1m - 5m" == "1m-5m"
+    folded = _fold(val)
+    if folded in SYNONYMS:
+        folded = SYNONYMS[folded]
+    words = _PUNCT_RE.sub(" ", folded).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(_singular(w) for w in words)
+
+
+def company_key(name: str, aggressive: bool = False) -> str:
+    """Key for company names; aggressive mode also drops descriptors."""
+    words = canonical_key(name).split()
+    if aggressive:
+        while len(words) > 1 and words[-1] in DESCRIPTOR_SUFFIXES:
+            words.pop()
+    return "".join(words)
+
+
+# ─────────────────────────────
+#  Collapse + residual detection
+# ─────────────────────────────
+def collapse_values(field: str, values) -> list:
+    """Drop deterministic duplicates, keeping the first spelling seen."""
+    out, seen = [], set()
+    for v in values or []:
+        if not v or not str(v).strip():
+            continue
+        key = canonical_key(v, field)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(v.strip() if isinstance(v, str) else v)
+    return out
+
+
+def needs_llm(field: str, values: list, per_startup: bool = False) -> bool:
+    """True when the collapsed list still holds something only GPT can settle."""
+    field = field.lower()
+    if field in ("requires_startup_revenue_generation",
+                 "therapeutic_investor", "equity_investor"):
+        return False
+    if field == "investment_stage":
+        # Rules only allow case/spacing/hyphen/plural merges – all handled here.
+        return False
+    if field == "geography":
+        if per_startup:
+            # Single values still need the "City, ST, Country" canonical form.
+            return len(values) > 1 or not all(_is_canonical_geo(v) for v in values)
+        # VC-level: only country-name equivalents may merge.
+        bare = [v for v in values if "," not in str(v) and not re.search(r"\d", str(v))]
+        return len(bare) > 1
+    return len(values) > 1
+
+
+# Two collapsed names this close are left for the LLM to judge
+SIMILAR_NAME_RATIO = 0.8
+
+
+def _similarity_core(name: str) -> str:
+    """Descriptor-stripped key without a leading article: 'The Foo Bio' → 'foo'."""
+    words = canonical_key(name).split()
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+    while len(words) > 1 and words[-1] in DESCRIPTOR_SUFFIXES:
+        words.pop()
+    return "".join(words)
+
+
+def names_similar(a: str, b: str) -> bool:
+    """
+    Could ``a`` and ``b`` be the same company? Same stripped core, one core
+    inside the other ('Foo Bio' / 'FooBio'), or an edit-distance ratio of
+    at least SIMILAR_NAME_RATIO (typos, OCR slips).
+    """
+    ca, cb = _similarity_core(a), _similarity_core(b)
+    if not ca or not cb:
+        return False
+    if ca == cb:
+        return True
+    short, long_ = sorted((ca, cb), key=len)
+    if len(short) >= 3 and long_.startswith(short):
+        return True
+    matcher = SequenceMatcher(None, ca, cb)
+    return (matcher.real_quick_ratio() >= SIMILAR_NAME_RATIO
+            and matcher.quick_ratio() >= SIMILAR_NAME_RATIO
+            and matcher.ratio() >= SIMILAR_NAME_RATIO)
+
+
+def collapse_companies(names, aggressive: bool = False):
+    """
+    Collapse company-name variants and split the remainder into
+    (settled, ambiguous) lists, both in input order. ``ambiguous`` holds
+    names similar to another name (see names_similar) – the only ones
+    worth an LLM look.
+    """
+    best = {}
+    order = []
+    for n in names or []:
+        if not n or not str(n).strip():
+            continue
+        n = str(n).strip()
+        key = company_key(n, aggressive) or n.lower()
+        if key not in best:
+            best[key] = n
+            order.append(key)
+        elif len(n) > len(best[key]):       # keep the most complete version
+            best[key] = n
+
+    kept = [best[key] for key in order]
+    flagged = set()
+    for i, a in enumerate(kept):
+        for b in kept[i + 1:]:
+            if names_similar(a, b):
+                flagged.update((a, b))
+
+    settled = [n for n in kept if n not in flagged]
+    ambiguous = [n for n in kept if n in flagged]
+    return settled, ambiguous
+
+
+def in_input_order(names, kept) -> list:
+    """
+    ``kept`` (e.g. settled + LLM output) re-sorted by where each name, or
+    its closest rule-based variant, first appears in ``names``. Names
+    found nowhere keep their relative order at the end.
+    """
+    first = {}
+    for i, n in enumerate(names or []):
+        for key in (canonical_key(str(n)), company_key(str(n), aggressive=True)):
+            first.setdefault(key, i)
+    end = len(first) + len(names or [])
+
+    def position(n):
+        for key in (canonical_key(str(n)), company_key(str(n), aggressive=True)):
+            if key in first:
+                return first[key]
+        return end
+
+    return sorted(kept, key=position)
+
+
+# ─────────────────────────────
+#  Skip-rate accounting
+# ─────────────────────────────
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def record(caller: str, skipped: bool) -> None:
+    with _stats_lock:
+        s = _stats.setdefault(caller, {"requests": 0, "llm_skipped": 0})
+        s["requests"] += 1
+        if skipped:
+            s["llm_skipped"] += 1
+
+
+def skip_stats() -> dict:
+    """Per-caller counts plus overall skip rate (percent)."""
+    with _stats_lock:
+        out = {k: dict(v) for k, v in _stats.items()}
+    total = sum(v["requests"] for v in out.values())
+    skipped = sum(v["llm_skipped"] for v in out.values())
+    for v in out.values():
+        v["skip_rate"] = round(100 * v["llm_skipped"] / v["requests"], 1) if v["requests"] else 0.0
+    out["overall"] = {
+        "requests": total,
+        "llm_skipped": skipped,
+        "skip_rate": round(100 * skipped / total, 1) if total else 0.0,
+    }
+    return out
+
+
+def print_skip_report() -> None:
+    stats = skip_stats()
+    print("📉 LLM dedup skip rate:")
+    for caller, s in stats.items():
+        print(f"   {caller:28} {s['llm_skipped']}/{s['requests']} skipped ({s['skip_rate']:.1f}%)")
@@ -0,0 +1,59 @@
+# html_parse.py  ─────────────────────────────────────────────────────────
+"""
+HTML → visible text + anchors, in one BeautifulSoup pass.
+
+Enrichment workers are threads, so parsing inside them serialises on the
+GIL. With HTML_PARSE_MODE=process the parse runs in a shared
+ProcessPoolExecutor instead: workers hand over raw HTML bytes and get back
+plain text and (href, anchor text) pairs. The default ("thread") parses
+inline, exactly as before.
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+HTML_PARSE_MODE = os.getenv("HTML_PARSE_MODE", "thread")          # "thread" | "process"
+HTML_PARSE_WORKERS = int(os.getenv("HTML_PARSE_WORKERS", str(os.cpu_count() or 2)))
+PARSE_TIMEOUT = 30
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def parse_html(html) -> dict:
+    """{"text": visible text, "anchors": [(href, anchor text)]} – picklable, no globals."""
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    soup = BeautifulSoup(html, "html.parser")
+    anchors = [
+        (a["href"], " ".join(filter(None, [a.get_text(" ", strip=True),
+                                           a.get("title"), a.get("aria-label")])))
+        for a in soup.find_all("a", href=True)
+    ]
+    return {"text": soup.get_text(" ", strip=True), "anchors": anchors}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=HTML_PARSE_WORKERS)
+            atexit.register(_pool.shutdown, wait=False)
+        return _pool
+
+
+def parse(html, mode: str = None) -> dict:
+    """Parse in-thread or in the shared process pool (``mode`` overrides HTML_PARSE_MODE)."""
+    if (mode or HTML_PARSE_MODE) != "process":
+        return parse_html(html)
+    payload = html.encode("utf-8") if isinstance(html, str) else html
+    return _get_pool().submit(parse_html, payload).result(timeout=PARSE_TIMEOUT)
+
+
+def visible_text(html, limit: int = 0) -> str:
+    txt = parse(html)["text"]
+    return txt if not limit else txt[:limit]
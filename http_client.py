@@ -0,0 +1,136 @@
+# http_client.py  ────────────────────────────────────────────────────────
+"""
+Shared keep-alive HTTP client for website discovery.
+
+One requests.Session with a sized urllib3 pool (HTTP_POOL_HOSTS hosts,
+HTTP_POOL_PER_HOST connections each, blocking when a host's pool is full)
+is shared by every discovery thread. Connection setup is timed at the
+urllib3 layer, so the stats show how many requests reused a warm
+connection and roughly how much handshake time that saved.
+
+With HTTP_CLIENT_HTTP2=1 and httpx[http2] installed, POSTs (Serper,
+OpenAI) go over an HTTP/2 httpx client instead; GETs always use the
+requests session because callers stream the body.
+"""
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "32"))
+POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "16"))
+USE_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "0") == "1"
+
+_stats_lock = threading.Lock()
+
+
+def _record_connect(stats, seconds):
+    with _stats_lock:
+        stats["connections_opened"] += 1
+        stats["connect_seconds"] += seconds
+
+
+def _timed(conn_cls, stats):
+    class Timed(conn_cls):
+        def connect(self):
+            t0 = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                _record_connect(stats, time.perf_counter() - t0)
+    return Timed
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools build connections that time their own setup."""
+
+    def __init__(self, stats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self._stats
+        http_pool = type("TimedHTTPConnectionPool", (HTTPConnectionPool,),
+                         {"ConnectionCls": _timed(HTTPConnection, stats)})
+        https_pool = type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,),
+                          {"ConnectionCls": _timed(HTTPSConnection, stats)})
+        self.poolmanager.pool_classes_by_scheme = {"http": http_pool, "https": https_pool}
+
+
+class HttpClient:
+    """``get`` / ``post`` with requests' signature over a shared pool."""
+
+    def __init__(self, pool_hosts: int = POOL_HOSTS, per_host: int = POOL_PER_HOST,
+                 http2: bool = USE_HTTP2):
+        self.stats = {"requests": 0, "connections_opened": 0, "connect_seconds": 0.0,
+                      "http2_requests": 0}
+        self.session = requests.Session()
+        adapter = _TimedAdapter(self.stats, pool_connections=pool_hosts,
+                                pool_maxsize=per_host, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._h2 = None
+        if http2:
+            try:
+                import httpx
+                self._h2 = httpx.Client(http2=True, limits=httpx.Limits(
+                    max_connections=pool_hosts * per_host, max_keepalive_connections=per_host))
+            except ImportError:
+                print("⚠️ HTTP_CLIENT_HTTP2=1 but httpx[http2] is not installed – using HTTP/1.1")
+
+    def _count(self, key):
+        with _stats_lock:
+            self.stats[key] += 1
+
+    def get(self, url, **kwargs):
+        self._count("requests")
+        return self.session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        if self._h2 is not None:
+            self._count("http2_requests")
+            return self._h2.post(url, **kwargs)
+        self._count("requests")
+        return self.session.post(url, **kwargs)
+
+    def stats_since(self, snapshot: dict, companies: int = 0) -> dict:
+        """Reuse rate and estimated handshake time saved since ``snapshot``."""
+        with _stats_lock:
+            d = {k: v - snapshot.get(k, 0) for k, v in self.stats.items()}
+        reqs, opened = d["requests"], d["connections_opened"]
+        reused = max(0, reqs - opened)
+        avg_connect = d["connect_seconds"] / opened if opened else 0.0
+        saved = reused * avg_connect
+        d.update({
+            "connections_reused": reused,
+            "reuse_rate": round(100 * reused / reqs, 1) if reqs else 0.0,
+            "avg_connect_seconds": round(avg_connect, 4),
+            "connect_seconds": round(d["connect_seconds"], 3),
+            "est_seconds_saved": round(saved, 2),
+            "est_seconds_saved_per_company": round(saved / companies, 3) if companies else 0.0,
+        })
+        return d
+
+    def close(self):
+        self.session.close()
+        if self._h2 is not None:
+            self._h2.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Process-wide client shared by all discovery threads."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -9,6 +9,7 @@ import time
 import base64
 import json
 import re
+import threading
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
 from dotenv import load_dotenv
@@ -16,6 +17,7 @@ from openai import OpenAI
 import requests
 from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import field_normalizer
 # ── Console-encoding hardening (Windows CP-1252 crashes on emoji) ──
 import sys
 if (
@@ -90,7 +92,21 @@ def deduplicate_companies_with_llm(companies, use_aggressive=False):
     """
     if not companies or len(companies) < 2:
         return companies
-    
+
+    # Deterministic pre-pass: suffix/case variants collapse locally and only
+    # names similar to another name go to the LLM; results keep input order
+    original = companies
+    settled, ambiguous = field_normalizer.collapse_companies(companies, aggressive=use_aggressive)
+    if len(settled) + len(ambiguous) < len(companies):
+        print(f"   [PRE-DEDUP] {len(companies)} → {len(settled) + len(ambiguous)} companies (rule-based)")
+    if not ambiguous:
+        field_normalizer.record("deduplicate_companies", skipped=True)
+        print(f"   [DEDUP] Nothing ambiguous – LLM skipped")
+        return settled
+    field_normalizer.record("deduplicate_companies", skipped=False)
+    print(f"   [DEDUP] Sending {len(ambiguous)} ambiguous names to LLM ({len(settled)} settled)")
+    companies = ambiguous
+
     # Create prompt for deduplication
     companies_list = "\n".join([f"{i+1}. {company}" for i, company in enumerate(companies)])
     
@@ -185,22 +201,22 @@ Return only a JSON array of the final deduplicated company names:
                         if removed_names:
                             print(f"   [REMOVED] {removed_names[:5]}{'...' if len(removed_names) > 5 else ''}")
                     
-                    return deduplicated
+                    return field_normalizer.in_input_order(original, settled + deduplicated)
                 else:
                     print(f"   [DEDUP ERROR] Response not a list: {response_text[:100]}")
-                    return companies
+                    return field_normalizer.in_input_order(original, settled + companies)
             except json.JSONDecodeError as e:
                 print(f"   [DEDUP ERROR] JSON parse error: {e}")
                 print(f"   [RESPONSE] {response_text[:200]}...")
-                return companies
+                return field_normalizer.in_input_order(original, settled + companies)
         else:
             print(f"   [DEDUP ERROR] No JSON array found in response")
             print(f"   [RESPONSE] {response_text[:200]}...")
-            return companies
+            return field_normalizer.in_input_order(original, settled + companies)
             
     except Exception as e:
         print(f"   [DEDUP ERROR] LLM call failed: {e}")
-        return companies
+        return field_normalizer.in_input_order(original, settled + companies)
 
 
 
@@ -533,6 +549,9 @@ def take_selenium_screenshots(driver, url):
      
        # Try to expand portfolio sections
        expand_portfolio_sections(driver)
+
+       # Company cards usually link straight to the company's site
+       record_page_links(url, driver.page_source)
      
        # Get page dimensions
        page_height = driver.execute_script("return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight)")
@@ -595,6 +614,7 @@ def take_requests_screenshots(url):
      
        response = requests.get(url, headers=HEADERS, timeout=30)
        response.raise_for_status()
+       record_page_links(url, response.text)
      
        soup = BeautifulSoup(response.text, 'html.parser')
      
@@ -766,6 +786,117 @@ def extract_from_json_ld(soup):
 
 
 
+# ── outbound company links ────────────────────────────────────────────
+# (name, href) pairs read from each portfolio page's DOM, keyed by page URL
+_page_links = {}
+_page_links_lock = threading.Lock()
+
+LINK_SKIP_DOMAINS = (
+    "linkedin.com", "twitter.com", "x.com", "facebook.com", "instagram.com",
+    "youtube.com", "medium.com", "crunchbase.com", "google.com", "apple.com",
+    "github.com", "vimeo.com", "bit.ly",
+)
+GENERIC_LINK_TEXT = {"website", "visit website", "visit site", "view website", "learn more",
+                     "read more", "more", "site", "link", "logo", "visit", "open", "→", "↗"}
+
+
+def _clean_label(text):
+    text = re.sub(r"\s+", " ", text or "").strip()
+    text = re.sub(r"\s*(logo|website)$", "", text, flags=re.I).strip()
+    return text if text and text.lower() not in GENERIC_LINK_TEXT else ""
+
+
+def _anchor_label(a):
+    """Best company label for a link: logo alt, title/aria-label, link text, card heading."""
+    labels = [img.get("alt", "") for img in a.find_all("img")]
+    labels += [a.get("title", ""), a.get("aria-label", ""), a.get_text(" ", strip=True)]
+    parent = a.parent
+    for _ in range(3):                    # the card the link sits in
+        if parent is None:
+            break
+        headings = parent.find_all(["h1", "h2", "h3", "h4", "h5", "h6"], limit=2)
+        if len(headings) == 1:
+            labels.append(headings[0].get_text(" ", strip=True))
+        if headings:
+            break                         # several headings: a list, not one card
+        parent = parent.parent
+    for label in labels:
+        label = _clean_label(label)
+        if label and is_potential_company_name(label):
+            return label
+    return ""
+
+
+def extract_outbound_links(html, page_url):
+    """[{"name", "href"}] for links that leave the VC's own domain."""
+    vc_domain = get_domain(page_url).lower()
+    soup = BeautifulSoup(html, "html.parser")
+    pairs, seen = [], set()
+    for a in soup.find_all("a", href=True):
+        href = urljoin(page_url, a["href"].strip())
+        parsed = urlparse(href)
+        host = parsed.netloc.lower()
+        host = host[4:] if host.startswith("www.") else host
+        if parsed.scheme not in ("http", "https") or not host:
+            continue
+        if host == vc_domain or host.endswith("." + vc_domain):
+            continue
+        if any(host == d or host.endswith("." + d) for d in LINK_SKIP_DOMAINS):
+            continue
+        name = _anchor_label(a)
+        if not name or (name.lower(), host) in seen:
+            continue
+        seen.add((name.lower(), host))
+        pairs.append({"name": name, "href": href})
+    return pairs
+
+
+def record_page_links(page_url, html):
+    try:
+        pairs = extract_outbound_links(html, page_url)
+    except Exception as e:
+        print(f"      [LINKS ERROR] {e}")
+        return
+    with _page_links_lock:
+        _page_links[page_url] = pairs
+    print(f"      [LINKS] {len(pairs)} outbound company links captured")
+
+
+def _link_key(name):
+    return field_normalizer.company_key(name or "", aggressive=True)
+
+
+def attribute_company_links(companies, page_urls):
+    """
+    {company: href} for companies a captured portfolio link clearly points
+    at – same descriptor-stripped name key, or a domain that is the name
+    (plus bio/tx/therapeutics/pharma). Names linked to several different
+    domains are left out.
+    """
+    with _page_links_lock:
+        pairs = [p for u in page_urls for p in _page_links.get(u, [])]
+    by_key, by_label = {}, {}
+    for p in pairs:
+        host = get_domain(p["href"]).lower()
+        by_key.setdefault(_link_key(p["name"]), {}).setdefault(host, p["href"])
+        label = re.sub(r"[^a-z0-9]", "", host.split(".")[0])
+        by_label.setdefault(label, {}).setdefault(host, p["href"])
+    links = {}
+    for company in companies:
+        key = _link_key(company)
+        if not key:
+            continue
+        hits = by_key.get(key, {})
+        if not hits:
+            for suffix in ("", "bio", "tx", "therapeutics", "pharma", "inc"):
+                hits = by_label.get(key + suffix, {})
+                if hits:
+                    break
+        if len(hits) == 1:
+            links[company] = next(iter(hits.values()))
+    return links
+
+
 def dismiss_modals(driver):
    """More thorough modal dismissal"""
    try:
@@ -1146,6 +1277,11 @@ if __name__ == "__main__":
         if len(deduplicated_companies) < len(all_companies):
             print(f"[DEDUP] Applied deduplication: {len(all_companies)} → {len(deduplicated_companies)} companies")
             all_companies = deduplicated_companies
+        field_normalizer.print_skip_report()
+
+
+    company_links = attribute_company_links(all_companies, urls_to_scrape)
+    print(f"[LINKS] {len(company_links)}/{len(all_companies)} companies have a portfolio-page link")
 
 
     # ── write artefact ─────────────────────────────────────────────
@@ -1155,6 +1291,7 @@ if __name__ == "__main__":
         "vc_domain"   : get_domain(vc_url),
         "extraction_timestamp": datetime.now().isoformat(),
         "companies"   : sorted(all_companies),
+        "company_links": company_links,
     }
 
 
@@ -1209,13 +1346,17 @@ def run_portfolio_discovery(vc_url, vc_name_fs, output_dir=None):
         if len(deduplicated_companies) < len(all_companies):
             print(f"[DEDUP] Applied deduplication: {len(all_companies)} → {len(deduplicated_companies)} companies")
             all_companies = deduplicated_companies
+        field_normalizer.print_skip_report()
 
+    company_links = attribute_company_links(all_companies, urls_to_scrape)
+    print(f"[LINKS] {len(company_links)}/{len(all_companies)} companies have a portfolio-page link")
     artefact = {
         "vc_name": vc_name,
         "vc_url": vc_url,
         "vc_domain": get_domain(vc_url),
         "extraction_timestamp": datetime.now().isoformat(),
         "companies": sorted(all_companies),
+        "company_links": company_links,
     }
     if not output_dir:
         output_dir = os.path.join("output", "runs", vc_name_fs)
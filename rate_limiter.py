@@ -0,0 +1,183 @@
+# rate_limiter.py  ───────────────────────────────────────────────────────
+"""
+Token bucket shared by every thread and process that uses the same key.
+
+State lives in one SQLite row per bucket and is updated inside a
+``BEGIN IMMEDIATE`` transaction, so concurrent pipeline stages and ad-hoc
+scripts draw from the same budget. Server feedback tightens it for
+everyone: a 429 (honouring Retry-After, else exponential backoff) or a
+quota header showing zero remaining blocks the bucket until the given
+time, and a success clears the backoff.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import task_runtime
+
+LIMITER_PATH = os.getenv("RATE_LIMITER_PATH", os.path.join("output", "rate_limits.sqlite"))
+DEFAULT_BACKOFF = 3.0        # first 429 without Retry-After; doubles per consecutive 429
+MAX_BACKOFF = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name          TEXT PRIMARY KEY,
+    tokens        REAL,
+    updated_at    REAL,
+    blocked_until REAL DEFAULT 0,
+    strikes       INTEGER DEFAULT 0
+);
+"""
+
+REMAINING_HEADERS = ("x-ratelimit-remaining", "ratelimit-remaining", "x-rate-limit-remaining")
+RESET_HEADERS = ("x-ratelimit-reset", "ratelimit-reset", "x-rate-limit-reset")
+
+
+def parse_retry_after(value, now: float = None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    now = time.time() if now is None else now
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _reset_at(value, now: float):
+    """Absolute reset time from a reset header: epoch seconds or a delta."""
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return v if v > 1e9 else now + v
+
+
+class TokenBucket:
+    def __init__(self, name: str, rate: float, capacity: float = None, path: str = LIMITER_PATH):
+        self.name = name
+        self.rate = max(rate, 0.001)                 # tokens per second
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0,
+                      "retry_after_honoured": 0, "quota_blocks": 0}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                         (name, self.capacity, time.time()))
+
+    @contextmanager
+    def _connect(self):
+        # autocommit mode so BEGIN IMMEDIATE takes the write lock up front
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _txn(self):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at, blocked_until, strikes FROM buckets "
+                                   "WHERE name = ?", (self.name,)).fetchone()
+                yield conn, row
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def stats_since(self, snapshot: dict) -> dict:
+        with self._lock:
+            out = {k: v - snapshot.get(k, 0) for k, v in self.stats.items()}
+        out["waited_seconds"] = round(out["waited_seconds"], 2)
+        return out
+
+    def _try_take(self) -> float:
+        """Take a token (returns 0) or return how long to wait before retrying."""
+        with self._txn() as (conn, row):
+            tokens, updated, blocked_until, _ = row
+            now = time.time()
+            if now < blocked_until:
+                return blocked_until - now
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                conn.execute("UPDATE buckets SET tokens = ?, updated_at = ? WHERE name = ?",
+                             (tokens - 1, now, self.name))
+                return 0.0
+            conn.execute("UPDATE buckets SET tokens = ?, updated_at = ? WHERE name = ?",
+                         (tokens, now, self.name))
+            return (1 - tokens) / self.rate
+
+    def acquire(self):
+        """Block (deadline-aware) until a token is available."""
+        waited = 0.0
+        while True:
+            task_runtime.check()
+            wait = self._try_take()
+            if wait <= 0:
+                break
+            wait = min(wait, 5.0)
+            task_runtime.sleep(wait)
+            waited += wait
+        self._count("acquired")
+        if waited:
+            self._count("waited_seconds", waited)
+
+    def _block(self, until: float, strike: bool):
+        with self._txn() as (conn, row):
+            strikes = (row[3] + 1) if strike else row[3]
+            conn.execute("UPDATE buckets SET tokens = 0, updated_at = ?, blocked_until = MAX(blocked_until, ?), "
+                         "strikes = ? WHERE name = ?", (time.time(), until, strikes, self.name))
+
+    def observe(self, status_code: int, headers) -> float:
+        """
+        Feed a response back. Returns the block (seconds) it imposed on the
+        bucket, 0 if none.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        now = time.time()
+        if status_code == 429:
+            self._count("throttled")
+            delay = parse_retry_after(headers.get("retry-after"), now)
+            if delay is not None:
+                self._count("retry_after_honoured")
+            else:
+                with self._txn() as (_, row):
+                    strikes = row[3]
+                delay = min(MAX_BACKOFF, DEFAULT_BACKOFF * (2 ** strikes))
+            self._block(now + delay, strike=True)
+            return delay
+
+        remaining = next((headers[h] for h in REMAINING_HEADERS if h in headers), None)
+        reset = next((headers[h] for h in RESET_HEADERS if h in headers), None)
+        try:
+            exhausted = remaining is not None and float(remaining) <= 0
+        except ValueError:
+            exhausted = False
+        if exhausted:
+            until = _reset_at(reset, now) or now + DEFAULT_BACKOFF
+            self._count("quota_blocks")
+            self._block(until, strike=False)
+            return until - now
+
+        if status_code < 400:
+            with self._txn() as (conn, row):
+                if row[3]:
+                    conn.execute("UPDATE buckets SET strikes = 0 WHERE name = ?", (self.name,))
+        return 0.0
@@ -0,0 +1,241 @@
+# serper_client.py  ─────────────────────────────────────────────────────
+"""
+Disk-backed cache in front of google.serper.dev.
+
+Keyed by the normalised query plus ``gl`` / ``num`` / ``hl``. Fresh
+entries (younger than SERPER_CACHE_TTL_DAYS) are served without a call;
+entries within the extra SERPER_CACHE_STALE_DAYS window are served
+immediately and refreshed in the background (stale-while-revalidate).
+Only successful (200) responses are cached, so rate-limit and error
+handling in the callers is unchanged.
+
+Every real API call (misses and background refreshes, never cache hits)
+passes the rate gate: at most SERPER_MAX_INFLIGHT concurrent requests per
+process, and a token from the "serper" bucket in rate_limiter, which is
+shared across processes (SERPER_QPS / SERPER_BURST). 429s and quota
+headers are fed back into the bucket.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+import rate_limiter
+import task_runtime
+
+SERPER_URL = "https://google.serper.dev/search"
+CACHE_PATH = os.getenv("SERPER_CACHE_PATH", os.path.join("output", "serper_cache.sqlite"))
+CACHE_TTL_DAYS = float(os.getenv("SERPER_CACHE_TTL_DAYS", "14"))     # 0 disables reads
+CACHE_STALE_DAYS = float(os.getenv("SERPER_CACHE_STALE_DAYS", "30"))  # serve-stale window
+MAX_INFLIGHT = int(os.getenv("SERPER_MAX_INFLIGHT", "8"))
+SERPER_QPS = float(os.getenv("SERPER_QPS", "5"))
+SERPER_BURST = float(os.getenv("SERPER_BURST", "5"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS serper_cache (
+    key         TEXT PRIMARY KEY,
+    query       TEXT,
+    params      TEXT,
+    body        TEXT,
+    fetched_at  REAL
+);
+"""
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_query(q: str) -> str:
+    """Case / whitespace-insensitive query form: '  Foo   Bio ' → 'foo bio'."""
+    return _WS_RE.sub(" ", str(q or "")).strip().lower()
+
+
+def cache_key(payload: dict) -> str:
+    params = {k: payload.get(k) for k in ("gl", "num", "hl")}
+    raw = json.dumps([normalize_query(payload.get("q")), params], sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class RateGate:
+    """Global Serper limiter: bounded in-process concurrency plus the shared token bucket."""
+
+    def __init__(self, max_inflight: int = MAX_INFLIGHT, qps: float = SERPER_QPS,
+                 burst: float = SERPER_BURST):
+        self._slots = threading.BoundedSemaphore(max(1, max_inflight))
+        self._bucket = None
+        self._bucket_args = (qps, burst)
+        self._lock = threading.Lock()
+
+    @property
+    def bucket(self) -> rate_limiter.TokenBucket:
+        with self._lock:
+            if self._bucket is None:
+                qps, burst = self._bucket_args
+                self._bucket = rate_limiter.TokenBucket("serper", rate=qps, capacity=burst)
+            return self._bucket
+
+    @contextmanager
+    def slot(self):
+        """
+        In-flight slot plus a token. The caller's task_runtime deadline is
+        its cancel token: checked while queueing and once more after the
+        token is taken, so a cancelled search never spends a call.
+        """
+        while not self._slots.acquire(timeout=0.25):
+            task_runtime.check()        # a cancelled caller stops queueing
+        try:
+            self.bucket.acquire()
+            task_runtime.check()
+            yield
+        finally:
+            self._slots.release()
+
+    def observe(self, resp):
+        return self.bucket.observe(resp.status_code, getattr(resp, "headers", None))
+
+
+rate_gate = RateGate()
+
+
+class CachedResponse:
+    """The slice of requests.Response the callers use."""
+
+    def __init__(self, body: str, from_cache: bool, stale: bool = False):
+        self.status_code = 200
+        self.text = body
+        self.headers = {}
+        self.from_cache = from_cache
+        self.stale = stale
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        return None
+
+
+class SerperCache:
+    def __init__(self, path: str = CACHE_PATH, ttl_days: float = CACHE_TTL_DAYS,
+                 stale_days: float = CACHE_STALE_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.stale = stale_days * 86400
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0,
+                      "refreshes": 0, "stores": 0, "api_calls": 0, "abandoned_in_flight": 0}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # one short-lived connection per call: safe across threads/processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def stats_since(self, snapshot: dict) -> dict:
+        with self._lock:
+            out = {k: v - snapshot.get(k, 0) for k, v in self.stats.items()}
+        served = out["hits"] + out["stale_hits"]
+        total = served + out["misses"]
+        out["hit_rate"] = round(100 * served / total, 1) if total else 0.0
+        return out
+
+    def _get(self, key: str):
+        with self._connect() as conn:
+            return conn.execute("SELECT body, fetched_at FROM serper_cache WHERE key = ?",
+                                (key,)).fetchone()
+
+    def _put(self, key: str, payload: dict, body: str):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO serper_cache (key, query, params, body, fetched_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET body=excluded.body, fetched_at=excluded.fetched_at",
+                (key, normalize_query(payload.get("q")),
+                 json.dumps({k: payload.get(k) for k in ("gl", "num", "hl")}), body, time.time()))
+        self._count("stores")
+
+    def _fetch(self, key, payload, api_key, timeout, post):
+        with rate_gate.slot():
+            self._count("api_calls")
+            resp = post(SERPER_URL, json=payload,
+                        headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
+                        timeout=timeout)
+        resp.retry_after = rate_gate.observe(resp)      # seconds the bucket is now blocked
+        if resp.status_code == 200:
+            self._put(key, payload, resp.text)      # paid for – keep it even if abandoned
+        deadline = task_runtime.current()
+        if deadline is not None and deadline.cancelled:
+            self._count("abandoned_in_flight")      # cancelled while the POST was out
+            deadline.check()
+        return resp
+
+    def _refresh_async(self, key, payload, api_key, timeout, post):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._fetch(key, payload, api_key, timeout, post)
+                self._count("refreshes")
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="serper-refresh", daemon=True).start()
+
+    def search(self, payload: dict, api_key: str, timeout: float = 12, post=None):
+        """
+        Serper search through the cache. Returns a requests.Response on a
+        miss (whatever its status) or a CachedResponse on a hit.
+        """
+        post = post or requests.post
+        key = cache_key(payload)
+        row = self._get(key) if self.ttl > 0 else None
+        if row:
+            age = time.time() - row[1]
+            if age < self.ttl:
+                self._count("hits")
+                return CachedResponse(row[0], from_cache=True)
+            if age < self.ttl + self.stale:
+                self._count("stale_hits")
+                self._refresh_async(key, payload, api_key, timeout, post)
+                return CachedResponse(row[0], from_cache=True, stale=True)
+        self._count("misses")
+        return self._fetch(key, payload, api_key, timeout, post)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> SerperCache:
+    """Process-wide cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SerperCache()
+        return _cache
+
+
+def search(payload: dict, api_key: str, timeout: float = 12, post=None):
+    return get_cache().search(payload, api_key, timeout=timeout, post=post)
@@ -0,0 +1,156 @@
+# site_probe.py  ─────────────────────────────────────────────────────────
+"""
+Cheap DNS → TCP → HTTP liveness probe run before any browser launch.
+
+Dead domains, parked pages and bot-challenge walls otherwise burn the full
+Selenium page budget in every stage and on every rerun. Failures go into
+the company store's negative cache with a reason-specific expiry, and each
+domain is probed at most once per run (see start_run).
+"""
+
+import socket
+import threading
+from urllib.parse import urlparse
+
+import requests
+
+import company_store
+import task_runtime
+
+PROBE_TIMEOUT = 6          # seconds per TCP / HTTP step
+PROBE_MAX_BYTES = 64_000   # enough body to spot parking / challenge pages
+
+# How long each failure kind stays in the negative cache
+DEAD_TTL = {
+    "dns": 7 * 86400,
+    "parked": 7 * 86400,
+    "http_gone": 3 * 86400,     # 404 / 410 on the homepage
+    "tcp": 86400,
+    "http_error": 86400,        # 5xx
+    "challenge": 86400,
+}
+
+PARKED_MARKERS = (
+    "domain is for sale", "this domain may be for sale", "buy this domain",
+    "domain for sale", "sedoparking", "parkingcrew", "bodis.com", "hugedomains",
+    "dan.com/buy-domain", "afternic", "godaddy.com/domainsearch", "parked free",
+)
+CHALLENGE_MARKERS = (
+    "cf-browser-verification", "challenge-platform", "just a moment...",
+    "attention required! | cloudflare", "ddos-guard", "captcha-delivery",
+)
+
+_UA = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+       "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+_lock = threading.Lock()
+_run_results = {}        # domain -> (ok, reason) – one probe per domain per run
+stats = {"probed": 0, "alive": 0, "negative_cache_skips": 0, "dead": {}}
+
+
+def start_run() -> dict:
+    """
+    Forget the previous run's in-memory results (a long workflow enriches
+    several VCs in one process) and return a stats snapshot for stats_since.
+    """
+    with _lock:
+        _run_results.clear()
+    return snapshot()
+
+
+def probe(url: str):
+    """(ok, reason) for ``url`` – reason is '' when alive."""
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlparse(url)
+    host = parsed.hostname
+    if not host:
+        return False, "dns"
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+
+    try:
+        socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        return False, "dns"
+
+    try:
+        socket.create_connection((host, port),
+                                 timeout=task_runtime.remaining_timeout(PROBE_TIMEOUT)).close()
+    except task_runtime.DeadlineExceeded:
+        raise
+    except OSError:
+        return False, "tcp"
+
+    try:
+        with requests.get(url, headers={"User-Agent": _UA}, stream=True, allow_redirects=True,
+                          timeout=task_runtime.remaining_timeout(PROBE_TIMEOUT)) as resp:
+            body = resp.raw.read(PROBE_MAX_BYTES, decode_content=True) or b""
+            status, headers = resp.status_code, resp.headers
+    except task_runtime.DeadlineExceeded:
+        raise
+    except requests.exceptions.RequestException:
+        return False, "tcp"
+
+    text = body.decode("utf-8", errors="ignore").lower()
+    if headers.get("cf-mitigated") == "challenge" or (
+            status in (403, 429, 503) and any(m in text for m in CHALLENGE_MARKERS)):
+        return False, "challenge"
+    if any(m in text for m in PARKED_MARKERS):
+        return False, "parked"
+    if status in (404, 410):
+        return False, "http_gone"
+    if status >= 500:
+        return False, "http_error"
+    return True, ""
+
+
+def check(url: str):
+    """
+    (ok, reason) using, in order: this run's results, the persistent
+    negative cache, then a live probe (whose failure is cached).
+    """
+    domain = company_store.canonical_domain(url)
+    with _lock:
+        if domain in _run_results:
+            return _run_results[domain]
+
+    store = company_store.get_store()
+    reason = store.get_dead(url)
+    if reason:
+        result = (False, f"{reason} (negative cache)")
+        with _lock:
+            stats["negative_cache_skips"] += 1
+            _run_results[domain] = result
+        return result
+
+    ok, reason = probe(url)
+    if not ok:
+        store.mark_dead(url, reason, DEAD_TTL.get(reason, 86400))
+    with _lock:
+        stats["probed"] += 1
+        if ok:
+            stats["alive"] += 1
+        else:
+            stats["dead"][reason] = stats["dead"].get(reason, 0) + 1
+        _run_results[domain] = (ok, reason)
+    return ok, reason
+
+
+def known_dead(url: str) -> bool:
+    """In-run lookup only (no I/O) – lets later stages skip a dead domain instantly."""
+    with _lock:
+        res = _run_results.get(company_store.canonical_domain(url))
+    return res is not None and not res[0]
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {**stats, "dead": dict(stats["dead"])}
+
+
+def stats_since(snap: dict) -> dict:
+    now = snapshot()
+    out = {k: now[k] - snap.get(k, 0) for k in ("probed", "alive", "negative_cache_skips")}
+    dead = {r: n - snap.get("dead", {}).get(r, 0) for r, n in now["dead"].items()}
+    out["dead"] = {r: n for r, n in dead.items() if n}
+    return out
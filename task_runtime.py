@@ -0,0 +1,230 @@
+# task_runtime.py  ───────────────────────────────────────────────────────
+"""
+Deadline-aware, cancellable units of work.
+
+The old ``timeout_handler`` helpers ran work in a daemon thread and simply
+stopped waiting – the abandoned thread kept its Chrome process and HTTP
+request alive. Here the work runs in the caller's own thread under a
+``Deadline``; when the deadline passes, a single watchdog thread cancels
+it and fires the registered cleanup callbacks (``driver.quit()``, session
+close …) so the blocked call actually fails and the thread returns.
+Network calls read their timeout from the remaining budget instead of a
+fixed constant, so nothing outlives the deadline it was started under.
+
+Deadlines nest: a company budget is a child of the run budget, and
+cancelling the parent cancels every child.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised inside work whose deadline passed or that was cancelled."""
+
+
+class _Watchdog:
+    """One daemon thread that cancels deadlines as they expire."""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def watch(self, deadline):
+        with self._cond:
+            heapq.heappush(self._heap, (deadline.expires_at, next(self._seq), deadline))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="deadline-watchdog",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                expires_at, _, deadline = self._heap[0]
+                wait = expires_at - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+            if not deadline.closed:
+                deadline.cancel(f"{deadline.label or 'task'} exceeded {deadline.seconds:g}s budget")
+
+
+_watchdog = _Watchdog()
+_local = threading.local()
+
+
+class Deadline:
+    """
+    A time budget that can be cancelled early or by expiry.
+
+    Use as a context manager to make it the thread's *current* deadline;
+    ``remaining_timeout()`` / ``check()`` / ``sleep()`` then pick it up
+    without threading it through every call.
+    """
+
+    def __init__(self, seconds: float, parent: "Deadline" = None, label: str = ""):
+        self.seconds = seconds
+        self.label = label
+        self.expires_at = time.monotonic() + seconds
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+        self.parent = parent
+        self.reason = None
+        self.closed = False
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        if parent is not None:
+            parent.on_cancel(self._cancel_from_parent)
+        _watchdog.watch(self)
+
+    # ── state ──────────────────────────────────────────────────────
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self):
+        if self.cancelled or self.remaining() <= 0:
+            raise DeadlineExceeded(self.reason or f"{self.label or 'task'} deadline exceeded")
+
+    def timeout(self, cap: float = None, floor: float = 0.1) -> float:
+        """Per-call timeout: the remaining budget, capped at ``cap``."""
+        self.check()
+        left = self.remaining()
+        return max(floor, min(cap, left) if cap is not None else left)
+
+    def sleep(self, seconds: float):
+        """Sleep that wakes (and raises) as soon as the deadline is cancelled."""
+        self._event.wait(min(seconds, self.remaining()))
+        self.check()
+
+    # ── cancellation ───────────────────────────────────────────────
+    def on_cancel(self, callback):
+        """Register cleanup run once on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self.cancelled:
+                self._callbacks.append(callback)
+                return callback
+        _safe_call(callback)
+        return callback
+
+    def discard(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def cancel(self, reason: str = "cancelled"):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in reversed(callbacks):          # innermost resources first
+            _safe_call(cb)
+
+    def _cancel_from_parent(self):
+        self.cancel(self.parent.reason)
+
+    def close(self):
+        """Finished normally: stop watching and detach from the parent."""
+        self.closed = True
+        if self.parent is not None:
+            self.parent.discard(self._cancel_from_parent)
+        with self._lock:
+            self._callbacks = []
+
+    # ── thread-local scope ─────────────────────────────────────────
+    def __enter__(self):
+        _stack().append(self)
+        return self
+
+    def __exit__(self, *exc):
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        self.close()
+        return False
+
+
+def _safe_call(callback):
+    try:
+        callback()
+    except Exception:
+        pass
+
+
+def _stack() -> list:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def current():
+    """Innermost deadline active on this thread, or None."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def check():
+    d = current()
+    if d is not None:
+        d.check()
+
+
+def remaining_timeout(cap: float) -> float:
+    """Timeout for one blocking call: ``cap`` bounded by the current deadline."""
+    d = current()
+    return cap if d is None else d.timeout(cap)
+
+
+def sleep(seconds: float):
+    d = current()
+    if d is None:
+        time.sleep(seconds)
+    else:
+        d.sleep(seconds)
+
+
+@contextmanager
+def scope(seconds: float, parent: Deadline = None, label: str = ""):
+    """``with scope(30) as dl:`` – child of ``parent`` or the current deadline."""
+    with Deadline(seconds, parent=parent or current(), label=label) as dl:
+        yield dl
+
+
+def run_with_deadline(func, args=(), kwargs=None, timeout_duration=60,
+                      default=None, cleanup=None, label: str = ""):
+    """
+    Run ``func`` in the calling thread under a deadline.
+
+    ``cleanup`` is invoked from the watchdog if the deadline passes, and
+    must make the blocked call fail (quit the driver, close the session).
+    Returns ``(result, None)`` or ``(default, error)`` like the old
+    ``timeout_handler``.
+    """
+    with scope(timeout_duration, label=label or getattr(func, "__name__", "")) as dl:
+        if cleanup is not None:
+            dl.on_cancel(cleanup)
+        try:
+            result = func(*args, **(kwargs or {}))
+        except Exception as e:
+            if dl.cancelled:
+                return default, DeadlineExceeded(dl.reason)
+            return default, e
+        if dl.cancelled:
+            return default, DeadlineExceeded(dl.reason)
+        return result, None
@@ -0,0 +1,245 @@
+# taxonomy_matcher.py  ──────────────────────────────────────────────────
+"""
+Offline matcher over the modality / disease taxonomy already embedded in
+STARTUP_3FIELDS_PROMPT.
+
+The vocabulary is parsed out of the prompt text itself (the numbered
+"**N. CATEGORY:** term, term (sub, sub)" lines plus the synonym triggers),
+so the prompt stays the single source of truth. Terms are compiled into
+one longest-first regex alternation per field; a page scans in
+milliseconds and yields candidate modalities / diseases with positions.
+
+Used for:
+  • passage selection – long pages are trimmed to the windows around hits
+  • LLM skip – no taxonomy term and no therapeutic cue ⇒ not therapeutic
+  • degraded mode – fields straight from the matches when the API is down
+"""
+
+import re
+
+# Cue words from THERAPEUTIC_CRITERIA – therapeutic signal without a taxonomy hit
+THERAPEUTIC_CUES = (
+    "drug", "drugs", "therapeutic", "therapeutics", "therapy", "therapies",
+    "treatment", "treatments", "medicine", "medicines", "clinical candidate",
+    "clinical trial", "clinical-stage", "pipeline", "preclinical", "pre-clinical",
+    "ind-enabling", "phase 1", "phase 2", "phase 3", "phase i", "phase ii",
+    "first-in-human", "investigational",
+)
+
+# Extra synonyms the prompt implies but does not list verbatim
+EXTRA_TERMS = {
+    "drug_modality": {
+        "BIOLOGICS": ["monoclonal antibody", "antibody", "antibodies", "biologic"],
+        "GENETIC MEDICINES": ["gene therapy", "gene editing", "RNAi", "oligonucleotide"],
+        "CELL THERAPIES": ["cell therapy", "CAR-T", "CAR T"],
+        "SMALL MOLECULES": ["small molecule", "small-molecule", "degrader"],
+        "VACCINES": ["vaccine"],
+        "MICROBIOME-BASED": ["microbiome therapeutic", "microbiome therapy"],
+    },
+    "disease_focus": {
+        "CANCER/ONCOLOGY": ["cancer", "oncology", "tumor", "tumour"],
+        "INFECTIOUS DISEASES": ["infectious disease", "infection"],
+    },
+}
+
+# Parenthesised qualifiers that only make sense attached to their head noun:
+# 'prophylactic vaccines (traditional, mRNA)' → 'traditional vaccine', not 'traditional'
+QUALIFIED_HEADS = (
+    ("stem cell therapies", "stem cell therapy"),
+    ("vaccines", "vaccine"),
+    ("anemias", "anemia"),
+)
+
+# Single words the reference lists but that mean nothing on their own
+GENERIC_TERMS = {"activators", "traditional", "conventional", "rare", "base", "prime", "etc"}
+
+_CATEGORY_LINE_RE = re.compile(r"\*\*(\d+)\.\s*([^*:]+):\*\*\s*(.+)")
+_TRIGGERS_RE = re.compile(r"Synonym triggers\*\*.*?phrases such as (.+)", re.I)
+_ACRONYM_RE = re.compile(r"^[A-Za-z0-9\-]*[A-Z][A-Za-z0-9\-]*[A-Z][A-Za-z0-9\-]*$")
+
+
+def _split_top(s: str) -> list:
+    """Split on commas that are not inside parentheses."""
+    out, depth, cur = [], 0, ""
+    for ch in s:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        if ch == "," and depth == 0:
+            out.append(cur)
+            cur = ""
+        else:
+            cur += ch
+    out.append(cur)
+    return [p.strip() for p in out if p.strip()]
+
+
+def _slash_parts(term: str) -> list:
+    """
+    Standalone terms inside a slash group. A shared noun is distributed
+    ('base/prime editors' → 'base editors', 'prime editors'; 'Hepatitis B/C'
+    → 'Hepatitis C') so no bare modifier is left behind.
+    """
+    parts = [p.strip() for p in term.split("/") if p.strip()]
+    if len(parts) < 2:
+        return []
+    last = parts[-1].split()
+    if len(last) > 1 and all(len(p.split()) == 1 and not p.lower().endswith("s") for p in parts[:-1]):
+        tail = " ".join(last[1:])
+        return [f"{p} {tail}" for p in parts[:-1]] + [parts[-1]]
+    first = parts[0].split()
+    if len(first) > 1 and all(len(p) <= 2 for p in parts[1:]):
+        prefix = " ".join(first[:-1])
+        return [parts[0]] + [f"{prefix} {p}" for p in parts[1:]]
+    return [p for p in parts if len(p) > 2]
+
+
+def _qualify(head: str, subs: list) -> list:
+    low = head.lower()
+    if low.endswith(("tumors", "cancers")):
+        # 'Solid tumors (Lung, Breast)' → 'Lung cancer', not bare organ names
+        return [f"{t} cancer" if len(t.split()) == 1 else t for t in subs]
+    for suffix, noun in QUALIFIED_HEADS:
+        if low.endswith(suffix):
+            last = noun.split()[-1]
+            return [t if last in t.lower() else f"{t} {noun}" for t in subs]
+    return subs
+
+
+def _terms_from_item(item: str) -> list:
+    """'Viral infections (HIV/AIDS, Influenza)' → head + inner items + slash parts."""
+    item = re.sub(r"\s+", " ", item.replace("&", "and")).strip(" .")
+    head = re.sub(r"\(.*?\)", "", item).strip()
+    inner = re.findall(r"\((.*?)\)", item)
+    subs = _qualify(head, [t for grp in inner for t in _split_top(grp)])
+    terms = []
+    for t in [head] + subs:
+        t = t.strip(" .\"'")
+        if not t or t.lower().startswith(("e.g", "etc", "any ", "including")):
+            continue
+        for term in [t] + _slash_parts(t):
+            if term.lower() not in GENERIC_TERMS:
+                terms.append(term)
+    return terms
+
+
+def parse_taxonomy(prompt: str) -> dict:
+    """{field: {category: [terms]}} read from the prompt's numbered category lines."""
+    disease_at = prompt.find('"disease_focus"\n')
+    if disease_at < 0:
+        disease_at = prompt.find("DISEASE CATEGORIZATION REFERENCE")
+    tax = {"drug_modality": {}, "disease_focus": {}}
+    for m in _CATEGORY_LINE_RE.finditer(prompt):
+        field = "drug_modality" if m.start() < disease_at else "disease_focus"
+        category = m.group(2).strip()
+        terms = []
+        for item in _split_top(m.group(3)):
+            terms.extend(_terms_from_item(item))
+        tax[field].setdefault(category, []).extend(terms)
+    trig = _TRIGGERS_RE.search(prompt)
+    if trig:
+        phrases = re.findall(r"\"([^\"]+)\"", trig.group(1))
+        tax["drug_modality"].setdefault("SYNONYM TRIGGERS", []).extend(phrases)
+    for field, cats in EXTRA_TERMS.items():
+        for category, terms in cats.items():
+            tax[field].setdefault(category, []).extend(terms)
+    return tax
+
+
+def _compile(terms, flags):
+    if not terms:
+        return None
+    alt = "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+    return re.compile(r"(?<![A-Za-z0-9])(?:" + alt + r")(?:s|es)?(?![A-Za-z0-9])", flags)
+
+
+class TaxonomyMatcher:
+    def __init__(self, taxonomy: dict):
+        self.taxonomy = taxonomy
+        self._lookup = {}          # (field, lowercase term) → (category, term)
+        self._patterns = []        # (field, compiled regex)
+        for field, cats in taxonomy.items():
+            sensitive, insensitive = [], []
+            for category, terms in cats.items():
+                for term in terms:
+                    key = (field, term.lower())
+                    self._lookup.setdefault(key, (category, term))
+                    # short all-caps acronyms (ALS, SMA, ASD…) only match as written
+                    (sensitive if len(term) <= 6 and _ACRONYM_RE.match(term) else insensitive).append(term)
+            for terms, flags in ((sensitive, 0), (insensitive, re.I)):
+                pat = _compile(terms, flags)
+                if pat is not None:
+                    self._patterns.append((field, pat))
+        self._cue_re = _compile(THERAPEUTIC_CUES, re.I)
+
+    @classmethod
+    def from_prompt(cls, prompt: str) -> "TaxonomyMatcher":
+        return cls(parse_taxonomy(prompt))
+
+    def _resolve(self, field: str, found: str):
+        low = found.lower()
+        for cand in (low, re.sub(r"(?:es|s)$", "", low), low[:-1]):
+            hit = self._lookup.get((field, cand))
+            if hit:
+                return hit
+        return None, found
+
+    # ── scanning ───────────────────────────────────────────────────
+    def scan(self, text: str) -> list:
+        """[{"field", "category", "term", "match", "start", "end"}] sorted by position."""
+        out = []
+        for field, pat in self._patterns:
+            for m in pat.finditer(text or ""):
+                category, term = self._resolve(field, m.group(0))
+                out.append({"field": field, "category": category, "term": term,
+                            "match": m.group(0), "start": m.start(), "end": m.end()})
+        out.sort(key=lambda h: h["start"])
+        return out
+
+    def has_therapeutic_signal(self, text: str, matches: list = None) -> bool:
+        """Any taxonomy term or therapeutic cue at all."""
+        if matches is None:
+            matches = self.scan(text)
+        return bool(matches) or bool(self._cue_re and self._cue_re.search(text or ""))
+
+    # ── passage selection ──────────────────────────────────────────
+    def passages(self, text: str, budget: int, window: int = 300, head: int = 800) -> str:
+        """
+        Text within ``budget`` chars: the page head (identity, address) plus
+        merged windows around taxonomy hits. Short pages are returned whole.
+        """
+        text = text or ""
+        if len(text) <= budget:
+            return text
+        hits = self.scan(text)
+        if not hits:
+            return text[:budget]
+        spans = [(0, min(head, budget))]
+        for h in hits:
+            s, e = max(0, h["start"] - window), min(len(text), h["end"] + window)
+            if s <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], e))
+            else:
+                spans.append((s, e))
+        out, used = [], 0
+        for s, e in spans:
+            if used >= budget:
+                break
+            chunk = text[s:min(e, s + budget - used)]
+            out.append(chunk)
+            used += len(chunk)
+        return " … ".join(out)
+
+    # ── degraded mode ──────────────────────────────────────────────
+    def extract_fields(self, text: str) -> dict:
+        """Distinct matched terms per field, in order of first appearance."""
+        out = {"drug_modality": [], "disease_focus": []}
+        seen = set()
+        for h in self.scan(text):
+            key = (h["field"], h["term"].lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            out[h["field"]].append(h["term"])
+        return {k: (v or None) for k, v in out.items()}
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import company_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    return company_store.CompanyStore(str(tmp_path / "store.db"), ttl_days=30)
+
+
+def test_same_name_different_domains_is_no_hit(store):
+    store.put_website("Atlas Bio", {"website_url": "https://atlasbio.com"})
+    assert store.get_website("Atlas Bio") == {"website_url": "https://atlasbio.com"}
+    store.put_website("Atlas Bio", {"website_url": "https://atlas-bio.de"})
+    assert store.get_website("Atlas Bio") is None
+    assert store.stats["website_conflicts"] == 1
+
+
+def _site(url, score=90):
+    return {"website_url": url, "total_score": score}
+
+
+def test_conflicting_descriptors_are_no_kb_hit(store):
+    now = time.time()
+    store.add_kb_entries([("Arcus Biosciences", _site("https://arcusbio.com"), now),
+                          ("Annovis Bio", _site("https://annovisbio.com"), now)])
+    assert company_store.name_similarity("Arcus Medical", "Arcus Biosciences") < company_store.KB_MIN_SIMILARITY
+    assert store.lookup_website_kb("Arcus Medical") is None
+    # a name whose descriptors are a subset still matches
+    hit = store.lookup_website_kb("Annovis")
+    assert hit["website_url"] == "https://annovisbio.com"
+    assert hit["kb_similarity"] == 1.0
+    assert hit["kb_domain_match"] is True
+
+
+def test_tie_between_domains_is_ambiguous(store):
+    now = time.time()
+    store.add_kb_entries([("Atlas Bio", _site("https://atlasbio.com"), now),
+                          ("Atlas Bio", _site("https://atlas-bio.de"), now)])
+    assert store.lookup_website_kb("Atlas") is None
+    assert store.stats["kb_ambiguous"] == 1
+    assert store.stats["kb_hits"] == 0
+
+
+def test_kb_index_updates_incrementally(store):
+    now = time.time()
+    store.add_kb_entries([("Zeta Therapeutics", _site("https://zetatx.com"), now)])
+    assert store.lookup_website_kb("Zeta Tx")["website_url"] == "https://zetatx.com"
+    index = store._kb_index
+    assert index is not None
+
+    # new, older-sighting and low-score entries are applied to the live index
+    store.add_kb_entries([("Kinnate Biopharma", _site("https://kinnate.com"), now),
+                          ("Zeta Therapeutics", _site("https://zetatx.com/about", score=60), now - 86400),
+                          ("Omega Bio", _site("https://omegabio.com", score=10), now)])
+    assert store._kb_index is index
+    assert store.lookup_website_kb("Kinnate")["website_url"] == "https://kinnate.com"
+    assert store.lookup_website_kb("Zeta Tx")["website_url"] == "https://zetatx.com"
+    assert store.lookup_website_kb("Omega Bio") is None
+
+    # the incremental index matches one rebuilt from the table
+    entries, by_gram = index
+    store._kb_index = None
+    rebuilt_entries, rebuilt_by_gram = store._kb()
+    assert entries == rebuilt_entries
+    assert all(keys <= by_gram.get(g, set()) for g, keys in rebuilt_by_gram.items())
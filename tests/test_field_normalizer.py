@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import field_normalizer
+
+
+@pytest.mark.parametrize("a, b", [
+    ("The Foo Bio", "Foo Bio"),
+    ("Foo Bio", "FooBio"),
+    ("Moderna", "Modrena"),             # transposition / OCR slip
+    ("Annovis Bio", "Annovis"),
+])
+def test_variants_go_to_llm(a, b):
+    for aggressive in (False, True):
+        settled, ambiguous = field_normalizer.collapse_companies([a, "Zeta Therapeutics", b], aggressive)
+        assert "Zeta Therapeutics" in settled
+        if len(settled) + len(ambiguous) == 2:      # collapsed by the rules
+            assert max(a, b, key=len) in settled
+        else:
+            assert set(ambiguous) == {a, b}
+
+
+def test_unrelated_names_are_settled():
+    settled, ambiguous = field_normalizer.collapse_companies(["Alpha Inc", "Beta Bio", "Arcus", "Arcturus"])
+    assert settled == ["Alpha Inc", "Beta Bio", "Arcus", "Arcturus"]
+    assert ambiguous == []
+
+
+def test_suffix_variants_collapse_locally():
+    settled, ambiguous = field_normalizer.collapse_companies(["Zeta Inc.", "zeta, inc", "Omega"])
+    assert settled == ["Zeta Inc.", "Omega"]
+    assert ambiguous == []
+
+
+def test_results_keep_input_order():
+    names = ["Zeta", "The Foo Bio", "Alpha Inc", "Foo Bio", "Modrena", "Moderna Inc.", "Beta"]
+    settled, ambiguous = field_normalizer.collapse_companies(names, aggressive=True)
+    assert settled == ["Zeta", "Alpha Inc", "Beta"]
+    assert ambiguous == ["The Foo Bio", "Foo Bio", "Modrena", "Moderna Inc."]
+    # what the LLM would keep, appended after the settled names
+    llm_kept = ["Foo Bio", "Moderna Inc."]
+    assert field_normalizer.in_input_order(names, settled + llm_kept) == [
+        "Zeta", "Alpha Inc", "Foo Bio", "Moderna Inc.", "Beta"]
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+import website_discovery as wd  # noqa: E402
+from official_site_benchmark import legacy_is_official_company_site  # noqa: E402
+
+CASES = [
+    ("Annovis Bio", "https://www.annovisbio.com/about"),
+    ("Annovis", "https://annovisbio.com/"),
+    ("Nura Therapeutics", "https://nuratx.com/pipeline"),
+    ("Ray", "https://ray.com"),
+    ("Ray", "https://raytheon.com/"),
+    ("Atlas Biosciences", "https://atlas-biosciences.co/company/profile"),
+    ("Kinetix Pharma", "https://kinetix-pharma.bio/"),
+    ("Helio Inc", "https://www.heliolabs.com/"),
+    ("Orion", "https://www.linkedin.com/company/orion"),
+    ("Orion", "https://orion.com/doc.pdf"),
+    ("Sana", "https://news.example.com/sana-raises"),
+    ("Zeno Medical", "https://zenomedical.com"),
+    ("Quanta", ""),
+    ("Ember Bio", "not a url"),
+]
+
+
+@pytest.mark.parametrize("company, url", CASES)
+def test_is_official_company_site_matches_legacy(company, url):
+    assert tuple(wd.is_official_company_site(url, company)) == \
+        tuple(legacy_is_official_company_site(url, company))
+
+
+@pytest.mark.parametrize("company", sorted({c for c, _ in CASES}))
+def test_score_search_results_matches_legacy(company):
+    # one Serper page with every case URL; the old loop scored each root URL
+    urls = [u for _, u in CASES if u]
+    scored = wd.score_search_results([{"link": u} for u in urls], company)
+    assert [s["url"] for s in scored] == urls
+    for s in scored:
+        expected = legacy_is_official_company_site(wd.normalize_url_to_root(s["url"]), company)
+        assert (s["is_official"], s["score"], s["reasons"]) == tuple(expected)
@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import taxonomy_matcher
+
+# Category lines in the same shape as STARTUP_3FIELDS_PROMPT, including the
+# items that used to leave bare modifiers ("base", "traditional", "DNA", "etc")
+PROMPT = '''
+"drug_modality"
+    **1. SMALL MOLECULES:** conventional inhibitors/activators, covalent inhibitors, PROTACs
+    **2. GENETIC MEDICINES:** CRISPR/Cas9, base/prime editors, mRNA therapeutics, siRNA/miRNA
+    **5. CELL THERAPIES:** CAR-T cells, stem cell therapies (hematopoietic, mesenchymal, embryonic)
+    **10. VACCINES:** prophylactic vaccines (traditional, mRNA, viral vector), DNA/RNA vaccines
+"disease_focus"
+    **1. INFECTIOUS DISEASES:** Viral infections (HIV/AIDS, Hepatitis B/C, Influenza)
+    **2. CANCER/ONCOLOGY:** Solid tumors (Lung, Breast), Rare/Pediatric cancers (Ewing Sarcoma)
+    **10. MUSCULOSKELETAL DISEASES:** Osteoarthritis, Tendon/ligament disorders, Sarcopenia
+    **17. OTHER/UNSPECIFIED DISEASES:** Any disease not fitting above categories, including emerging diseases, pandemic threats, etc.
+'''
+
+MATCHER = taxonomy_matcher.TaxonomyMatcher.from_prompt(PROMPT)
+
+
+def _terms(field):
+    return {t.lower() for terms in taxonomy_matcher.parse_taxonomy(PROMPT)[field].values() for t in terms}
+
+
+def test_no_bare_modifiers_in_taxonomy():
+    modality, disease = _terms("drug_modality"), _terms("disease_focus")
+    for junk in ("base", "prime", "activators", "traditional", "dna", "mrna",
+                 "hematopoietic", "mesenchymal", "embryonic"):
+        assert junk not in modality
+    for junk in ("etc", "tendon", "rare", "c"):
+        assert junk not in disease
+
+
+def test_slash_groups_keep_whole_phrases():
+    assert {"base editors", "prime editors", "dna vaccines", "rna vaccines"} <= _terms("drug_modality")
+    assert {"tendon disorders", "hepatitis c", "hiv", "aids"} <= _terms("disease_focus")
+
+
+def test_non_therapeutic_text_yields_nothing():
+    text = ("Our database platform serves a broad customer base of labs using "
+            "traditional DNA sequencing, mRNA analytics, etc.")
+    assert MATCHER.extract_fields(text) == {"drug_modality": None, "disease_focus": None}
+    assert not MATCHER.scan(text)
+
+
+def test_therapeutic_text_still_matches():
+    found = MATCHER.extract_fields("We develop base editors and mRNA vaccines for Hepatitis C.")
+    assert found["drug_modality"] == ["base editors", "mRNA vaccine"]
+    assert found["disease_focus"] == ["Hepatitis C"]
@@ -11,8 +11,15 @@ from dotenv import load_dotenv
 import os
 import re
 import signal
+import functools
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import company_store
+import task_runtime
+import serper_client
+import domain_guess
+import http_client
+from concurrency_controller import AdaptiveConcurrency
 # ── Console-encoding hardening (Windows CP-1252 can’t print emoji) ──
 import sys
 if (
@@ -40,9 +47,33 @@ REQUEST_TIMEOUT = 8
 API_TIMEOUT = 12
 MAX_RETRIES_PER_COMPANY = 2
 MAX_RATE_LIMIT_RETRIES = 3
-RATE_LIMIT_DELAY = 3
-COMPANY_DELAY = 1.0
+RATE_LIMIT_DELAY = 3   # backoff after a non-429 API error (429s go through rate_limiter)
 GLOBAL_TIMEOUT = 45  # Maximum time per company search
+# Company-level concurrency: starts at DISCOVERY_WORKERS_START and adapts up
+# to DISCOVERY_WORKERS_MAX; DISCOVERY_WORKERS=N pins a fixed worker count
+DISCOVERY_WORKERS = int(os.getenv("DISCOVERY_WORKERS", "0"))
+DISCOVERY_WORKERS_START = int(os.getenv("DISCOVERY_WORKERS_START", "4"))
+DISCOVERY_WORKERS_MAX = int(os.getenv("DISCOVERY_WORKERS_MAX", "24"))
+HIGH_CONFIDENCE_SCORE = 90  # stop searching once a validated result reaches this
+# "sequential": one query variant at a time; "parallel": all variants at once
+# under serper_client's global rate gate, cancelling the rest on a confident hit
+SEARCH_MODE = os.getenv("DISCOVERY_SEARCH_MODE", "sequential")
+# Probe name.com / namebio.com / … before any Serper query (0 disables)
+DOMAIN_PROBE = os.getenv("DISCOVERY_DOMAIN_PROBE", "1") != "0"
+DOMAIN_PROBE_MIN_SCORE = 80   # is_official_company_site score the guessed domain must reach
+PORTFOLIO_LINK_BONUS = 30     # score credit for a site the VC's own portfolio page links to
+# "batch": one LLM call validates all of a query's candidates; "single": one call each
+LLM_VALIDATION_MODE = os.getenv("DISCOVERY_LLM_VALIDATION", "batch")
+
+BIOTECH_CONTEXT_KEYWORDS = [
+   'biotech', 'pharmaceutical', 'therapeutics', 'medicine',
+   'drug', 'therapy', 'clinical', 'pipeline', 'treatment'
+]
+
+search_stats = {"fanout_companies": 0, "queries_issued": 0, "queries_cancelled": 0,
+                "queries_abandoned_in_flight": 0,
+                "domain_probe_companies": 0, "domain_probe_resolved": 0}
+_search_stats_lock = threading.Lock()
 
 # ── Skip interactive prompts when run from main_pipeline ───────────
 import os, sys, builtins
@@ -77,45 +108,88 @@ NON_COMPANY_PATTERNS = [
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
-class TimeoutException(Exception):
-   pass
+# kept for callers that test isinstance(err, TimeoutException)
+TimeoutException = task_runtime.DeadlineExceeded
+
+
+# Set by SIGTERM/SIGINT: stop starting companies, let in-flight ones finish
+_shutdown = threading.Event()
 
 
 def setup_signal_handlers():
-   """Setup signal handlers for graceful termination"""
+   """
+   Setup signal handlers for graceful termination. Returns the handlers
+   they replaced ({signum: handler}) for restore_signal_handlers.
+   """
    def signal_handler(signum, frame):
+       if _shutdown.is_set():
+           print(f"\n⚠️ Received signal {signum} again - exiting now")
+           sys.exit(1)
        print(f"\n⚠️ Received signal {signum}. Gracefully shutting down...")
-       print("💾 Saving partial results...")
-       sys.exit(1)
+       print("💾 Finishing in-flight companies; completed ones are already in the journal")
+       _shutdown.set()
   
-   signal.signal(signal.SIGTERM, signal_handler)
-   signal.signal(signal.SIGINT, signal_handler)
+   previous = {}
+   try:
+       for signum in (signal.SIGTERM, signal.SIGINT):
+           previous[signum] = signal.signal(signum, signal_handler)
+   except ValueError:
+       pass  # not the main thread – the caller owns signal handling
+   return previous
 
 
-def timeout_handler(func, args=(), kwargs={}, timeout_duration=GLOBAL_TIMEOUT, default=None):
-   """Execute function with timeout using threading"""
-   result = [default]
-   exception = [None]
-  
-   def target():
-       try:
-           result[0] = func(*args, **kwargs)
-       except Exception as e:
-           exception[0] = e
-  
-   thread = threading.Thread(target=target)
-   thread.daemon = True
-   thread.start()
-   thread.join(timeout_duration)
-  
-   if thread.is_alive():
-       # Thread is still running, timeout occurred
-       return default, TimeoutException(f"Function timed out after {timeout_duration}s")
-  
-   if exception[0]:
-       return default, exception[0]
-  
-   return result[0], None
+def restore_signal_handlers(previous):
+   """Put back what setup_signal_handlers replaced and forget any pending shutdown."""
+   for signum, handler in previous.items():
+       signal.signal(signum, handler if handler is not None else signal.SIG_DFL)
+   _shutdown.clear()
+
+
+# ── Per-company journal (streaming output + resume) ──────────────────
+_journal_lock = threading.Lock()
+RESUMABLE_STATUSES = ("found", "failed")   # "timeout" / "error" outcomes are retried
+
+
+def journal_path_for(runs_dir, input_path, vc_safe_name):
+   """One journal per input file content – a rerun on the same input resumes it."""
+   import hashlib
+   with open(input_path, "rb") as f:
+       digest = hashlib.sha1(f.read()).hexdigest()[:12]
+   return os.path.join(runs_dir, f"{vc_safe_name}_websites_{digest}.partial.jsonl")
+
+
+def load_journal(path):
+   """{company_name: latest record}; a torn last line from a crash is ignored."""
+   records = {}
+   if path and os.path.exists(path):
+       with open(path, encoding="utf-8") as f:
+           for line in f:
+               try:
+                   rec = json.loads(line)
+               except json.JSONDecodeError:
+                   continue
+               records[rec.get("company_name")] = rec
+   return records
+
+
+def append_journal(path, record):
+   line = json.dumps(record, default=str)
+   with _journal_lock, open(path, "a", encoding="utf-8") as f:
+       f.write(line + "\n")
+       f.flush()
+       os.fsync(f.fileno())
+
+
+def finish_journal(path, output_path):
+   """Run complete: keep the journal next to its output; a rerun on the same input starts fresh."""
+   if path and os.path.exists(path):
+       os.replace(path, os.path.splitext(output_path)[0] + ".jsonl")
+
+
+def timeout_handler(func, args=(), kwargs={}, timeout_duration=GLOBAL_TIMEOUT, default=None, cleanup=None):
+   """Run func under a cancellable deadline (HTTP timeouts and sleeps honour it)"""
+   return task_runtime.run_with_deadline(func, args, kwargs, timeout_duration=timeout_duration,
+                                         default=default, cleanup=cleanup)
 
 
 def normalize_url_to_root(url):
@@ -134,108 +208,143 @@ def normalize_url_to_root(url):
        return url
 
 
+# Compiled once: suffix set for excluded domains, one alternation for URL patterns
+_EXCLUDED_DOMAIN_SET = frozenset(EXCLUDE_DOMAINS)
+_NON_COMPANY_RE = re.compile("|".join(f"(?:{p})" for p in NON_COMPANY_PATTERNS))
+_NAME_CLEAN_RE = re.compile(r'[^a-z0-9\s]')
+OFFICIAL_SCORE_CACHE_SIZE = 100_000
+
+
+def is_excluded_domain(domain):
+   """True when ``domain`` is an excluded domain or a subdomain of one."""
+   parts = domain.split('.')
+   return any('.'.join(parts[i:]) in _EXCLUDED_DOMAIN_SET for i in range(len(parts) - 1))
+
+
+@functools.lru_cache(maxsize=OFFICIAL_SCORE_CACHE_SIZE)
+def _score_domain(domain, company_name):
+   """Domain-vs-name score for is_official_company_site, memoized per (domain, company)."""
+   reasons = []
+   score = 0
+  
+   # Clean company name for matching
+   clean_company = _NAME_CLEAN_RE.sub('', company_name.lower()).replace(' ', '')
+  
+   # Word-based matching
+   company_words = [word for word in company_name.lower().split() if len(word) > 2]
+   domain_clean = domain.replace('-', '').replace('.', '')
+  
+   # High score if full company name is in domain (with stricter matching)
+   if clean_company in domain_clean:
+       # Check if company name appears as complete word/segment, not just substring
+       # This helps avoid "ray" matching "c-ray" scenarios
+       company_segments = clean_company.split()
+       if len(company_segments) == 1:  # Single word companies need exact or prefix match
+           main_word = company_segments[0]
+           # Look for exact word boundaries or clear company name patterns
+           if (main_word == domain_clean or 
+               domain_clean.startswith(main_word + 'bio') or
+               domain_clean.startswith(main_word + 'pharma') or
+               domain_clean.startswith(main_word + 'therapeutics') or
+               domain_clean.startswith(main_word + 'tx') or
+               domain_clean.endswith(main_word + 'bio') or
+               domain_clean.endswith(main_word + 'therapeutics')):
+               score += 80
+               reasons.append(f"Full company name in domain ({clean_company} in {domain})")
+           else:
+               # Potential false positive - reduce confidence
+               score += 40
+               reasons.append(f"Partial company name match in domain - needs validation ({clean_company} in {domain})")
+       else:
+           # Multi-word companies - original logic
+           score += 80
+           reasons.append(f"Full company name in domain ({clean_company} in {domain})")
+   # Medium-high score if all words are in domain
+   elif len(company_words) > 1 and all(word in domain for word in company_words):
+       score += 70
+       reasons.append(f"All company words in domain ({company_words} in {domain})")
+  
+   # Medium score if partial company name in domain 
+   if score < 70:
+       domain_matches = sum(1 for word in company_words if word in domain)
+       if domain_matches > 0:
+           partial_score = domain_matches * 15
+           score += partial_score
+           reasons.append(f"{domain_matches} company words in domain (+{partial_score})")
+  
+   # Prefer .com domains
+   if domain.endswith('.com'):
+       score += 10
+       reasons.append(".com domain")
+  
+   # Bonus for biotech-related domains
+   biotech_terms = ['bio', 'pharma', 'therapeutics', 'medical']
+   if any(term in domain for term in biotech_terms):
+       score += 5
+       reasons.append("Biotech-related domain")
+  
+   return score >= 30, score, tuple(reasons)
+
+
 def is_official_company_site(url, company_name):
    """Check if URL is likely the official company website with enhanced scoring"""
    if not url:
        return False, 0, []
   
-   reasons = []
-   score = 0
-  
    try:
        domain = urlparse(url).netloc.lower().replace('www.', '')
-       path = urlparse(url).path.lower()
       
        # Skip excluded domains
-       if any(excluded in domain for excluded in EXCLUDE_DOMAINS):
+       if is_excluded_domain(domain):
            return False, 0, ["Excluded domain"]
       
        # Skip non-company URL patterns
-       if any(re.search(pattern, url.lower()) for pattern in NON_COMPANY_PATTERNS):
+       if _NON_COMPANY_RE.search(url.lower()):
            return False, 0, ["Non-company URL pattern"]
       
-       # Clean company name for matching
-       clean_company = re.sub(r'[^a-z0-9\s]', '', company_name.lower()).replace(' ', '')
-      
-       # Word-based matching
-       company_words = [word for word in company_name.lower().split() if len(word) > 2]
-      
-       # High score if full company name is in domain (with stricter matching)
-       if clean_company in domain.replace('-', '').replace('.', ''):
-           # Additional validation for exact match scenarios
-           domain_clean = domain.replace('-', '').replace('.', '')
-           
-           # Check if company name appears as complete word/segment, not just substring
-           # This helps avoid "ray" matching "c-ray" scenarios
-           company_segments = clean_company.split()
-           if len(company_segments) == 1:  # Single word companies need exact or prefix match
-               main_word = company_segments[0]
-               # Look for exact word boundaries or clear company name patterns
-               if (main_word == domain_clean or 
-                   domain_clean.startswith(main_word + 'bio') or
-                   domain_clean.startswith(main_word + 'pharma') or
-                   domain_clean.startswith(main_word + 'therapeutics') or
-                   domain_clean.startswith(main_word + 'tx') or
-                   domain_clean.endswith(main_word + 'bio') or
-                   domain_clean.endswith(main_word + 'therapeutics')):
-                   score += 80
-                   reasons.append(f"Full company name in domain ({clean_company} in {domain})")
-               else:
-                   # Potential false positive - reduce confidence
-                   score += 40
-                   reasons.append(f"Partial company name match in domain - needs validation ({clean_company} in {domain})")
-           else:
-               # Multi-word companies - original logic
-               score += 80
-               reasons.append(f"Full company name in domain ({clean_company} in {domain})")
-       # Medium-high score if all words are in domain
-       elif len(company_words) > 1 and all(word in domain for word in company_words):
-           score += 70
-           reasons.append(f"All company words in domain ({company_words} in {domain})")
-      
-       # Medium score if partial company name in domain 
-       if score < 70:
-           domain_matches = sum(1 for word in company_words if word in domain)
-           if domain_matches > 0:
-               partial_score = domain_matches * 15
-               score += partial_score
-               reasons.append(f"{domain_matches} company words in domain (+{partial_score})")
-      
-       # Prefer .com domains
-       if domain.endswith('.com'):
-           score += 10
-           reasons.append(".com domain")
-      
-       # Bonus for biotech-related domains
-       biotech_terms = ['bio', 'pharma', 'therapeutics', 'medical']
-       if any(term in domain for term in biotech_terms):
-           score += 5
-           reasons.append("Biotech-related domain")
-      
-       return score >= 30, score, reasons
+       is_official, score, reasons = _score_domain(domain, company_name)
+       return is_official, score, list(reasons)
       
    except Exception:
        return False, 0, ["URL parsing error"]
 
 
-def validate_company_with_llm(company_name, website_url, title, snippet):
+def score_search_results(organic_results, company_name):
+   """
+   Score a whole page of Serper organic results at once.
+
+   Returns one dict per result that has a link, in result order:
+   {"index", "url", "normalized_url", "domain", "is_official", "score", "reasons"}.
+   """
+   scored = []
+   for j, result in enumerate(organic_results, 1):
+       url = result.get('link', '')
+       if not url:
+           continue
+       normalized_url = normalize_url_to_root(url)
+       is_official, score, reasons = is_official_company_site(normalized_url, company_name)
+       scored.append({
+           "index": j,
+           "url": url,
+           "normalized_url": normalized_url,
+           "domain": urlparse(url).netloc.replace('www.', ''),
+           "is_official": is_official,
+           "score": score,
+           "reasons": reasons
+       })
+   return scored
+
+
+def validate_company_with_llm(company_name, website_url, title, snippet, vc_context=None, http=None):
    """Use LLM to validate if the website belongs to the correct life sciences/biotech company"""
    if not OPENAI_API_KEY:
        print(f"            ⚠️ No OpenAI API key - skipping LLM validation")
        return True, "No LLM validation (missing API key)"
    
    try:
-       # Get VC context if available
-       source_vc = None
-       source_vc_url = None
-       import inspect
-       frame = inspect.currentframe()
-       while frame:
-           if 'source_vc' in frame.f_locals:
-               source_vc = frame.f_locals['source_vc']
-           if 'source_vc_url' in frame.f_locals:
-               source_vc_url = frame.f_locals['source_vc_url']
-           frame = frame.f_back
+       # VC context is passed down explicitly from the discovery caller
+       source_vc = (vc_context or {}).get("vc_name")
+       source_vc_url = (vc_context or {}).get("vc_url")
 
        prompt = f"""FLEXIBLE BUT ACCURATE VALIDATION: Is this the official website for \"{company_name}\"?
 
@@ -279,12 +388,13 @@ Only answer TRUE if all steps pass. If unsure, explain why.
            "temperature": 0
        }
        
-       response = requests.post(
+       response = (http or http_client.get_client()).post(
            "https://api.openai.com/v1/chat/completions",
            json=payload,
            headers=headers,
-           timeout=10
+           timeout=task_runtime.remaining_timeout(10)
        )
+       _check_abandoned()
        
        if response.status_code == 200:
            result = response.json()
@@ -346,20 +456,164 @@ Only answer TRUE if all steps pass. If unsure, explain why.
            print(f"            ❌ LLM API error: {response.status_code}")
            return True, f"LLM API error - defaulting to accept"
            
+   except task_runtime.DeadlineExceeded:
+       raise
    except Exception as e:
        print(f"            ❌ LLM validation error: {e}")
        return True, f"LLM validation failed - defaulting to accept"
 
 
-def make_serper_request_with_retries(query, company_name, max_retries=MAX_RATE_LIMIT_RETRIES):
+BATCH_VALIDATION_PROMPT = """For each numbered candidate below, decide whether it is the OFFICIAL website of the company named in that candidate.
+
+PASS a candidate if:
+  - Its title, description or domain contains the company name or a close variant (allow Inc., Corp., Ltd., Therapeutics, Bio, abbreviations, "bio"/"therapeutics"/"tx" added to the domain).
+  - It describes a biotech / therapeutics developer.
+
+FAIL a candidate if:
+  - It belongs to a different company, a directory, news/media, a VC, or a large pharma.
+  - The name match is only partial and refers to a different entity.
+  - It does not mention the company or its biotech/therapeutics activity.
+
+The source VC (when known) backs the company – a site consistent with that is more likely correct.
+
+Return ONLY JSON:
+{{"verdicts": [{{"id": <candidate number>, "valid": true|false, "confidence": <0-100>, "reason": "<one short sentence>"}}]}}
+
+CANDIDATES:
+{candidates}
+"""
+
+_validation_cache = {}          # (company lower, url) → (valid, reason, confidence)
+_validation_cache_lock = threading.Lock()
+validation_stats = {"llm_calls": 0, "candidates_validated": 0, "cache_hits": 0, "rate_limited": 0,
+                    "abandoned_in_flight": 0}
+
+
+def validate_candidates_with_llm(items, vc_context=None, http=None):
+   """
+   Validate many candidates – for one company or several – in one request.
+
+   ``items`` are dicts with company_name / website_url / title / snippet.
+   Returns [(valid, reason, confidence)] aligned with ``items``. Verdicts
+   are memoised per (company, url), so a site that turns up again under a
+   later query variant is not re-validated. Like the single validator,
+   an API failure defaults to accept.
+   """
+   results = [None] * len(items)
+   todo = []
+   with _validation_cache_lock:
+       for i, item in enumerate(items):
+           key = (item["company_name"].lower(), item["website_url"])
+           if key in _validation_cache:
+               results[i] = _validation_cache[key]
+               validation_stats["cache_hits"] += 1
+           else:
+               todo.append(i)
+   if not todo:
+       return results
+
+   if not OPENAI_API_KEY:
+       print(f"            ⚠️ No OpenAI API key - skipping LLM validation")
+       for i in todo:
+           results[i] = (True, "No LLM validation (missing API key)", None)
+       return results
+
+   vc = vc_context or {}
+   lines = []
+   for n, i in enumerate(todo, 1):
+       item = items[i]
+       lines.append(f'{n}. COMPANY: "{item["company_name"]}" | WEBSITE: {item["website_url"]} | '
+                    f'TITLE: "{item.get("title", "")}" | DESCRIPTION: "{item.get("snippet", "")}"')
+   prompt = BATCH_VALIDATION_PROMPT.format(candidates="\n".join(lines))
+   if vc.get("vc_name") or vc.get("vc_url"):
+       prompt += f"\nSOURCE VC: {vc.get('vc_name') or '[unknown]'} ({vc.get('vc_url') or '[unknown]'})\n"
+
+   verdicts = {}
+   try:
+       response = (http or http_client.get_client()).post(
+           "https://api.openai.com/v1/chat/completions",
+           json={
+               "model": "gpt-4.1-mini",
+               "messages": [{"role": "user", "content": prompt}],
+               "response_format": {"type": "json_object"},
+               "max_tokens": 60 + 60 * len(todo),
+               "temperature": 0
+           },
+           headers={"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"},
+           timeout=task_runtime.remaining_timeout(10 + 2 * len(todo))
+       )
+       with _validation_cache_lock:
+           validation_stats["llm_calls"] += 1
+           validation_stats["candidates_validated"] += len(todo)
+       _check_abandoned()
+       if response.status_code != 200:
+           print(f"            ❌ LLM API error: {response.status_code}")
+           if response.status_code == 429:
+               with _validation_cache_lock:
+                   validation_stats["rate_limited"] += 1
+           for i in todo:
+               results[i] = (True, "LLM API error - defaulting to accept", None)
+           return results
+       content = response.json()['choices'][0]['message']['content']
+       for v in json.loads(content).get("verdicts", []):
+           try:
+               verdicts[int(v.get("id"))] = v
+           except (TypeError, ValueError):
+               continue
+   except task_runtime.DeadlineExceeded:
+       raise
+   except Exception as e:
+       print(f"            ❌ LLM validation error: {e}")
+       for i in todo:
+           results[i] = (True, "LLM validation failed - defaulting to accept", None)
+       return results
+
+   for n, i in enumerate(todo, 1):
+       v = verdicts.get(n)
+       if v is None:
+           results[i] = (True, "LLM gave no verdict - defaulting to accept", None)
+           continue
+       valid = v.get("valid") is True or str(v.get("valid")).lower() == "true"
+       reason = str(v.get("reason", ""))[:150]
+       results[i] = (valid, f"LLM {'validated' if valid else 'rejected'}: {reason}", v.get("confidence"))
+       with _validation_cache_lock:
+           _validation_cache[(items[i]["company_name"].lower(), items[i]["website_url"])] = results[i]
+   return results
+
+
+def _check_abandoned():
+   """
+   The search's deadline is its cancel token: remaining_timeout() checks it
+   before an LLM call is spent; this counts and raises for one cancelled
+   while the call was already out.
+   """
+   deadline = task_runtime.current()
+   if deadline is not None and deadline.cancelled:
+       with _validation_cache_lock:
+           validation_stats["abandoned_in_flight"] += 1
+       deadline.check()
+
+
+def validate_candidates(company_name, candidates, vc_context=None, http=None):
+   """[(valid, reason, confidence)] for one company's candidates, batched unless LLM_VALIDATION_MODE=single."""
+   if LLM_VALIDATION_MODE == "single":
+       out = []
+       for c in candidates:
+           valid, reason = validate_company_with_llm(company_name, c["website_url"], c["title"],
+                                                     c["snippet"], vc_context, http)
+           out.append((valid, reason, None))
+       return out
+   items = [dict(c, company_name=company_name) for c in candidates]
+   return validate_candidates_with_llm(items, vc_context, http)
+
+
+def make_serper_request_with_retries(query, company_name, max_retries=MAX_RATE_LIMIT_RETRIES, vc_context=None,
+                                     http=None):
    """Make Serper API request with enhanced retry logic and timeout handling"""
+   http = http or http_client.get_client()
   
    for retry in range(max_retries):
        try:
-           headers = {
-               "X-API-KEY": SERPER_API_KEY,
-               "Content-Type": "application/json"
-           }
            payload = {
                "q": query,
                "num": 6,  # Reduced for faster response
@@ -368,12 +622,15 @@ def make_serper_request_with_retries(query, company_name, max_retries=MAX_RATE_L
           
            print(f"      [API REQUEST] Attempt {retry + 1}/{max_retries}")
           
-           response = requests.post(
-               "https://google.serper.dev/search",
-               json=payload,
-               headers=headers,
-               timeout=API_TIMEOUT
+           # disk cache (normalised query + gl/num) in front of google.serper.dev
+           response = serper_client.search(
+               payload,
+               SERPER_API_KEY,
+               timeout=task_runtime.remaining_timeout(API_TIMEOUT),
+               post=http.post
            )
+           if getattr(response, "from_cache", False):
+               print(f"        [CACHE] {'stale ' if response.stale else ''}hit for '{query}'")
           
            if response.status_code == 200:
                try:
@@ -382,30 +639,21 @@ def make_serper_request_with_retries(query, company_name, max_retries=MAX_RATE_L
                   
                    print(f"        [RESULTS] {len(organic_results)} found")
                   
-                   # Process results - try up to 3 with LLM validation
-                   best_result = None
-                   best_score = 0
-                   validated_results = 0
+                   # Score every result first, then validate the official ones in one LLM call
+                   candidates = []
                    max_results_to_validate = min(3, len(organic_results))
                   
-                   for j, result in enumerate(organic_results, 1):
-                       url = result.get('link', '')
+                   # Normalize every URL to its root and score the whole page in one pass
+                   for scored in score_search_results(organic_results, company_name):
+                       result = organic_results[scored["index"] - 1]
                        title = result.get('title', '')
                        snippet = result.get('snippet', '')
+                       url, normalized_url = scored["url"], scored["normalized_url"]
+                       is_official, score, reasons = scored["is_official"], scored["score"], scored["reasons"]
                       
-                       if not url:
-                           continue
-                      
-                       domain = urlparse(url).netloc.replace('www.', '')
-                       print(f"          [{j}] {domain}")
-                      
-                       # Normalize URL to root domain before scoring
-                       normalized_url = normalize_url_to_root(url)
+                       print(f"          [{scored['index']}] {scored['domain']}")
                        if normalized_url != url:
                            print(f"            🔄 Normalized: {url} → {normalized_url}")
-                       
-                       # Check if this is an official company site (using normalized URL)
-                       is_official, score, reasons = is_official_company_site(normalized_url, company_name)
                       
                        print(f"            📊 Score: {score}/100")
                        if reasons:
@@ -416,30 +664,36 @@ def make_serper_request_with_retries(query, company_name, max_retries=MAX_RATE_L
                            print(f"            ⏭️ Skipping - not official enough")
                            continue
                       
-                       # LLM validation for official sites
-                       print(f"            🤖 LLM validating...")
-                       llm_valid, llm_reason = validate_company_with_llm(company_name, normalized_url, title, snippet)
-                       print(f"            🤖 {llm_reason}")
-                       
-                       validated_results += 1
+                       candidates.append({
+                           "website_url": normalized_url,
+                           "title": title,
+                           "snippet": snippet,
+                           "score": score,
+                           "reasons": reasons
+                       })
+                       if len(candidates) >= max_results_to_validate:
+                           print(f"            ⏹️ Reached max validation candidates ({max_results_to_validate})")
+                           break
+                  
+                   if not candidates:
+                       return None
+                  
+                   print(f"            🤖 LLM validating {len(candidates)} candidate(s)...")
+                   verdicts = validate_candidates(company_name, candidates, vc_context, http)
+                  
+                   best_result = None
+                   best_score = 0
+                   for cand, (llm_valid, llm_reason, llm_confidence) in zip(candidates, verdicts):
+                       title, snippet, score = cand["title"], cand["snippet"], cand["score"]
+                       print(f"            🤖 {cand['website_url']}: {llm_reason}")
                       
                        if not llm_valid:
                            print(f"            ❌ LLM rejected - trying next result")
-                           if validated_results >= max_results_to_validate:
-                               print(f"            ⏹️ Reached max validation attempts ({max_results_to_validate})")
-                               break
                            continue
                       
                        # Additional biotech context check
-                       biotech_score = 0
                        all_text = f"{title} {snippet}".lower()
-                      
-                       biotech_keywords = [
-                           'biotech', 'pharmaceutical', 'therapeutics', 'medicine',
-                           'drug', 'therapy', 'clinical', 'pipeline', 'treatment'
-                       ]
-                      
-                       biotech_matches = sum(1 for keyword in biotech_keywords if keyword in all_text)
+                       biotech_matches = sum(1 for keyword in BIOTECH_CONTEXT_KEYWORDS if keyword in all_text)
                        biotech_score = min(20, biotech_matches * 5)
                       
                        total_score = score + biotech_score
@@ -453,38 +707,35 @@ def make_serper_request_with_retries(query, company_name, max_retries=MAX_RATE_L
                            best_score = total_score
                            best_result = {
                                "company_name": company_name,
-                               "website_url": normalized_url,  # Use normalized URL in final result
+                               "website_url": cand["website_url"],  # Use normalized URL in final result
                                "title": title,
                                "snippet": snippet,
                                "search_query": query,
                                "official_site_score": score,
                                "biotech_context_score": biotech_score,
                                "total_score": total_score,
-                               "validation_reasons": reasons,
+                               "validation_reasons": cand["reasons"],
                                "biotech_keywords_found": biotech_matches,
-                               "llm_validation": llm_reason
+                               "llm_validation": llm_reason,
+                               "llm_confidence": llm_confidence
                            }
                            print(f"            ✅ New best result!")
-                           # Don't break here - we might find an even better result
-                      
-                       # If we've validated enough results, stop
-                       if validated_results >= max_results_to_validate:
-                           print(f"            ⏹️ Reached max validation attempts ({max_results_to_validate})")
-                           break
                   
                    return best_result
                   
                except json.JSONDecodeError as e:
                    print(f"        ❌ JSON decode error: {e}")
                    if retry < max_retries - 1:
-                       time.sleep(RATE_LIMIT_DELAY)
+                       task_runtime.sleep(RATE_LIMIT_DELAY)
                        continue
                    return None
                   
            elif response.status_code == 429:
-               print(f"        ⏳ Rate limited - waiting {RATE_LIMIT_DELAY}s...")
+               # the shared bucket is now blocked for Retry-After (or backoff);
+               # the next attempt waits in serper_client's rate gate
+               print(f"        ⏳ Rate limited - shared limiter paused for "
+                     f"{getattr(response, 'retry_after', 0):.1f}s")
                if retry < max_retries - 1:
-                   time.sleep(RATE_LIMIT_DELAY * (retry + 1))
                    continue
                else:
                    print(f"        ❌ Rate limited after {max_retries} attempts")
@@ -497,35 +748,226 @@ def make_serper_request_with_retries(query, company_name, max_retries=MAX_RATE_L
            else:
                print(f"        ❌ API Error: {response.status_code} - {response.text[:100]}")
                if retry < max_retries - 1:
-                   time.sleep(RATE_LIMIT_DELAY)
+                   task_runtime.sleep(RATE_LIMIT_DELAY)
                    continue
                return None
               
+       except task_runtime.DeadlineExceeded:
+           raise
+
        except requests.exceptions.Timeout:
            print(f"        ⏰ API request timeout ({API_TIMEOUT}s)")
            if retry < max_retries - 1:
-               time.sleep(2)
+               task_runtime.sleep(2)
                continue
            return None
           
        except requests.exceptions.RequestException as e:
            print(f"        ❌ Request error: {e}")
            if retry < max_retries - 1:
-               time.sleep(2)
+               task_runtime.sleep(2)
                continue
            return None
           
        except Exception as e:
            print(f"        ❌ Unexpected error: {e}")
            if retry < max_retries - 1:
-               time.sleep(2)
+               task_runtime.sleep(2)
                continue
            return None
   
    return None
 
 
-def find_biotech_company_website_with_timeout(company_name, vc_name=None):
+def _count_search(key, n=1):
+   with _search_stats_lock:
+       search_stats[key] += n
+
+
+def pick_best_result(results):
+   """
+   Deterministic winner among per-query results (None = no result): the
+   highest total_score, ties going to the earliest query variant – the
+   same choice the sequential loop makes.
+   """
+   best_idx = None
+   for i, result in enumerate(results):
+       if result and (best_idx is None or result['total_score'] > results[best_idx]['total_score']):
+           best_idx = i
+   return results[best_idx] if best_idx is not None else None
+
+
+def resolve_by_domain_probe(company_name, http=None):
+   """
+   Accept a guessed domain without Serper or the LLM when its homepage
+   title names the company, the domain itself scores as official, and the
+   name or page carries a biotech cue. Returns a search-style result or None.
+   """
+   _count_search("domain_probe_companies")
+   candidates = domain_guess.probe_candidates(company_name, http=http)
+   best = None
+   for cand in candidates:
+       if not domain_guess.title_matches(company_name, cand["title"]):
+           continue
+       is_official, score, reasons = is_official_company_site(cand["url"], company_name)
+       if not is_official or score < DOMAIN_PROBE_MIN_SCORE:
+           continue
+       page_text = f"{cand['title']} {cand['description']}".lower()
+       biotech_matches = sum(1 for keyword in BIOTECH_CONTEXT_KEYWORDS if keyword in page_text)
+       name_is_biotech = any(k in company_name.lower() for k in ('therapeutics', 'bio', 'pharma'))
+       if not biotech_matches and not name_is_biotech:
+           continue
+       biotech_score = min(20, biotech_matches * 5)
+       total_score = score + biotech_score
+       if best is None or total_score > best["total_score"]:    # ties: candidate order
+           best = {
+               "company_name": company_name,
+               "website_url": cand["url"],
+               "title": cand["title"],
+               "snippet": cand["description"],
+               "search_query": f"direct domain probe: {cand['domain']}",
+               "official_site_score": score,
+               "biotech_context_score": biotech_score,
+               "total_score": total_score,
+               "validation_reasons": reasons + ["Homepage title names the company"],
+               "biotech_keywords_found": biotech_matches,
+               "llm_validation": "Skipped - confident title match on guessed domain",
+               "resolved_without_search": True
+           }
+   if best:
+       _count_search("domain_probe_resolved")
+       print(f"      🎯 Direct domain hit: {best['website_url']} ('{best['title'][:60]}') - no search needed")
+   else:
+       print(f"      [DOMAIN PROBE] {len(candidates)} live candidate(s), none confident - searching")
+   return best
+
+
+def check_portfolio_link(company_name, href, http=None):
+   """
+   Accept a website the VC's portfolio page links to for this company after
+   a cheap check: the site is live, not an excluded/non-company domain,
+   and its title names the company (or the domain itself scores official).
+   Returns a search-style result (no Serper, no LLM) or None.
+   """
+   root = normalize_url_to_root(href if "://" in href else f"https://{href}")
+   is_official, score, reasons = is_official_company_site(root, company_name)
+   if reasons[:1] in (["Excluded domain"], ["Non-company URL pattern"], ["URL parsing error"]):
+       return None
+   page = domain_guess.fetch_page(root, timeout=task_runtime.remaining_timeout(domain_guess.PROBE_TIMEOUT),
+                                  http=http)
+   if not page:
+       return None
+   if page["url"] != root:
+       is_official, score, reasons = is_official_company_site(page["url"], company_name)
+   title_ok = domain_guess.title_matches(company_name, page["title"])
+   if not title_ok and score < DOMAIN_PROBE_MIN_SCORE:
+       return None
+   page_text = f"{page['title']} {page['description']}".lower()
+   biotech_matches = sum(1 for keyword in BIOTECH_CONTEXT_KEYWORDS if keyword in page_text)
+   biotech_score = min(20, biotech_matches * 5)
+   reasons = reasons + ["Linked from the VC portfolio page"] + (["Homepage title names the company"] if title_ok else [])
+   return {
+       "company_name": company_name,
+       "website_url": page["url"],
+       "title": page["title"],
+       "snippet": page["description"],
+       "search_query": f"portfolio page link: {href}",
+       "official_site_score": score,
+       "biotech_context_score": biotech_score,
+       "total_score": min(120, score + biotech_score + PORTFOLIO_LINK_BONUS),
+       "validation_reasons": reasons,
+       "biotech_keywords_found": biotech_matches,
+       "llm_validation": "Skipped - pre-attributed by portfolio page link",
+       "resolved_without_search": True
+   }
+
+
+def verify_kb_hit(company_name, kb_info, http=None):
+   """
+   A knowledge-base hit skips Serper and the LLM, so one whose domain
+   doesn't carry the company's name is only trusted once the live
+   homepage title names the company.
+   """
+   if kb_info.get("kb_domain_match"):
+      return True
+   page = domain_guess.fetch_page(kb_info["website_url"],
+                                  timeout=task_runtime.remaining_timeout(domain_guess.PROBE_TIMEOUT),
+                                  http=http)
+   return bool(page) and domain_guess.title_matches(company_name, page["title"])
+
+
+def run_queries_parallel(queries, company_name, vc_context=None, http=None):
+   """
+   Issue every query variant at once and score results as they arrive.
+
+   When variant k yields a validated result >= HIGH_CONFIDENCE_SCORE the
+   variants after k are cancelled; earlier variants still in flight are
+   awaited, so the winner is exactly the one the sequential loop would
+   have stopped on.
+
+   Every variant runs under a child of one per-company token. Cancelling
+   a Future does not stop a request already running, so on return the
+   token is cancelled: Serper's rate gate and the LLM validator check it
+   before spending, and calls already out are counted as abandoned.
+   """
+   parent = task_runtime.current()
+   budget = parent.remaining() if parent else GLOBAL_TIMEOUT
+   token = task_runtime.Deadline(budget, parent=parent, label=f"search '{company_name}'")
+   children = [task_runtime.Deadline(budget, parent=token, label=f"query {i + 1}")
+               for i in range(len(queries))]
+   results = [None] * len(queries)
+   _count_search("fanout_companies")
+
+   def run_one(i, query):
+       with children[i]:
+           children[i].check()
+           print(f"      [QUERY {i + 1}] {query}")
+           _count_search("queries_issued")
+           return make_serper_request_with_retries(query, company_name, vc_context=vc_context, http=http)
+
+   executor = ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix="serper-fanout")
+   futures = {}
+   try:
+       futures.update({executor.submit(run_one, i, q): i for i, q in enumerate(queries)})
+       pending = set(futures)
+       stop_at = len(queries)             # first variant with a confident result
+       while pending:
+           if parent:
+               parent.check()
+           done = [f for f in pending if f.done()]
+           if not done:
+               task_runtime.sleep(0.05)
+               continue
+           for fut in done:
+               pending.discard(fut)
+               i = futures[fut]
+               try:
+                   results[i] = fut.result()
+               except Exception:
+                   results[i] = None          # cancelled or failed variant
+               if i < stop_at and results[i] and results[i]['total_score'] >= HIGH_CONFIDENCE_SCORE:
+                   stop_at = i
+                   print(f"      🎯 High confidence result (query {i + 1}) - cancelling later queries")
+           for fut in list(pending):
+               if futures[fut] > stop_at:
+                   if not children[futures[fut]].cancelled:
+                       _count_search("queries_cancelled")
+                   children[futures[fut]].cancel("superseded by a confident result")
+                   fut.cancel()
+                   pending.discard(fut)
+       return pick_best_result(results[:stop_at + 1])
+   finally:
+       running = [f for f in futures if f.running()]
+       if running:
+           _count_search("queries_abandoned_in_flight", len(running))
+       token.cancel("company search finished")
+       for dl in children:
+           dl.close()
+       token.close()
+       executor.shutdown(wait=False, cancel_futures=True)
+
+
+def find_biotech_company_website_with_timeout(company_name, vc_name=None, vc_url=None, http=None):
    """FIXED: Find company website with comprehensive timeout and hang prevention"""
   
    if not SERPER_API_KEY:
@@ -535,6 +977,8 @@ def find_biotech_company_website_with_timeout(company_name, vc_name=None):
    print(f"    [SEARCH] '{company_name}' (timeout: {GLOBAL_TIMEOUT}s)")
    if vc_name:
        print(f"        [VC CONTEXT] Using '{vc_name}' for disambiguation")
+   vc_context = {"vc_name": vc_name, "vc_url": vc_url}
+   http = http or http_client.get_client()
   
    def search_company():
        try:
@@ -567,6 +1011,11 @@ def find_biotech_company_website_with_timeout(company_name, vc_name=None):
                return False
           
            is_generic = is_generic_name(company_name)
+
+           if DOMAIN_PROBE:
+               guessed = resolve_by_domain_probe(company_name, http)
+               if guessed:
+                   return guessed
           
            # Enhanced query strategy to prevent company name confusion
            # ALWAYS start with direct .com domain search
@@ -595,6 +1044,9 @@ def find_biotech_company_website_with_timeout(company_name, vc_name=None):
                if vc_name:
                    biotech_queries.insert(2, f'"{company_name}" "{vc_name}"')
           
+           if SEARCH_MODE == "parallel":
+               return run_queries_parallel(biotech_queries, company_name, vc_context, http)
+
            best_result = None
            best_score = 0
           
@@ -602,27 +1054,26 @@ def find_biotech_company_website_with_timeout(company_name, vc_name=None):
                print(f"      [QUERY {i}] {query}")
               
                # Use retry logic for each API call
-               result = make_serper_request_with_retries(query, company_name)
+               result = make_serper_request_with_retries(query, company_name, vc_context=vc_context, http=http)
               
                if result and result['total_score'] > best_score:
                    best_result = result
                    best_score = result['total_score']
                   
-                   if best_score >= 90:
+                   if best_score >= HIGH_CONFIDENCE_SCORE:
                        print(f"      🎯 High confidence result - stopping search")
                        break
-              
-               # Rate limiting delay between queries
-               if i < len(biotech_queries):
-                   time.sleep(COMPANY_DELAY)
           
+           # pacing between queries is the shared Serper token bucket's job
            return best_result
           
        except Exception as e:
            print(f"    ❌ Search error: {e}")
            return None
   
-   # Execute search with timeout
+   # Execute search with timeout. It runs in this thread, so nothing here is
+   # interrupted from outside: every Serper / LLM POST takes its timeout from
+   # remaining_timeout(), and domain probes bound DNS and close reads on cancel.
    result, error = timeout_handler(search_company, timeout_duration=GLOBAL_TIMEOUT)
   
    if error:
@@ -725,6 +1176,8 @@ def load_vc_portfolio_data(file_path):
       
        # Get companies list
        companies = data.get('companies', [])
+       # {company: href} read from the portfolio page DOM (portfolio_ss)
+       vc_info['company_links'] = data.get('company_links') or {}
       
        print(f"📁 Loaded VC data: {vc_info['vc_name']}")
        print(f"🏢 Companies to process: {len(companies)}")
@@ -736,8 +1189,25 @@ def load_vc_portfolio_data(file_path):
        return None, []
 
 
-def process_biotech_companies_with_vc_attribution(vc_info, companies, max_results=25):
-    """Optimized: Parallel, robust, resource-reusing company website discovery with logging."""
+def process_biotech_companies_with_vc_attribution(vc_info, companies, max_results=25, journal_path=None):
+    """
+    Optimized: Parallel, robust, resource-reusing company website discovery with logging.
+
+    With ``journal_path`` every per-company outcome is appended to that JSONL
+    file as it completes, companies already recorded there are skipped, and
+    the result lists are rebuilt from the journal.
+
+    SIGTERM/SIGINT only stop new companies from starting while this runs;
+    the caller's handlers are restored when it returns.
+    """
+    previous_handlers = setup_signal_handlers()
+    try:
+        return _discover_websites(vc_info, companies, max_results, journal_path)
+    finally:
+        restore_signal_handlers(previous_handlers)
+
+
+def _discover_websites(vc_info, companies, max_results, journal_path):
     import threading
     from functools import partial
     import logging
@@ -748,6 +1218,11 @@ def process_biotech_companies_with_vc_attribution(vc_info, companies, max_result
     logger.info(f"Processing {len(companies)} companies from {vc_name}")
     logger.info(f"Focus: Official company websites only | Top {max_results} results | Timeout per company: {GLOBAL_TIMEOUT}s")
 
+    company_links = vc_info.get('company_links') or {}
+    vc_info = {k: v for k, v in vc_info.items() if k != 'company_links'}
+    link_stats = {"available": len(company_links), "accepted": 0, "rejected": 0}
+    link_stats_lock = threading.Lock()
+
     results = {
         "vc_attribution": vc_info,
         "processing_date": datetime.now().isoformat(),
@@ -763,24 +1238,59 @@ def process_biotech_companies_with_vc_attribution(vc_info, companies, max_result
         "next_stage": "startup_enrichment"
     }
     start_time = time.time()
-    setup_signal_handlers()
 
-    # Thread-local session for resource reuse
-    thread_local = threading.local()
-    def get_session():
-        if not hasattr(thread_local, "session"):
-            thread_local.session = requests.Session()
-        return thread_local.session
+    journal = load_journal(journal_path)
+    done = {name for name, rec in journal.items() if rec.get("status") in RESUMABLE_STATUSES}
+    if done:
+        logger.info(f"RESUME: {len(done)} companies already in {journal_path} - skipping them")
+    todo = [c for c in companies if c not in done]
+
+    # One pooled keep-alive client shared by every worker thread
+    http = http_client.get_client()
+    http_snapshot = dict(http.stats)
+
+    store = company_store.get_store()
+    kb_added = store.refresh_website_kb(os.path.join(OUTPUT_DIR, "runs"))
+    if kb_added:
+        logger.info(f"Website knowledge base: {kb_added} entries ingested from past runs")
+    store_snapshot = dict(store.stats)
+    serper_snapshot = dict(serper_client.get_cache().stats)
+    limiter_snapshot = dict(serper_client.rate_gate.bucket.stats)
+    search_snapshot = dict(search_stats)
+    validation_snapshot = dict(validation_stats)
 
     def process_company(company):
         company_start_time = time.time()
         try:
-            # Patch requests in this thread to use session
-            orig_request = requests.request
-            session = get_session()
-            requests.request = session.request
-            website_info = find_biotech_company_website_with_timeout(company, vc_name)
-            requests.request = orig_request  # Restore
+            # Cross-VC company store first – a fresh match costs no searches
+            website_info = store.get_website(company)
+            kb_info = None if website_info else store.lookup_website_kb(company)
+            if kb_info and not verify_kb_hit(company, kb_info, http):
+                logger.info(f"KB REJECTED: {company} ≈ {kb_info['kb_matched_name']} → "
+                            f"{kb_info['website_url']} (domain and title don't name the company)")
+                kb_info = None
+            linked_info = None
+            if not website_info and not kb_info and company_links.get(company):
+                linked_info = check_portfolio_link(company, company_links[company], http)
+                with link_stats_lock:
+                    link_stats["accepted" if linked_info else "rejected"] += 1
+            if website_info:
+                website_info = dict(website_info, company_name=company, company_store_hit=True)
+                logger.info(f"CACHE HIT: {company} → {website_info['website_url']}")
+            elif kb_info:
+                # resolved in an earlier run under this or a close name – no Serper, no LLM
+                website_info = dict(kb_info, company_name=company, knowledge_base_hit=True)
+                logger.info(f"KB HIT: {company} ≈ {kb_info['kb_matched_name']} → "
+                            f"{website_info['website_url']} (similarity {kb_info['kb_similarity']})")
+            elif linked_info:
+                website_info = linked_info
+                logger.info(f"PORTFOLIO LINK: {company} → {website_info['website_url']}")
+                store.put_website(company, website_info)
+            else:
+                website_info = find_biotech_company_website_with_timeout(company, vc_name, vc_info.get('vc_url'),
+                                                                         http=http)
+                if website_info:
+                    store.put_website(company, website_info)
             if website_info:
                 website_info.update({
                     'source_vc': vc_name,
@@ -805,38 +1315,91 @@ def process_biotech_companies_with_vc_attribution(vc_info, companies, max_result
             logger.error(f"ERROR: {company} - {e}")
             return (company, None, 'error', search_duration)
 
-    max_workers = min(10, len(companies)) if len(companies) > 1 else 1
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_company = {executor.submit(process_company, c): c for c in companies}
-        for i, future in enumerate(as_completed(future_to_company), 1):
-            company = future_to_company[future]
-            try:
-                c, website_info, fail_type, duration = future.result()
-                if website_info:
-                    results["websites_found_raw"].append(website_info)
-                elif fail_type == 'timeout':
-                    results["companies_timeout"].append({
-                        'company_name': c,
-                        'source_vc': vc_name,
-                        'failure_reason': 'Search timeout',
-                        'search_duration': duration
-                    })
-                elif fail_type in ('failed', 'error'):
-                    results["companies_failed"].append({
-                        'company_name': c,
-                        'source_vc': vc_name,
-                        'failure_reason': 'No official website found' if fail_type == 'failed' else 'Search error',
-                        'search_duration': duration
-                    })
-            except Exception as e:
-                logger.error(f"UNCAUGHT ERROR for {company}: {e}")
-                results["companies_failed"].append({
-                    'company_name': company,
-                    'source_vc': vc_name,
-                    'failure_reason': f'Uncaught error: {e}',
-                    'search_duration': 0
-                })
-            logger.info(f"Progress: {i}/{len(companies)} companies processed")
+    def record_outcome(company, website_info, fail_type, duration, reason=None):
+        if website_info:
+            rec = {"company_name": company, "status": "found", "website_info": website_info}
+        else:
+            rec = {"company_name": company, "status": fail_type, "failure": {
+                'company_name': company,
+                'source_vc': vc_name,
+                'failure_reason': reason or {'timeout': 'Search timeout',
+                                             'failed': 'No official website found'}.get(fail_type, 'Search error'),
+                'search_duration': duration
+            }}
+        journal[company] = rec
+        if journal_path:
+            append_journal(journal_path, rec)
+
+    # Worker count adapts to observed latency / errors / 429s (DISCOVERY_WORKERS pins it)
+    max_workers = max(1, min(DISCOVERY_WORKERS_MAX, len(todo)))
+    if DISCOVERY_WORKERS:
+        controller = AdaptiveConcurrency(DISCOVERY_WORKERS, DISCOVERY_WORKERS, DISCOVERY_WORKERS)
+    else:
+        controller = AdaptiveConcurrency(min(DISCOVERY_WORKERS_START, max_workers), 1, max_workers)
+
+    def throttle_count():
+        return serper_client.rate_gate.bucket.stats["throttled"] + validation_stats["rate_limited"]
+
+    interrupted = False
+    queue = list(todo)
+    in_flight = {}
+    processed = 0
+    throttle_mark = throttle_count()
+    with ThreadPoolExecutor(max_workers=controller.max_limit) as executor:
+        while queue or in_flight:
+            if _shutdown.is_set() and not interrupted:
+                interrupted = True
+                logger.warning(f"SHUTDOWN: {len(queue)} queued companies not started - they will run on resume")
+                queue = []
+            while queue and len(in_flight) < controller.limit:
+                company = queue.pop(0)
+                in_flight[executor.submit(process_company, company)] = company
+            if not in_flight:
+                break
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                company = in_flight.pop(future)
+                processed += 1
+                try:
+                    c, website_info, fail_type, duration = future.result()
+                    record_outcome(c, website_info, fail_type, duration)
+                    # only searched companies feed the latency baseline – store / KB
+                    # hits, portfolio links and domain probes resolve in ~1s and
+                    # would pin it far below any search window
+                    no_search = bool(website_info) and (website_info.get('company_store_hit')
+                                                        or website_info.get('knowledge_base_hit')
+                                                        or website_info.get('resolved_without_search'))
+                    latency = None if no_search else (website_info or {}).get('search_duration', duration)
+                    controller.record(latency, 'ok' if website_info else fail_type)
+                except Exception as e:
+                    logger.error(f"UNCAUGHT ERROR for {company}: {e}")
+                    record_outcome(company, None, 'error', 0, reason=f'Uncaught error: {e}')
+                    controller.record(None, 'error')
+                logger.info(f"Progress: {processed}/{len(todo)} companies processed")
+            if controller.window_ready():
+                now_throttled = throttle_count()
+                old_limit = controller.limit
+                controller.adjust(throttled=now_throttled - throttle_mark)
+                throttle_mark = now_throttled
+                if controller.limit != old_limit:
+                    logger.info(f"CONCURRENCY: {old_limit} → {controller.limit} workers "
+                                f"({controller.decisions[-1]['action']})")
+
+    # Result lists come from the journal: this run's outcomes plus resumed ones
+    for company in companies:
+        rec = journal.get(company)
+        if not rec:
+            continue
+        if rec["status"] == "found":
+            results["websites_found_raw"].append(rec["website_info"])
+        elif rec["status"] == "timeout":
+            results["companies_timeout"].append(rec["failure"])
+        else:
+            results["companies_failed"].append(rec["failure"])
+    results["resumed_companies"] = len(done)
+    results["interrupted"] = interrupted
+    if journal_path:
+        results["journal_path"] = journal_path
 
     total_time = time.time() - start_time
     raw_found_count = len(results["websites_found_raw"])
@@ -861,7 +1424,24 @@ def process_biotech_companies_with_vc_attribution(vc_info, companies, max_result
         "total_processing_time": total_time,
         "average_time_per_company": total_time / len(companies) if companies else 0,
         "timeout_rate": (timeout_count / len(companies)) * 100 if companies else 0,
-        "failure_rate": (failed_count / len(companies)) * 100 if companies else 0
+        "failure_rate": (failed_count / len(companies)) * 100 if companies else 0,
+        "company_store": store.stats_since(store_snapshot),
+        "serper_cache": serper_client.get_cache().stats_since(serper_snapshot),
+        "serper_rate_limiter": serper_client.rate_gate.bucket.stats_since(limiter_snapshot),
+        "search_mode": SEARCH_MODE,
+        "portfolio_links": link_stats,
+        "concurrency": controller.summary(),
+        "http_pool": http.stats_since(http_snapshot, companies=len(companies)),
+        "llm_validation": {k: validation_stats[k] - validation_snapshot[k] for k in validation_stats},
+        "search_fanout": {k: search_stats[k] - search_snapshot[k] for k in search_stats
+                          if not k.startswith("domain_probe")},
+        "direct_domain_probe": {
+            "companies_probed": search_stats["domain_probe_companies"] - search_snapshot["domain_probe_companies"],
+            "resolved_without_search": search_stats["domain_probe_resolved"] - search_snapshot["domain_probe_resolved"],
+            "resolved_without_search_pct": round(
+                100 * (search_stats["domain_probe_resolved"] - search_snapshot["domain_probe_resolved"])
+                / len(companies), 1) if companies else 0.0
+        }
     }
     return results
 
@@ -881,19 +1461,22 @@ def process_from_orchestrator_input(vc_file_path, vc_name_fs=None, max_results=2
        print("❌ No companies found in orchestrator input file!")
        return None
   
-   # Process companies with VC attribution and timeout management
-   results = process_biotech_companies_with_vc_attribution(vc_info, companies, max_results)
-  
-   # Save with proper VC attribution and workflow-compatible format
    # Use command-line vc_name_fs if provided, otherwise fallback to cleaned vc_name from JSON
    if vc_name_fs:
        vc_safe_name = vc_name_fs
    else:
        vc_safe_name = "".join(c for c in vc_info['vc_name'].lower() if c.isalnum() or c in (' ', '-', '_')).replace(' ', '_')
-   timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
    # --- Only output to output/runs/<vc_safe_name>/ ---
    runs_dir = os.path.join(OUTPUT_DIR, "runs", vc_safe_name)
    os.makedirs(runs_dir, exist_ok=True)
+   journal_path = journal_path_for(runs_dir, vc_file_path, vc_safe_name)
+   print(f"Journal: {journal_path}")
+
+   # Process companies with VC attribution and timeout management
+   results = process_biotech_companies_with_vc_attribution(vc_info, companies, max_results, journal_path)
+  
+   # Save with proper VC attribution and workflow-compatible format
+   timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
    output_file = f"{vc_safe_name}_websites_with_attribution_{timestamp}.json"
    output_path = os.path.join(runs_dir, output_file)
 
@@ -903,6 +1486,8 @@ def process_from_orchestrator_input(vc_file_path, vc_name_fs=None, max_results=2
   
    with open(output_path, 'w') as f:
        json.dump(results, f, indent=2)
+   if not results.get("interrupted"):
+       finish_journal(journal_path, output_path)
   
    print(f"\n💾 Results saved to: {output_path}")
    print(f"📊 Final count: {len(results['websites_found'])} websites")
@@ -926,6 +1511,9 @@ def process_from_orchestrator_input(vc_file_path, vc_name_fs=None, max_results=2
    # FIXED: Print explicit output file for orchestrator
    print(f"OUTPUT_FILE: {output_path}")
   
+   if results.get("interrupted"):
+       print(f"⚠️ Interrupted - partial results saved; rerun on the same input to resume")
+       sys.exit(1)
    return output_path
 
 import sys, os
@@ -1109,10 +1697,11 @@ def run_website_discovery(input_path, vc_name_fs, output_dir=None, max_results=2
     vc_info, companies = load_vc_portfolio_data(input_path)
     if not companies:
         raise ValueError("No companies found in orchestrator input file!")
-    results = process_biotech_companies_with_vc_attribution(vc_info, companies, max_results)
     if not output_dir:
         output_dir = os.path.join(OUTPUT_DIR, "runs", vc_name_fs)
     os.makedirs(output_dir, exist_ok=True)
+    journal_path = journal_path_for(output_dir, input_path, vc_name_fs)
+    results = process_biotech_companies_with_vc_attribution(vc_info, companies, max_results, journal_path)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = f"{vc_name_fs}_websites_with_attribution_{timestamp}.json"
     output_path = os.path.join(output_dir, output_file)
@@ -1120,5 +1709,10 @@ def run_website_discovery(input_path, vc_name_fs, output_dir=None, max_results=2
     results["ready_for_enrichment"] = True
     with open(output_path, 'w') as f:
         json.dump(results, f, indent=2)
+    if not results.get("interrupted"):
+        finish_journal(journal_path, output_path)
+    if results.get("interrupted"):
+        print(f"[PARTIAL] website discovery interrupted; partial results: {output_path}")
+        sys.exit(1)
     print(f"[OK] website discovery complete: {output_path}")
     return output_path
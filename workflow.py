@@ -6,6 +6,7 @@ Build/refresh VC profiles via crawler → OpenAI → Airtable
 import time, json, requests
 from pyairtable import Table
 from deduplicate_fields import deduplicate_with_llm
+import field_normalizer
 from vc_profile import generate_vc_profile_summary
 import os
 import re
@@ -214,7 +215,7 @@ def process_portfolio_analysis(rec):
         # 2️⃣ Website discovery
         websites_json = run_website_discovery(portfolio_json, vc_name_fs, output_dir=output_dir)
         # 3️⃣ Data enrichment
-        enrich_json = run_enrichment(websites_json, vc_name_fs, output_dir=output_dir)
+        enrich_json, deferred = run_enrichment(websites_json, vc_name_fs, output_dir=output_dir)
         # 4️⃣ Deduplication
         output_json = run_aggregation(enrich_json, vc_name_fs, output_dir=output_dir)
     except ValueError as e:
@@ -291,8 +292,12 @@ def process_portfolio_analysis(rec):
         "Disease Focus (Portfolio)": format_sorted_analysis("Disease Focus"),
         "Geography (Portfolio)": format_sorted_analysis("Geography"),
         "Portfolio Aggregated JSON": json.dumps(dedup_summary, indent=2, ensure_ascii=False),
-        "Portfolio Scraper Applied?": tri_state_portfolio(True),
     }
+    # Deferred companies are enriched on the next run, so only then is the VC done
+    if deferred:
+        print(f"[{vc_name}] ⏳ {len(deferred)} companies deferred – leaving Portfolio Scraper Applied? unset for a rerun")
+    else:
+        portfolio_update["Portfolio Scraper Applied?"] = tri_state_portfolio(True)
     # Only update if field is missing, blank, 'none', or 'null' (never if set to any value)
     if latest_therapeutic is None or str(latest_therapeutic).strip().lower() in ("", "none", "null"):
         portfolio_update["Therapeutic Investor?"] = tri_state_portfolio(therapeutic_portfolio_val)
@@ -327,4 +332,5 @@ for i, rec in enumerate(vc_records, 1):
         print(f"[{vc_name}] Full traceback:")
         traceback.print_exc()
 
+field_normalizer.print_skip_report()
 print("\nDone.")